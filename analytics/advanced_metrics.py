@@ -6,7 +6,10 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
 import math
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from analytics.momentum import momentum_score
+from analytics.rolling_stats import form_match_score, to_timestamp
 
 class TennisAdvancedMetrics:
     """Calcolatore di metriche avanzate per tennis"""
@@ -34,23 +37,13 @@ class TennisAdvancedMetrics:
     def calculate_momentum_score(recent_points: List[bool], leverage_weights: Optional[List[float]] = None) -> float:
         """
         Momentum Score usando exponentially weighted moving average
-        recent_points: lista di boolean (True = punto vinto, False = punto perso)
+        recent_points: lista di boolean in ordine cronologico (True = punto vinto,
+        False = punto perso; l'ultimo è il più recente e pesa di più)
         leverage_weights: pesi per importanza dei punti (opzionale)
-        """
-        if not recent_points:
-            return 0.5
-        
-        if leverage_weights is None:
-            # Pesi esponenziali decrescenti (più recente = più importante)
-            leverage_weights = [0.5 ** i for i in range(len(recent_points))]
         
-        if len(leverage_weights) != len(recent_points):
-            leverage_weights = leverage_weights[:len(recent_points)]
-        
-        weighted_sum = sum(point * weight for point, weight in zip(recent_points, leverage_weights))
-        total_weight = sum(leverage_weights)
-        
-        return weighted_sum / total_weight if total_weight > 0 else 0.5
+        Per aggiornamenti punto per punto usare analytics.momentum.MomentumEWMA
+        """
+        return momentum_score(recent_points, leverage_weights)
     
     @staticmethod
     def calculate_leverage(current_score: Dict[str, int], match_format: str = "best_of_3") -> float:
@@ -233,13 +226,17 @@ class TennisAdvancedMetrics:
     def calculate_form_rating(recent_matches: List[Dict[str, Any]], days: int = 90) -> float:
         """
         Calcola rating forma basato su performance recenti
+        
+        Per aggiornamenti incrementali su molti giocatori usare
+        analytics.rolling_stats.RollingStatsEngine
         """
         if not recent_matches:
             return 50.0  # Rating neutro
         
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_matches = [m for m in recent_matches 
-                         if datetime.fromisoformat(m.get("date", "2000-01-01")) >= cutoff_date]
+        # "date" può essere già un datetime/epoch: niente parsing ripetuto
+        cutoff = datetime.now().timestamp() - days * 86400
+        recent_matches = [m for m in recent_matches
+                         if to_timestamp(m.get("date", "2000-01-01")) >= cutoff]
         
         if not recent_matches:
             return 50.0
@@ -252,10 +249,7 @@ class TennisAdvancedMetrics:
             weight = 0.9 ** i  # Peso decrescente esponenziale
             
             # Punteggio partita basato su risultato e qualità avversario
-            if match.get("won", False):
-                match_score = 70 + min(30, match.get("opponent_ranking", 100) / 10)
-            else:
-                match_score = 30 - min(20, match.get("opponent_ranking", 100) / 20)
+            match_score = form_match_score(match.get("won", False), match.get("opponent_ranking", 100))
             
             weighted_score += match_score * weight
             total_weight += weight
@@ -0,0 +1,333 @@
+"""
+Backtesting della strategia value bet su dati storici
+
+Legge partite e quote storiche a blocchi (in ordine cronologico), applica il
+modello vettorizzato di _enrich_match_data e le regole di staking italiane,
+producendo curve giornaliere di P&L, drawdown e hit rate con memoria limitata.
+"""
+import logging
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analytics.staking import apply_italian_stake_rules, kelly_stakes
+
+logger = logging.getLogger(__name__)
+
+# Colonne minime richieste nei dati storici.
+# winner: 1 se vince player1, 2 se vince player2
+HISTORY_COLUMNS = ['match_time', 'odds_p1', 'odds_p2', 'winner']
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def iter_history_csv(path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Legge uno storico CSV (già ordinato per match_time) a blocchi"""
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        yield chunk
+
+
+def iter_history_sqlite(db_path: str, query: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Legge uno storico da SQLite a blocchi
+
+    La query deve restituire almeno HISTORY_COLUMNS ed essere ordinata per match_time.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        for chunk in pd.read_sql_query(query, conn, chunksize=chunksize):
+            yield chunk
+    finally:
+        conn.close()
+
+
+def iter_history(source: Tuple, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Apre una sorgente storica descritta da una tupla serializzabile
+    ('csv', path) oppure ('sqlite', db_path, query)
+    """
+    kind = source[0]
+    if kind == 'csv':
+        return iter_history_csv(source[1], chunksize)
+    if kind == 'sqlite':
+        return iter_history_sqlite(source[1], source[2], chunksize)
+    raise ValueError(f"Sorgente storica non supportata: {kind}")
+
+
+def compute_value_edges(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Modello vettorizzato (stessa logica di TennisDataLoader._enrich_match_data)
+
+    Usa player1_prob/player2_prob se presenti, altrimenti le probabilità
+    implicite normalizzate dalle quote. edge = quota / fair_odds - 1.
+    """
+    df = df.copy()
+
+    if 'player1_prob' not in df.columns:
+        p1 = 1 / df['odds_p1']
+        p2 = 1 / df['odds_p2']
+        total_prob = p1 + p2
+        df['player1_prob'] = p1 / total_prob
+        df['player2_prob'] = p2 / total_prob
+
+    df['edge_p1'] = (df['odds_p1'] * df['player1_prob'] - 1).fillna(0)
+    df['edge_p2'] = (df['odds_p2'] * df['player2_prob'] - 1).fillna(0)
+
+    return df
+
+
+def select_value_bets(odds_p1: np.ndarray, odds_p2: np.ndarray,
+                      prob_p1: np.ndarray, prob_p2: np.ndarray,
+                      winner: np.ndarray, min_edge: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Seleziona al massimo una scommessa per partita (il lato con edge maggiore)
+
+    Returns:
+        (mask partite giocate, quota, probabilità, esito vinto) per le sole partite giocate
+    """
+    edge_p1 = odds_p1 * prob_p1 - 1
+    edge_p2 = odds_p2 * prob_p2 - 1
+
+    pick_p1 = edge_p1 >= edge_p2
+    best_edge = np.where(pick_p1, edge_p1, edge_p2)
+    mask = (best_edge >= min_edge) & np.isfinite(best_edge)
+
+    odds = np.where(pick_p1, odds_p1, odds_p2)[mask]
+    prob = np.where(pick_p1, prob_p1, prob_p2)[mask]
+    won = (np.where(pick_p1, 1, 2) == winner)[mask]
+
+    return mask, odds, prob, won
+
+
+def simulate_days(days: np.ndarray, odds: np.ndarray, prob: np.ndarray, won: np.ndarray,
+                  state: Dict[str, float], kelly_fraction: float = 0.25,
+                  flat_stake: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """
+    Simula le scommesse giorno per giorno (array ordinati per giorno)
+
+    Le puntate di una giornata sono calcolate in blocco sul bankroll di inizio
+    giornata; lo stato (bankroll) viene aggiornato in place.
+    """
+    if len(days) == 0:
+        empty_f = np.empty(0, dtype=np.float64)
+        empty_i = np.empty(0, dtype=np.int64)
+        return {'day': empty_i, 'bets': empty_i, 'wins': empty_i,
+                'staked': empty_f, 'pnl': empty_f, 'bankroll': empty_f}
+
+    unique_days, starts = np.unique(days, return_index=True)
+    ends = np.append(starts[1:], len(days))
+
+    n_days = len(unique_days)
+    bets = np.zeros(n_days, dtype=np.int64)
+    wins = np.zeros(n_days, dtype=np.int64)
+    staked = np.zeros(n_days, dtype=np.float64)
+    pnl = np.zeros(n_days, dtype=np.float64)
+    bankroll_end = np.zeros(n_days, dtype=np.float64)
+
+    bankroll = state['bankroll']
+    for i in range(n_days):
+        sl = slice(starts[i], ends[i])
+        day_odds = odds[sl]
+
+        if bankroll <= 0:
+            bankroll_end[i] = bankroll
+            continue
+
+        if flat_stake is not None:
+            stakes = np.full(len(day_odds), float(flat_stake))
+        else:
+            stakes = kelly_stakes(bankroll, prob[sl], day_odds, kelly_fraction)
+
+        # Non si può impegnare più del bankroll disponibile
+        total = stakes.sum()
+        if total > bankroll:
+            stakes *= bankroll / total
+        stakes = apply_italian_stake_rules(stakes, day_odds)
+
+        placed = stakes > 0
+        day_won = won[sl]
+        day_pnl = np.where(day_won, stakes * (day_odds - 1), -stakes)
+
+        bets[i] = int(placed.sum())
+        wins[i] = int((placed & day_won).sum())
+        staked[i] = stakes.sum()
+        pnl[i] = day_pnl.sum()
+
+        bankroll += pnl[i]
+        bankroll_end[i] = bankroll
+
+    state['bankroll'] = bankroll
+
+    return {'day': unique_days, 'bets': bets, 'wins': wins,
+            'staked': staked, 'pnl': pnl, 'bankroll': bankroll_end}
+
+
+def build_curves(daily: List[Dict[str, np.ndarray]], initial_bankroll: float) -> pd.DataFrame:
+    """Costruisce le curve giornaliere di P&L, drawdown e hit rate"""
+    columns = ['date', 'bets', 'wins', 'staked', 'pnl', 'cum_pnl', 'bankroll',
+               'drawdown', 'drawdown_pct', 'hit_rate']
+    daily = [d for d in daily if len(d['day'])]
+    if not daily:
+        return pd.DataFrame(columns=columns)
+
+    merged = {k: np.concatenate([d[k] for d in daily]) for k in daily[0]}
+    curves = pd.DataFrame(merged)
+
+    curves['date'] = curves['day'].to_numpy().astype('datetime64[D]')
+    curves['cum_pnl'] = curves['pnl'].cumsum()
+
+    peak = np.maximum.accumulate(np.maximum(curves['bankroll'].to_numpy(), initial_bankroll))
+    curves['drawdown'] = curves['bankroll'] - peak
+    curves['drawdown_pct'] = curves['drawdown'] / peak
+
+    cum_bets = curves['bets'].cumsum()
+    curves['hit_rate'] = (curves['wins'].cumsum() / cum_bets.where(cum_bets > 0)).fillna(0.0)
+
+    return curves[columns]
+
+
+def summarize_curves(curves: pd.DataFrame, initial_bankroll: float, rows_processed: int) -> Dict[str, Any]:
+    """Riepilogo finale del backtest"""
+    n_bets = int(curves['bets'].sum()) if not curves.empty else 0
+    wins = int(curves['wins'].sum()) if not curves.empty else 0
+    staked = float(curves['staked'].sum()) if not curves.empty else 0.0
+    pnl = float(curves['pnl'].sum()) if not curves.empty else 0.0
+
+    return {
+        'rows_processed': rows_processed,
+        'days': len(curves),
+        'bets': n_bets,
+        'wins': wins,
+        'hit_rate': wins / n_bets if n_bets else 0.0,
+        'staked': staked,
+        'pnl': pnl,
+        'roi': pnl / staked if staked else 0.0,
+        'final_bankroll': initial_bankroll + pnl,
+        'max_drawdown': float(curves['drawdown'].min()) if not curves.empty else 0.0,
+        'max_drawdown_pct': float(curves['drawdown_pct'].min()) if not curves.empty else 0.0
+    }
+
+
+class ValueBetBacktester:
+    """Backtester in streaming della strategia value bet"""
+
+    def __init__(self, min_edge: float = 0.05, kelly_fraction: float = 0.25,
+                 flat_stake: Optional[float] = None, initial_bankroll: float = 1000.0,
+                 surfaces: Optional[List[str]] = None, tournaments: Optional[List[str]] = None):
+        """
+        Args:
+            min_edge: edge minimo per piazzare la scommessa (default come _enrich_match_data)
+            kelly_fraction: frazione di Kelly usata se flat_stake è None
+            flat_stake: puntata fissa in euro (disattiva Kelly)
+            initial_bankroll: bankroll iniziale in euro
+            surfaces: filtro superfici (None = tutte)
+            tournaments: filtro tornei (None = tutti)
+        """
+        self.min_edge = min_edge
+        self.kelly_fraction = kelly_fraction
+        self.flat_stake = flat_stake
+        self.initial_bankroll = initial_bankroll
+        self.surfaces = surfaces
+        self.tournaments = tournaments
+
+    def _prepare_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Valida, filtra e ordina un blocco di storico"""
+        missing = [c for c in HISTORY_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Colonne mancanti nello storico: {missing}")
+
+        if self.surfaces is not None and 'surface' in chunk.columns:
+            chunk = chunk[chunk['surface'].isin(self.surfaces)]
+        if self.tournaments is not None and 'tournament_name' in chunk.columns:
+            chunk = chunk[chunk['tournament_name'].isin(self.tournaments)]
+
+        match_time = pd.to_datetime(chunk['match_time'], utc=True, errors='coerce')
+        chunk = chunk.assign(
+            day=match_time.dt.tz_localize(None).values.astype('datetime64[D]').astype(np.int64)
+        )
+        chunk = chunk[
+            match_time.notna()
+            & (chunk['odds_p1'] > 1) & (chunk['odds_p2'] > 1)
+            & chunk['winner'].isin([1, 2])
+        ]
+
+        return compute_value_edges(chunk).sort_values('day', kind='stable')
+
+    def _simulate(self, chunk: pd.DataFrame, state: Dict[str, float]) -> Dict[str, np.ndarray]:
+        mask, odds, prob, won = select_value_bets(
+            chunk['odds_p1'].to_numpy(np.float64),
+            chunk['odds_p2'].to_numpy(np.float64),
+            chunk['player1_prob'].to_numpy(np.float64),
+            chunk['player2_prob'].to_numpy(np.float64),
+            chunk['winner'].to_numpy(np.int64),
+            self.min_edge
+        )
+        days = chunk['day'].to_numpy(np.int64)[mask]
+        return simulate_days(days, odds, prob, won, state, self.kelly_fraction, self.flat_stake)
+
+    def run(self, chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+        """
+        Esegue il backtest su un iterabile di blocchi cronologici
+
+        L'ultima giornata di ogni blocco viene trattenuta e unita al blocco
+        successivo, così una giornata spezzata tra due blocchi è simulata una
+        sola volta. In memoria restano solo un blocco e le curve giornaliere.
+        """
+        state = {'bankroll': float(self.initial_bankroll)}
+        daily: List[Dict[str, np.ndarray]] = []
+        carry: Optional[pd.DataFrame] = None
+        rows_processed = 0
+        last_day = None
+
+        for chunk in chunks:
+            rows_processed += len(chunk)
+            chunk = self._prepare_chunk(chunk)
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True).sort_values('day', kind='stable')
+            if chunk.empty:
+                carry = None
+                continue
+
+            if last_day is not None and chunk['day'].iloc[0] < last_day:
+                logger.warning("Storico non in ordine cronologico: le curve potrebbero essere distorte")
+
+            tail_day = chunk['day'].iloc[-1]
+            is_tail = chunk['day'].to_numpy() == tail_day
+            carry = chunk[is_tail]
+            ready = chunk[~is_tail]
+
+            if not ready.empty:
+                daily.append(self._simulate(ready, state))
+                last_day = ready['day'].iloc[-1]
+
+        if carry is not None and not carry.empty:
+            daily.append(self._simulate(carry, state))
+
+        curves = build_curves(daily, self.initial_bankroll)
+        summary = summarize_curves(curves, self.initial_bankroll, rows_processed)
+
+        return {'summary': summary, 'curves': curves}
+
+    def run_source(self, source: Tuple, chunksize: int = DEFAULT_CHUNKSIZE) -> Dict[str, Any]:
+        """Esegue il backtest su una sorgente ('csv', path) o ('sqlite', db_path, query)"""
+        return self.run(iter_history(source, chunksize))
+
+
+def run_parameter_sweep(source: Tuple, param_grid: List[Dict[str, Any]],
+                        max_workers: Optional[int] = None,
+                        chunksize: int = DEFAULT_CHUNKSIZE,
+                        cache_dir: str = "data/sweep_cache") -> pd.DataFrame:
+    """
+    Esegue un backtest per ogni combinazione di parametri in parallelo sui core
+
+    Scorciatoia per analytics.parameter_sweep: lo storico viene caricato una
+    volta in shared memory e i risultati restano in cache per hash dei
+    parametri. Per riusare lo storico tra più sweep usare direttamente
+    SharedHistory e ParameterSweepRunner.
+    """
+    from analytics.parameter_sweep import ParameterSweepRunner, SharedHistory
+
+    with SharedHistory(source, chunksize) as history:
+        return ParameterSweepRunner(history, cache_dir, max_workers).run(param_grid)
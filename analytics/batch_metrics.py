@@ -0,0 +1,185 @@
+"""
+Metriche di partita calcolate in blocco su match_detailed_stats
+
+Dominance ratio dei due giocatori e qualità della partita sono calcolati
+per colonne con NumPy (stesse formule di TennisAdvancedMetrics) e scritti
+con un solo executemany per blocco di righe. Il job è incrementale: elabora
+solo le righe con match_quality_score ancora NULL, trovate tramite un
+indice parziale che contiene soltanto le righe da elaborare.
+"""
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Righe lette, calcolate e scritte per transazione
+CHUNK_SIZE = 50_000
+
+# match_quality_score è salvato in decimi (scala 0-10 mostrata dall'interfaccia)
+QUALITY_SCALE = 10.0
+
+_INPUT_COLUMNS = (
+    'p1_first_serve_pct', 'p1_first_serve_won_pct', 'p1_second_serve_won_pct',
+    'p1_first_return_won_pct', 'p1_second_return_won_pct',
+    'p2_first_serve_pct', 'p2_first_serve_won_pct', 'p2_second_serve_won_pct',
+    'p2_first_return_won_pct', 'p2_second_return_won_pct',
+    'p1_total_points_won', 'p2_total_points_won',
+    'p1_break_points_opportunities', 'p2_break_points_opportunities',
+    'p1_winners', 'p2_winners', 'p1_unforced_errors', 'p2_unforced_errors',
+    'match_duration_minutes',
+)
+_COL = {name: i for i, name in enumerate(_INPUT_COLUMNS)}
+
+
+def dominance_ratio(first_serve_pct: np.ndarray, first_serve_won_pct: np.ndarray,
+                    second_serve_won_pct: np.ndarray, first_return_won_pct: np.ndarray,
+                    second_return_won_pct: np.ndarray) -> np.ndarray:
+    """
+    Dominance Ratio per riga: % punti vinti in risposta / % punti persi al servizio
+
+    Come TennisAdvancedMetrics.calculate_dominance_ratio: con servizio
+    perfetto (0% persi) vale inf se il giocatore ha vinto punti in risposta,
+    altrimenti 1.0. NaN dove manca uno dei valori.
+    """
+    serve_won = (first_serve_pct * first_serve_won_pct + (100 - first_serve_pct) * second_serve_won_pct) / 100
+    serve_lost = 100 - serve_won
+    return_won = (first_return_won_pct + second_return_won_pct) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = return_won / serve_lost
+    perfect_serve = serve_lost == 0
+    ratio[perfect_serve] = np.where(return_won[perfect_serve] > 0, np.inf, 1.0)
+    return ratio
+
+
+def match_quality_score(stats: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Qualità partita (0-1) per riga, come TennisAdvancedMetrics.calculate_match_quality_score
+
+    stats: colonne di match_detailed_stats come array float, NaN = valore
+    mancante (sostituito con gli stessi default della versione scalare).
+    """
+    def column(name: str, default: float) -> np.ndarray:
+        return np.nan_to_num(stats[name], nan=default)
+
+    duration = column('match_duration_minutes', 120)
+    duration_factor = np.where((duration >= 90) & (duration <= 180), 0.8,
+                               np.where((duration >= 60) & (duration <= 240), 0.6, 0.4))
+    total = duration_factor.copy()
+    count = np.ones_like(total)
+
+    p1_points = column('p1_total_points_won', 100)
+    p2_points = column('p2_total_points_won', 100)
+    total_points = p1_points + p2_points
+    has_points = total_points > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        balance = np.minimum(p1_points, p2_points) / total_points * 2
+    total += np.where(has_points, balance, 0.0)
+    count += has_points
+
+    total_bp = column('p1_break_points_opportunities', 0) + column('p2_break_points_opportunities', 0)
+    total += np.minimum(1.0, total_bp / 10)
+    count += 1
+
+    total_winners = column('p1_winners', 20) + column('p2_winners', 20)
+    total_ue = column('p1_unforced_errors', 20) + column('p2_unforced_errors', 20)
+    has_ue = total_ue > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        winners_ratio = total_winners / (total_winners + total_ue)
+    total += np.where(has_ue, winners_ratio, 0.0)
+    count += has_ue
+
+    return total / count
+
+
+def compute_match_metrics(values: np.ndarray) -> np.ndarray:
+    """
+    Metriche di un blocco di righe
+
+    values: matrice (n_righe, len(_INPUT_COLUMNS)) con NaN per i NULL.
+    Returns: matrice (n_righe, 3) con p1/p2 dominance ratio (NaN se non
+    calcolabile) e match_quality_score in scala 0-10.
+    """
+    stats = {name: values[:, i] for name, i in _COL.items()}
+    out = np.empty((len(values), 3))
+    for j, p in enumerate(('p1', 'p2')):
+        out[:, j] = np.round(dominance_ratio(
+            stats[f'{p}_first_serve_pct'], stats[f'{p}_first_serve_won_pct'],
+            stats[f'{p}_second_serve_won_pct'], stats[f'{p}_first_return_won_pct'],
+            stats[f'{p}_second_return_won_pct']), 3)
+    out[:, 2] = np.round(match_quality_score(stats) * QUALITY_SCALE, 1)
+    return out
+
+
+def _ensure_pending_index(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_match_stats_pending_metrics
+        ON match_detailed_stats(match_id) WHERE match_quality_score IS NULL
+    """)
+
+
+def update_match_metrics(db_path: str = "data/tennis_stats.db", full: bool = False,
+                         chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Calcola e salva dominance ratio e qualità delle partite analizzate
+
+    Args:
+        db_path: database tennis_stats.db
+        full: ricalcola tutte le righe, non solo quelle senza metriche
+        chunk_size: righe per blocco (una transazione ciascuno)
+
+    Returns:
+        {'rows': righe aggiornate, 'seconds': durata}
+    """
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    try:
+        _ensure_pending_index(conn)
+        conn.commit()
+        pending = "" if full else "AND match_quality_score IS NULL"
+        select = (f"SELECT match_id, {', '.join(_INPUT_COLUMNS)} FROM match_detailed_stats "
+                  f"WHERE match_id > ? {pending} ORDER BY match_id LIMIT ?")
+        update = ("UPDATE match_detailed_stats SET p1_dominance_ratio = ?, p2_dominance_ratio = ?, "
+                  "match_quality_score = ? WHERE match_id = ?")
+
+        last_id = -1
+        updated = 0
+        while True:
+            rows = conn.execute(select, (last_id, chunk_size)).fetchall()
+            if not rows:
+                break
+            data = np.array(rows, dtype=np.float64)
+            ids = [row[0] for row in rows]
+            values = compute_match_metrics(data[:, 1:])
+            # NaN -> NULL (dominance non calcolabile)
+            metrics = values.astype(object)
+            metrics[np.isnan(values)] = None
+            with conn:
+                conn.executemany(update, zip(metrics[:, 0].tolist(), metrics[:, 1].tolist(),
+                                             metrics[:, 2].tolist(), ids))
+            updated += len(rows)
+            last_id = ids[-1]
+    finally:
+        conn.close()
+
+    result = {'rows': updated, 'seconds': round(time.perf_counter() - started, 3)}
+    if updated:
+        logger.info(f"Metriche partita aggiornate: {result}")
+    return result
+
+
+def update_after_etl(stats_db_path: str, verbose: bool = False) -> Optional[Dict[str, Any]]:
+    """Aggiornamento incrementale a fine ETL: un errore qui non deve far fallire il caricamento"""
+    try:
+        result = update_match_metrics(stats_db_path)
+    except Exception as e:
+        logger.error(f"Errore calcolo metriche partita: {e}")
+        if verbose:
+            print("Error computing match metrics:", str(e)[:160])
+        return None
+    if verbose and result['rows']:
+        print(f"Match metrics: {result}")
+    return result
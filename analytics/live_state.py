@@ -0,0 +1,474 @@
+"""
+Stato live delle partite aggiornato punto per punto
+
+Ogni partita mantiene la macchina a stati del punteggio (punti, giochi,
+set, tiebreak, servizio) e le metriche live aggiornate in O(1) per punto,
+senza conservare la sequenza dei punti:
+
+- momentum: media mobile esponenziale dei punti vinti pesata per leverage
+- dominance ratio: % punti vinti in risposta / % punti persi al servizio
+- leverage del punto giocato (TennisAdvancedMetrics.calculate_leverage)
+  e rendimento nei punti ad alta pressione
+
+Gli eventi arrivano da un feed JSONL riproducibile, una riga per evento:
+    {"type": "match", "match_id": "m1", "player1": "...", "player2": "...",
+     "tournament": "...", "surface": "Hard", "best_of": 3, "first_server": 1, "ts": 0}
+    {"type": "point", "match_id": "m1", "seq": 1, "winner": 1, "ts": 12.5,
+     "server": 1, "ace": false, "double_fault": false, "first_serve_in": true,
+     "ending": "winner" | "unforced_error" | "forced_error"}
+I campi server/ace/double_fault/first_serve_in/ending sono opzionali.
+Gli eventi con seq già elaborato vengono ignorati (replay idempotente).
+"""
+import argparse
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from analytics.advanced_metrics import TennisAdvancedMetrics
+from analytics.momentum import MomentumEWMA
+from services import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Emivita del momentum live (punti)
+MOMENTUM_HALF_LIFE = 10
+
+# Leverage oltre il quale un punto conta come "ad alta pressione"
+PRESSURE_LEVERAGE = 0.3
+
+# Partite concluse conservate nel tracker
+MAX_FINISHED = 200
+
+_POINT_LABELS = ('0', '15', '30', '40')
+_POINT_VALUES = (0, 15, 30, 40)
+
+
+class MatchState:
+    """Punteggio e metriche live di una partita (memoria costante)"""
+
+    __slots__ = (
+        'match_id', 'player1', 'player2', 'tournament', 'surface', 'best_of',
+        'sets', 'games', 'points', 'set_scores', 'tiebreak', 'game_server',
+        'finished', 'winner', 'last_seq', 'last_ts', 'points_played',
+        'serve_points', 'serve_won', 'aces', 'double_faults', 'first_serves_in',
+        'winners', 'unforced_errors', 'pressure_points', 'pressure_won',
+        'momentum_ewma', 'last_leverage',
+    )
+
+    def __init__(self, match_id: str, player1: str = 'Player 1', player2: str = 'Player 2',
+                 tournament: str = '', surface: str = '', best_of: int = 3, first_server: int = 1):
+        self.match_id = match_id
+        self.player1 = player1
+        self.player2 = player2
+        self.tournament = tournament
+        self.surface = surface
+        self.best_of = best_of
+
+        # Punteggio (indice 0 = player1, 1 = player2)
+        self.sets = [0, 0]
+        self.games = [0, 0]
+        self.points = [0, 0]
+        self.set_scores: List[tuple] = []
+        self.tiebreak = False
+        self.game_server = first_server - 1
+        self.finished = False
+        self.winner: Optional[int] = None
+        self.last_seq = 0
+        self.last_ts: Optional[float] = None
+        self.points_played = 0
+
+        # Contatori per giocatore
+        self.serve_points = [0, 0]
+        self.serve_won = [0, 0]
+        self.aces = [0, 0]
+        self.double_faults = [0, 0]
+        self.first_serves_in = [0, 0]
+        self.winners = [0, 0]
+        self.unforced_errors = [0, 0]
+        self.pressure_points = 0
+        self.pressure_won = [0, 0]
+
+        # Momentum di player1 pesato per leverage (player2 = 1 - momentum)
+        self.momentum_ewma = MomentumEWMA(MOMENTUM_HALF_LIFE)
+        self.last_leverage = 0.0
+
+    # === Macchina a stati del punteggio ===
+
+    @property
+    def server(self) -> int:
+        """Giocatore al servizio nel prossimo punto (0 o 1)"""
+        if not self.tiebreak:
+            return self.game_server
+        # Tiebreak: cambio dopo il primo punto e poi ogni due punti
+        played = self.points[0] + self.points[1]
+        return self.game_server if ((played + 1) // 2) % 2 == 0 else 1 - self.game_server
+
+    def score_dict(self) -> Dict[str, int]:
+        """Punteggio nel formato di TennisAdvancedMetrics.calculate_leverage"""
+        if self.tiebreak:
+            points = (0, 0)
+        else:
+            points = tuple(_POINT_VALUES[min(p, 3)] for p in self.points)
+        return {
+            'sets_p1': self.sets[0], 'sets_p2': self.sets[1],
+            'games_p1': self.games[0], 'games_p2': self.games[1],
+            'points_p1': points[0], 'points_p2': points[1],
+        }
+
+    def _win_point(self, p: int):
+        o = 1 - p
+        self.points[p] += 1
+        target = 7 if self.tiebreak else 4
+        if self.points[p] >= target and self.points[p] - self.points[o] >= 2:
+            self._win_game(p)
+
+    def _win_game(self, p: int):
+        o = 1 - p
+        was_tiebreak = self.tiebreak
+        self.games[p] += 1
+        self.points = [0, 0]
+        self.tiebreak = False
+        # Nel set successivo al tiebreak serve chi ha ricevuto per primo: in
+        # entrambi i casi il servizio passa all'altro giocatore
+        self.game_server = 1 - self.game_server
+
+        if was_tiebreak or (self.games[p] >= 6 and self.games[p] - self.games[o] >= 2):
+            self._win_set(p)
+        elif self.games[0] == 6 and self.games[1] == 6:
+            self.tiebreak = True
+
+    def _win_set(self, p: int):
+        self.set_scores.append((self.games[0], self.games[1]))
+        self.sets[p] += 1
+        self.games = [0, 0]
+        if self.sets[p] > self.best_of // 2:
+            self.finished = True
+            self.winner = p + 1
+
+    # === Punto ===
+
+    def apply_point(self, event: Dict[str, Any]):
+        """Aggiorna punteggio e metriche con un punto (O(1))"""
+        if self.finished:
+            return
+        p = int(event['winner']) - 1
+        server = int(event['server']) - 1 if event.get('server') else self.server
+        if server != self.server and not self.tiebreak:
+            # Il feed ha l'ultima parola su chi serve
+            self.game_server = server
+
+        # Leverage del punto giocato, calcolato sul punteggio prima del punto
+        leverage = TennisAdvancedMetrics.calculate_leverage(self.score_dict(), f"best_of_{self.best_of}")
+        self.last_leverage = leverage
+        if leverage >= PRESSURE_LEVERAGE:
+            self.pressure_points += 1
+            self.pressure_won[p] += 1
+
+        self.momentum_ewma.update(p == 0, leverage)
+
+        self.serve_points[server] += 1
+        if p == server:
+            self.serve_won[server] += 1
+        if event.get('ace'):
+            self.aces[server] += 1
+        if event.get('double_fault'):
+            self.double_faults[server] += 1
+        if event.get('first_serve_in'):
+            self.first_serves_in[server] += 1
+        ending = event.get('ending')
+        if ending == 'winner':
+            self.winners[p] += 1
+        elif ending == 'unforced_error':
+            self.unforced_errors[1 - p] += 1
+
+        self.points_played += 1
+        self._win_point(p)
+
+    # === Metriche ===
+
+    @property
+    def momentum(self) -> float:
+        """Momentum di player1 (0-1, 0.5 = equilibrio)"""
+        return self.momentum_ewma.value
+
+    def dominance_ratio(self, p: int) -> float:
+        """Dominance ratio del giocatore p (0 o 1) sui punti giocati finora"""
+        o = 1 - p
+        if not self.serve_points[p] or not self.serve_points[o]:
+            return 1.0
+        return_won_pct = (self.serve_points[o] - self.serve_won[o]) / self.serve_points[o]
+        serve_lost_pct = (self.serve_points[p] - self.serve_won[p]) / self.serve_points[p]
+        return TennisAdvancedMetrics.calculate_dominance_ratio(return_won_pct, serve_lost_pct)
+
+    def score_text(self) -> str:
+        """Es. '6-4 3-2 (30-15)'"""
+        parts = [f"{a}-{b}" for a, b in self.set_scores]
+        if not self.finished:
+            parts.append(f"{self.games[0]}-{self.games[1]}")
+            if self.tiebreak:
+                parts.append(f"(TB {self.points[0]}-{self.points[1]})")
+            elif any(self.points):
+                parts.append(f"({self._game_score()})")
+        return ' '.join(parts)
+
+    def _game_score(self) -> str:
+        a, b = self.points
+        if a >= 3 and b >= 3:
+            if a == b:
+                return '40-40'
+            return 'AD-40' if a > b else '40-AD'
+        return f"{_POINT_LABELS[a]}-{_POINT_LABELS[b]}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Stato nel formato delle card live (TennisDataFetcher.get_live_matches) più le metriche"""
+        momentum = self.momentum
+        return {
+            'match_id': self.match_id,
+            'player1': self.player1,
+            'player2': self.player2,
+            'tournament': self.tournament,
+            'surface': self.surface,
+            'status': 'finished' if self.finished else 'live',
+            'current_set': len(self.set_scores) + (0 if self.finished else 1),
+            'score': self.score_text(),
+            'server': self.server + 1,
+            'winner': self.winner,
+            'points_played': self.points_played,
+            'p1_aces': self.aces[0],
+            'p2_aces': self.aces[1],
+            'p1_double_faults': self.double_faults[0],
+            'p2_double_faults': self.double_faults[1],
+            'p1_first_serve_pct': round(100 * self.first_serves_in[0] / self.serve_points[0], 1) if self.serve_points[0] else 0.0,
+            'p2_first_serve_pct': round(100 * self.first_serves_in[1] / self.serve_points[1], 1) if self.serve_points[1] else 0.0,
+            'p1_winners': self.winners[0],
+            'p2_winners': self.winners[1],
+            'p1_unforced_errors': self.unforced_errors[0],
+            'p2_unforced_errors': self.unforced_errors[1],
+            'p1_momentum': round(momentum, 3),
+            'p2_momentum': round(1 - momentum, 3),
+            'p1_dominance_ratio': round(self.dominance_ratio(0), 3),
+            'p2_dominance_ratio': round(self.dominance_ratio(1), 3),
+            'leverage': round(self.last_leverage, 2),
+            'pressure_points': self.pressure_points,
+            'p1_pressure_won': self.pressure_won[0],
+            'p2_pressure_won': self.pressure_won[1],
+        }
+
+
+class LiveStateTracker:
+    """
+    Stato di tutte le partite live, alimentato da eventi punto per punto
+
+    Uso:
+        tracker = LiveStateTracker()
+        tracker.ingest_many(read_feed("data/live_feed.jsonl"))
+        tracker.live_matches()   # dict per le card live
+    """
+
+    def __init__(self, max_finished: int = MAX_FINISHED):
+        self.max_finished = max_finished
+        self.matches: Dict[str, MatchState] = {}
+        self._finished: 'OrderedDict[str, None]' = OrderedDict()
+        self.stats: Dict[str, int] = {'events': 0, 'points': 0, 'duplicates': 0, 'ignored': 0}
+
+    def ingest(self, event: Dict[str, Any]) -> Optional[MatchState]:
+        """Applica un evento del feed; restituisce lo stato della partita aggiornata"""
+        self.stats['events'] += 1
+        match_id = str(event.get('match_id', ''))
+        kind = event.get('type', 'point')
+
+        if kind == 'match':
+            state = self.matches.get(match_id)
+            if state is None:
+                state = MatchState(match_id, event.get('player1', 'Player 1'), event.get('player2', 'Player 2'),
+                                   event.get('tournament', ''), event.get('surface', ''),
+                                   int(event.get('best_of', 3)), int(event.get('first_server', 1)))
+                self.matches[match_id] = state
+            state.last_ts = event.get('ts', state.last_ts)
+            return state
+
+        if kind != 'point' or not match_id:
+            self.stats['ignored'] += 1
+            return None
+
+        state = self.matches.get(match_id)
+        if state is None:
+            state = self.matches[match_id] = MatchState(match_id)
+        seq = event.get('seq')
+        if seq is not None:
+            if seq <= state.last_seq:
+                self.stats['duplicates'] += 1
+                return state
+            state.last_seq = seq
+
+        was_finished = state.finished
+        state.apply_point(event)
+        state.last_ts = event.get('ts', state.last_ts)
+        self.stats['points'] += 1
+        if state.finished and not was_finished:
+            self._retire(match_id)
+        return state
+
+    def ingest_many(self, events: Iterable[Dict[str, Any]]) -> int:
+        """Applica una sequenza di eventi; restituisce quanti sono stati letti"""
+        count = 0
+        for event in events:
+            self.ingest(event)
+            count += 1
+        return count
+
+    def _retire(self, match_id: str):
+        """Le partite concluse restano visibili fino a max_finished, poi vengono scartate"""
+        self._finished[match_id] = None
+        while len(self._finished) > self.max_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            self.matches.pop(old_id, None)
+
+    def live_matches(self, include_finished: bool = False) -> List[Dict[str, Any]]:
+        return [
+            state.to_dict()
+            for state in self.matches.values()
+            if include_finished or not state.finished
+        ]
+
+
+# === Feed JSONL ===
+
+def read_feed(path: str) -> Iterator[Dict[str, Any]]:
+    """Eventi di un feed JSONL (righe vuote ignorate)"""
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield json_codec.loads(line)
+
+
+def write_feed(path: str, events: Iterable[Dict[str, Any]]) -> int:
+    count = 0
+    with open(path, 'wb') as f:
+        for event in events:
+            f.write(json_codec.dumps(event) + b'\n')
+            count += 1
+    return count
+
+
+class FeedReplayer:
+    """
+    Riproduce un feed JSONL a velocità reale (o accelerata) dentro un tracker
+
+    advance() applica gli eventi con ts trascorso dall'avvio, senza thread:
+    va chiamato prima di leggere lo stato (es. come fetch di LiveSnapshot).
+    """
+
+    def __init__(self, path: str, tracker: Optional[LiveStateTracker] = None, speed: float = 1.0):
+        self.path = path
+        self.tracker = tracker or LiveStateTracker()
+        self.speed = speed
+        self._events = read_feed(path)
+        self._pending: Optional[Dict[str, Any]] = None
+        self._t0: Optional[float] = None
+        self._ts0: Optional[float] = None
+        self.exhausted = False
+
+    def advance(self) -> int:
+        """Applica gli eventi maturi; restituisce quanti ne sono stati applicati"""
+        now = time.monotonic()
+        applied = 0
+        while not self.exhausted:
+            event = self._pending or next(self._events, None)
+            self._pending = None
+            if event is None:
+                self.exhausted = True
+                break
+            ts = float(event.get('ts', 0.0))
+            if self._t0 is None:
+                self._t0, self._ts0 = now, ts
+            if ts - self._ts0 > (now - self._t0) * self.speed:
+                self._pending = event
+                break
+            self.tracker.ingest(event)
+            applied += 1
+        return applied
+
+    def live_matches(self) -> List[Dict[str, Any]]:
+        self.advance()
+        return self.tracker.live_matches()
+
+
+def simulate_feed(n_matches: int = 10, seed: int = 42, best_of: int = 3,
+                  point_interval: float = 30.0) -> Iterator[Dict[str, Any]]:
+    """
+    Feed sintetico di n_matches partite giocate in parallelo (per test e demo)
+
+    Ogni giocatore vince il punto al servizio con probabilità tra 0.58 e 0.70;
+    i punti delle partite sono intercalati in ordine di ts.
+    """
+    rng = random.Random(seed)
+    trackers = {}
+    serve_win = {}
+    clock = {}
+    surfaces = ['Hard', 'Clay', 'Grass']
+    for i in range(n_matches):
+        match_id = f"sim_{i}"
+        event = {
+            'type': 'match', 'match_id': match_id,
+            'player1': f"Player {2 * i + 1}", 'player2': f"Player {2 * i + 2}",
+            'tournament': f"Simulated Open {i % 4 + 1}", 'surface': surfaces[i % 3],
+            'best_of': best_of, 'first_server': rng.choice([1, 2]), 'ts': 0.0,
+        }
+        yield event
+        trackers[match_id] = MatchState(match_id, best_of=best_of, first_server=event['first_server'])
+        serve_win[match_id] = (rng.uniform(0.58, 0.70), rng.uniform(0.58, 0.70))
+        clock[match_id] = rng.uniform(0, point_interval)
+
+    seq = {match_id: 0 for match_id in trackers}
+    while trackers:
+        match_id = min(clock, key=clock.get)
+        state = trackers[match_id]
+        server = state.server
+        first_in = rng.random() < 0.62
+        ace = first_in and rng.random() < 0.08
+        double_fault = not first_in and rng.random() < 0.1
+        if ace:
+            winner = server
+        elif double_fault:
+            winner = 1 - server
+        else:
+            winner = server if rng.random() < serve_win[match_id][server] else 1 - server
+        seq[match_id] += 1
+        event = {
+            'type': 'point', 'match_id': match_id, 'seq': seq[match_id], 'ts': round(clock[match_id], 2),
+            'server': server + 1, 'winner': winner + 1, 'ace': ace, 'double_fault': double_fault,
+            'first_serve_in': first_in,
+            'ending': None if ace or double_fault else rng.choice(['winner', 'unforced_error', 'forced_error']),
+        }
+        state.apply_point(event)
+        yield event
+
+        if state.finished:
+            del trackers[match_id], clock[match_id]
+        else:
+            clock[match_id] += rng.uniform(0.5, 1.5) * point_interval
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feed live sintetico e replay nel tracker")
+    parser.add_argument('feed', help='file JSONL del feed')
+    parser.add_argument('--simulate', type=int, metavar='N', help='genera prima un feed di N partite')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.simulate:
+        written = write_feed(args.feed, simulate_feed(args.simulate, seed=args.seed))
+        print(f"Feed scritto: {written} eventi in {args.feed}")
+
+    tracker = LiveStateTracker()
+    t0 = time.perf_counter()
+    events = tracker.ingest_many(read_feed(args.feed))
+    elapsed = time.perf_counter() - t0
+    print(f"Replay: {events} eventi in {elapsed:.2f}s ({events / elapsed:,.0f} eventi/s), stats={tracker.stats}")
+
+
+if __name__ == "__main__":
+    main()
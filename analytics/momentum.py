@@ -0,0 +1,140 @@
+"""
+Momentum Score come media mobile esponenziale dei punti vinti
+
+Il punto più recente ha il peso maggiore; il peso di un punto si dimezza
+ogni half_life punti successivi. MomentumEWMA aggiorna il valore in O(1)
+per punto (due somme decadute), momentum_series calcola in blocco con
+NumPy la serie completa di una o più partite.
+"""
+import math
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Emivita (in punti) di calculate_momentum_score: pesi 1, 0.5, 0.25, ...
+DEFAULT_HALF_LIFE = 1.0
+
+# Fattore di scala massimo nei blocchi di momentum_series (lontano dall'overflow)
+_MAX_SCALE_LOG = 150 * math.log(10)
+
+
+def decay_for(half_life: float) -> float:
+    """Fattore di decadimento per punto corrispondente all'emivita"""
+    if half_life <= 0:
+        raise ValueError("half_life deve essere positivo")
+    return 0.5 ** (1.0 / half_life)
+
+
+class MomentumEWMA:
+    """
+    Accumulatore streaming del momentum di un giocatore
+
+    Uso:
+        momentum = MomentumEWMA(half_life=10)
+        for won, leverage in points:
+            momentum.update(won, leverage)
+        momentum.value   # 0-1, 0.5 senza punti
+    """
+
+    __slots__ = ('half_life', 'decay', 'weighted_won', 'total_weight')
+
+    def __init__(self, half_life: float = DEFAULT_HALF_LIFE):
+        self.half_life = half_life
+        self.decay = decay_for(half_life)
+        self.weighted_won = 0.0
+        self.total_weight = 0.0
+
+    def update(self, won: float, weight: float = 1.0) -> float:
+        """Aggiunge un punto (won: 1/True vinto, 0/False perso) con peso opzionale (es. leverage)"""
+        self.weighted_won = self.weighted_won * self.decay + weight * float(won)
+        self.total_weight = self.total_weight * self.decay + weight
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.weighted_won / self.total_weight if self.total_weight > 0 else 0.5
+
+    def reset(self):
+        self.weighted_won = 0.0
+        self.total_weight = 0.0
+
+
+def momentum_score(points: Sequence[bool], weights: Optional[Sequence[float]] = None,
+                   half_life: float = DEFAULT_HALF_LIFE) -> float:
+    """
+    Momentum di una sequenza di punti in ordine cronologico (ultimo = più recente)
+
+    I punti sono pesati per recenza con l'emivita indicata; weights
+    opzionali (es. leverage, allineati ai punti) moltiplicano il peso di
+    recenza, come in MomentumEWMA.update e momentum_series.
+    """
+    n = len(points) if weights is None else min(len(points), len(weights))
+    if n == 0:
+        return 0.5
+    won = np.asarray(points[:n], dtype=np.float64)
+    w = decay_for(half_life) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    if weights is not None:
+        w = w * np.asarray(weights[:n], dtype=np.float64)
+    total = w.sum()
+    return float(won @ w / total) if total > 0 else 0.5
+
+
+def _decayed_cumsum(values: np.ndarray, decay: float) -> np.ndarray:
+    """
+    s[t] = decay * s[t-1] + values[t] lungo l'ultimo asse, vettorizzato
+
+    Entro ogni blocco s[t] = decay^t * cumsum(values[k] / decay^k): i termini
+    sono tutti non negativi (nessuna cancellazione) e la lunghezza del blocco
+    limita decay^-k lontano dall'overflow.
+    """
+    n = values.shape[-1]
+    block = max(1, int(_MAX_SCALE_LOG / -math.log(decay))) if decay < 1 else n
+    out = np.empty_like(values)
+    carry = np.zeros(values.shape[:-1])
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        k = np.arange(1, stop - start + 1, dtype=np.float64)
+        scale = decay ** k
+        chunk = np.cumsum(values[..., start:stop] / scale, axis=-1) * scale
+        chunk += carry[..., None] * scale
+        out[..., start:stop] = chunk
+        carry = chunk[..., -1]
+    return out
+
+
+def momentum_series(points: np.ndarray, weights: Optional[np.ndarray] = None,
+                    half_life: float = DEFAULT_HALF_LIFE) -> np.ndarray:
+    """
+    Serie del momentum dopo ogni punto, per una o più partite insieme
+
+    Args:
+        points: array (n_punti,) o (n_partite, n_punti) con 1 = punto vinto,
+            0 = perso, NaN = padding per partite più corte (vedi pad_matches)
+        weights: pesi per punto (es. leverage) con la stessa forma, opzionali
+        half_life: emivita in punti
+
+    Returns:
+        array della stessa forma: momentum (0-1) dopo ogni punto, NaN sul padding
+    """
+    points = np.asarray(points, dtype=np.float64)
+    padding = np.isnan(points)
+    won = np.where(padding, 0.0, points)
+    w = np.ones_like(won) if weights is None else np.nan_to_num(np.asarray(weights, dtype=np.float64))
+    w = np.where(padding, 0.0, w)
+
+    decay = decay_for(half_life)
+    weighted_won = _decayed_cumsum(won * w, decay)
+    total_weight = _decayed_cumsum(w, decay)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        series = np.where(total_weight > 0, weighted_won / total_weight, 0.5)
+    series[padding] = np.nan
+    return series
+
+
+def pad_matches(matches: Sequence[Sequence[float]]) -> np.ndarray:
+    """Sequenze di punti di lunghezza diversa -> matrice (n_partite, max_punti) con NaN finali"""
+    width = max((len(m) for m in matches), default=0)
+    out = np.full((len(matches), width), np.nan)
+    for i, match in enumerate(matches):
+        out[i, :len(match)] = match
+    return out
@@ -0,0 +1,329 @@
+"""
+Parameter sweep parallelo (grid / random search) per la strategia value bet
+
+Lo storico viene caricato una sola volta e pubblicato in shared memory: i
+worker del ProcessPoolExecutor vi accedono tramite viste NumPy senza ricevere
+copie serializzate degli array. I risultati sono salvati su disco per hash
+dei parametri (e dei dati), quindi rieseguire uno sweep con un nuovo valore
+calcola solo le combinazioni mancanti.
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analytics.backtest import (
+    DEFAULT_CHUNKSIZE,
+    HISTORY_COLUMNS,
+    build_curves,
+    compute_value_edges,
+    iter_history,
+    select_value_bets,
+    simulate_days,
+    summarize_curves,
+)
+
+logger = logging.getLogger(__name__)
+
+# Parametri valutati per ogni combinazione e relativi default
+SWEEP_DEFAULTS = {
+    'min_edge': 0.05,
+    'kelly_fraction': 0.25,
+    'flat_stake': None,
+    'initial_bankroll': 1000.0,
+    'surfaces': None,
+    'tournaments': None
+}
+
+# Array condivisi dello storico (nome -> dtype)
+_SHARED_ARRAYS = {
+    'day': np.int64,
+    'odds_p1': np.float64,
+    'odds_p2': np.float64,
+    'prob_p1': np.float64,
+    'prob_p2': np.float64,
+    'winner': np.int8,
+    'surface': np.int16,
+    'tournament': np.int32
+}
+
+# Stato del processo worker (popolato dall'initializer)
+_worker_arrays: Dict[str, np.ndarray] = {}
+_worker_shm: List[shared_memory.SharedMemory] = []
+
+
+class SharedHistory:
+    """Storico partite/quote caricato una volta e condiviso via shared memory"""
+
+    def __init__(self, source: Tuple, chunksize: int = DEFAULT_CHUNKSIZE):
+        self.source = source
+        # None se lo storico non ha la colonna: il filtro corrispondente
+        # viene ignorato, come in ValueBetBacktester
+        self.surfaces: Optional[List[str]] = []
+        self.tournaments: Optional[List[str]] = []
+        self._shm: Dict[str, shared_memory.SharedMemory] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+
+        self._load(chunksize)
+        self.fingerprint = self._fingerprint()
+
+    def _load(self, chunksize: int):
+        """Legge la sorgente a blocchi e costruisce gli array colonnari"""
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in _SHARED_ARRAYS}
+        surface_codes: Dict[str, int] = {}
+        tournament_codes: Dict[str, int] = {}
+        has_surface = has_tournament = False
+
+        for chunk in iter_history(self.source, chunksize):
+            missing = [c for c in HISTORY_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"Colonne mancanti nello storico: {missing}")
+
+            match_time = pd.to_datetime(chunk['match_time'], utc=True, errors='coerce')
+            valid = (match_time.notna() & (chunk['odds_p1'] > 1) & (chunk['odds_p2'] > 1)
+                     & chunk['winner'].isin([1, 2]))
+            chunk = compute_value_edges(chunk[valid])
+            match_time = match_time[valid]
+
+            has_surface |= 'surface' in chunk.columns
+            has_tournament |= 'tournament_name' in chunk.columns
+            surface = chunk['surface'] if 'surface' in chunk.columns else pd.Series('', index=chunk.index)
+            tournament = (chunk['tournament_name'] if 'tournament_name' in chunk.columns
+                          else pd.Series('', index=chunk.index))
+
+            parts['day'].append(match_time.dt.tz_localize(None).values.astype('datetime64[D]').astype(np.int64))
+            parts['odds_p1'].append(chunk['odds_p1'].to_numpy(np.float64))
+            parts['odds_p2'].append(chunk['odds_p2'].to_numpy(np.float64))
+            parts['prob_p1'].append(chunk['player1_prob'].to_numpy(np.float64))
+            parts['prob_p2'].append(chunk['player2_prob'].to_numpy(np.float64))
+            parts['winner'].append(chunk['winner'].to_numpy(np.int8))
+            parts['surface'].append(self._encode(surface.fillna(''), surface_codes))
+            parts['tournament'].append(self._encode(tournament.fillna(''), tournament_codes))
+
+        self.surfaces = list(surface_codes) if has_surface else None
+        self.tournaments = list(tournament_codes) if has_tournament else None
+
+        order = None
+        for name, dtype in _SHARED_ARRAYS.items():
+            data = np.concatenate(parts[name]).astype(dtype) if parts[name] else np.empty(0, dtype=dtype)
+            if order is None:
+                # Ordinamento cronologico stabile (richiesto da simulate_days)
+                order = np.argsort(data, kind='stable')
+            self.arrays[name] = self._publish(name, data[order])
+
+    @staticmethod
+    def _encode(values: pd.Series, codes: Dict[str, int]) -> np.ndarray:
+        """Codifica stringhe in interi mantenendo un vocabolario globale"""
+        uniques, inverse = np.unique(values.astype(str).to_numpy(), return_inverse=True)
+        mapping = np.array([codes.setdefault(u, len(codes)) for u in uniques], dtype=np.int64)
+        return mapping[inverse] if len(uniques) else np.empty(0, dtype=np.int64)
+
+    def _publish(self, name: str, data: np.ndarray) -> np.ndarray:
+        """Copia un array in un blocco di shared memory e ne restituisce la vista"""
+        shm = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+        view = np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)
+        view[:] = data
+        self._shm[name] = shm
+        return view
+
+    def _fingerprint(self) -> str:
+        """Hash del contenuto dello storico (invalida la cache se i dati cambiano)"""
+        digest = hashlib.sha1()
+        for name in _SHARED_ARRAYS:
+            digest.update(self.arrays[name].tobytes())
+        digest.update(json.dumps([self.surfaces, self.tournaments]).encode('utf-8'))
+        return digest.hexdigest()
+
+    @property
+    def spec(self) -> Dict[str, Tuple[str, str, int]]:
+        """Descrizione serializzabile dei blocchi condivisi (nome shm, dtype, lunghezza)"""
+        return {
+            name: (self._shm[name].name, np.dtype(dtype).str, len(self.arrays[name]))
+            for name, dtype in _SHARED_ARRAYS.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.arrays['day'])
+
+    def close(self):
+        """Rilascia e distrugge i blocchi di shared memory"""
+        self.arrays = {}
+        for shm in self._shm.values():
+            shm.close()
+            shm.unlink()
+        self._shm = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _attach_worker(spec: Dict[str, Tuple[str, str, int]], surfaces: Optional[List[str]],
+                   tournaments: Optional[List[str]]):
+    """Initializer dei worker: collega le viste NumPy alla shared memory"""
+    # I worker condividono il resource tracker del processo principale,
+    # che resta l'unico responsabile della distruzione dei blocchi
+    for name, (shm_name, dtype, length) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_shm.append(shm)
+        _worker_arrays[name] = np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf)
+
+    _worker_arrays['_surfaces'] = surfaces
+    _worker_arrays['_tournaments'] = tournaments
+
+
+def evaluate_params(arrays: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Valuta una combinazione di parametri sugli array dello storico
+
+    I filtri su superfici e tornei sono ignorati se lo storico non ha la
+    colonna corrispondente (_surfaces/_tournaments None), come in
+    ValueBetBacktester.
+    """
+    mask = np.ones(len(arrays['day']), dtype=bool)
+
+    if params.get('surfaces') is not None and arrays['_surfaces'] is not None:
+        codes = [i for i, s in enumerate(arrays['_surfaces']) if s in params['surfaces']]
+        mask &= np.isin(arrays['surface'], codes)
+    if params.get('tournaments') is not None and arrays['_tournaments'] is not None:
+        codes = [i for i, t in enumerate(arrays['_tournaments']) if t in params['tournaments']]
+        mask &= np.isin(arrays['tournament'], codes)
+
+    bet_mask, odds, prob, won = select_value_bets(
+        arrays['odds_p1'][mask], arrays['odds_p2'][mask],
+        arrays['prob_p1'][mask], arrays['prob_p2'][mask],
+        arrays['winner'][mask], params['min_edge']
+    )
+    days = arrays['day'][mask][bet_mask]
+
+    state = {'bankroll': float(params['initial_bankroll'])}
+    daily = simulate_days(days, odds, prob, won, state, params['kelly_fraction'], params['flat_stake'])
+    curves = build_curves([daily], params['initial_bankroll'])
+
+    return summarize_curves(curves, params['initial_bankroll'], int(mask.sum()))
+
+
+def _evaluate_worker(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Task eseguito nei worker sugli array condivisi"""
+    return evaluate_params(_worker_arrays, params)
+
+
+class ParameterSweepRunner:
+    """Grid/random search parallela con cache dei risultati per hash dei parametri"""
+
+    def __init__(self, history: SharedHistory, cache_dir: str = "data/sweep_cache",
+                 max_workers: Optional[int] = None):
+        self.history = history
+        self.max_workers = max_workers
+        self.cache_dir = os.path.join(cache_dir, history.fingerprint[:16])
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def grid(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """Prodotto cartesiano dei valori dello spazio dei parametri"""
+        keys = list(space)
+        return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+    @staticmethod
+    def random_search(space: Dict[str, Any], n_samples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Campionamento casuale dello spazio dei parametri
+
+        Ogni valore può essere una lista (scelta discreta) o una tupla
+        (min, max) per un campionamento uniforme continuo.
+        """
+        rng = random.Random(seed)
+        samples = []
+        for _ in range(n_samples):
+            sample = {}
+            for key, values in space.items():
+                if isinstance(values, tuple) and len(values) == 2:
+                    sample[key] = round(rng.uniform(*values), 4)
+                else:
+                    sample[key] = rng.choice(list(values))
+            samples.append(sample)
+        return samples
+
+    @staticmethod
+    def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Completa i default e ordina i filtri per ottenere un hash stabile"""
+        unknown = set(params) - set(SWEEP_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Parametri non supportati: {sorted(unknown)}")
+
+        normalized = {**SWEEP_DEFAULTS, **params}
+        for key in ('surfaces', 'tournaments'):
+            if normalized[key] is not None:
+                normalized[key] = sorted(normalized[key])
+        return normalized
+
+    @staticmethod
+    def params_hash(params: Dict[str, Any]) -> str:
+        """Hash deterministico di una combinazione normalizzata"""
+        return hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._cache_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key: str, result: Dict[str, Any]):
+        tmp_path = self._cache_path(key) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, self._cache_path(key))
+
+    def run(self, param_list: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Valuta tutte le combinazioni, calcolando solo quelle non in cache
+
+        Returns:
+            DataFrame con una riga per combinazione (parametri + metriche)
+        """
+        combos = [self.normalize_params(p) for p in param_list]
+        keys = [self.params_hash(p) for p in combos]
+
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        for key, params in zip(keys, combos):
+            cached = self._load_cached(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = params
+
+        logger.info(f"Sweep: {len(combos)} combinazioni, {len(pending)} da calcolare, "
+                    f"{len(combos) - len(pending)} in cache")
+
+        if pending:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_attach_worker,
+                initargs=(self.history.spec, self.history.surfaces, self.history.tournaments)
+            ) as executor:
+                futures = {key: executor.submit(_evaluate_worker, params) for key, params in pending.items()}
+                for key, future in futures.items():
+                    summary = future.result()
+                    results[key] = summary
+                    self._store(key, summary)
+
+        rows = [{**params, **results[key], 'params_hash': key} for key, params in zip(keys, combos)]
+        return pd.DataFrame(rows)
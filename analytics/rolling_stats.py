@@ -0,0 +1,249 @@
+"""
+Statistiche a finestra mobile per giocatore (forma, hot hand, superfici)
+
+Ogni giocatore ha un buffer dei risultati recenti con timestamp già
+convertiti, limitato per numero (window) e per età (max_age_days), con
+somme correnti aggiornate a ogni inserimento ed espulsione. Le medie con
+decadimento temporale (emivita in giorni) sono mantenute con due somme
+decadute. Ogni nuovo risultato costa O(1) ammortizzato; le feature di
+tutti i giocatori in programma si ottengono con batch_features().
+
+I risultati di un giocatore vanno aggiunti in ordine cronologico: quelli
+più vecchi dell'ultimo entrano nelle medie decadute con il peso corretto,
+ma non nell'ordine del buffer.
+"""
+import math
+from collections import deque
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Union
+
+import pandas as pd
+
+SURFACES = ('Hard', 'Clay', 'Grass')
+
+DEFAULT_WINDOW = 50
+DEFAULT_MAX_AGE_DAYS = 90
+DEFAULT_HALF_LIFE_DAYS = 30
+HOT_HAND_WINDOW = 5
+
+_DAY = 86400.0
+
+Timestamp = Union[float, int, str, datetime, date]
+
+
+def to_timestamp(value: Timestamp) -> float:
+    """Epoch in secondi da epoch, datetime/date o stringa ISO 8601 (naive = UTC)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def form_match_score(won: bool, opponent_ranking: Optional[float] = None) -> float:
+    """Punteggio forma di una partita (stessa scala di calculate_form_rating)"""
+    ranking = 100 if opponent_ranking is None else opponent_ranking
+    if won:
+        return 70 + min(30, ranking / 10)
+    return 30 - min(20, ranking / 20)
+
+
+def _optional(value: Any) -> Any:
+    """NaN/NaT (celle vuote di un DataFrame) -> None"""
+    return None if value is None or (not isinstance(value, str) and pd.isna(value)) else value
+
+
+class PlayerWindow:
+    """Risultati recenti e somme correnti di un giocatore"""
+
+    __slots__ = ('results', 'wins', 'score_sum', 'surface_counts', 'decayed_won', 'decayed_score',
+                 'decayed_weight', 'last_ts', 'streak')
+
+    def __init__(self):
+        # (timestamp, vinto, superficie, punteggio forma)
+        self.results: deque = deque()
+        self.wins = 0
+        self.score_sum = 0.0
+        self.surface_counts: Dict[str, List[int]] = {}
+        self.decayed_won = 0.0
+        self.decayed_score = 0.0
+        self.decayed_weight = 0.0
+        self.last_ts: Optional[float] = None
+        # > 0 vittorie consecutive, < 0 sconfitte consecutive
+        self.streak = 0
+
+    def add(self, ts: float, won: bool, surface: Optional[str], score: float,
+            window: int, max_age: float, decay_rate: float):
+        if self.last_ts is None or ts >= self.last_ts:
+            # Le somme esistenti decadono fino al nuovo risultato
+            factor = math.exp(-decay_rate * (ts - self.last_ts)) if self.last_ts is not None else 1.0
+            self.decayed_won *= factor
+            self.decayed_score *= factor
+            self.decayed_weight *= factor
+            self.last_ts = ts
+            weight = 1.0
+            self.streak = (self.streak + 1 if self.streak > 0 else 1) if won else (self.streak - 1 if self.streak < 0 else -1)
+        else:
+            # Risultato arretrato: entra già decaduto rispetto all'ultimo
+            weight = math.exp(-decay_rate * (self.last_ts - ts))
+        self.decayed_won += weight * won
+        self.decayed_score += weight * score
+        self.decayed_weight += weight
+
+        self.results.append((ts, won, surface, score))
+        self.wins += won
+        self.score_sum += score
+        if surface:
+            counts = self.surface_counts.setdefault(surface, [0, 0])
+            counts[0] += won
+            counts[1] += 1
+
+        while len(self.results) > window:
+            self._pop()
+        self.expire(self.last_ts - max_age)
+
+    def expire(self, cutoff: float):
+        """Espelle i risultati più vecchi di cutoff"""
+        while self.results and self.results[0][0] < cutoff:
+            self._pop()
+
+    def _pop(self):
+        _, won, surface, score = self.results.popleft()
+        self.wins -= won
+        self.score_sum -= score
+        if surface:
+            counts = self.surface_counts[surface]
+            counts[0] -= won
+            counts[1] -= 1
+
+    def longest_streak(self, won: bool = True) -> int:
+        """Serie più lunga di vittorie (o sconfitte) nella finestra"""
+        best = run = 0
+        for result in self.results:
+            run = run + 1 if result[1] == won else 0
+            best = max(best, run)
+        return best
+
+
+class RollingStatsEngine:
+    """
+    Feature a finestra mobile per giocatore (chiave: id o nome)
+
+    Uso:
+        engine = RollingStatsEngine()
+        engine.add_match("Sinner", "Alcaraz", "2024-06-01T14:00:00", winner=1, surface="Clay")
+        engine.features("Sinner")
+        engine.batch_features(players_on_card)   # DataFrame
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+                 half_life_days: float = DEFAULT_HALF_LIFE_DAYS, hot_hand_window: int = HOT_HAND_WINDOW):
+        self.window = window
+        self.max_age = max_age_days * _DAY
+        self.decay_rate = math.log(2) / (half_life_days * _DAY)
+        self.hot_hand_window = hot_hand_window
+        self.players: Dict[Hashable, PlayerWindow] = {}
+
+    # === Aggiornamento ===
+
+    def add_result(self, player: Hashable, ts: Timestamp, won: bool, surface: Optional[str] = None,
+                   opponent_ranking: Optional[float] = None):
+        """Aggiunge un risultato del giocatore (O(1) ammortizzato)"""
+        state = self.players.get(player)
+        if state is None:
+            state = self.players[player] = PlayerWindow()
+        state.add(to_timestamp(ts), bool(won), surface, form_match_score(won, opponent_ranking),
+                  self.window, self.max_age, self.decay_rate)
+
+    def add_match(self, player1: Hashable, player2: Hashable, ts: Timestamp, winner: int,
+                  surface: Optional[str] = None, ranking_p1: Optional[float] = None,
+                  ranking_p2: Optional[float] = None):
+        """Aggiunge una partita conclusa (winner: 1 o 2) a entrambi i giocatori"""
+        ts = to_timestamp(ts)
+        self.add_result(player1, ts, winner == 1, surface, ranking_p2)
+        self.add_result(player2, ts, winner == 2, surface, ranking_p1)
+
+    def load_matches(self, matches: Union[pd.DataFrame, Iterable[Dict[str, Any]]]) -> int:
+        """
+        Carica uno storico partite (ordinato per match_time)
+
+        Colonne: player1, player2, match_time, winner (1/2) e opzionali
+        surface, ranking_p1, ranking_p2 (NaN = valore mancante).
+        """
+        rows = matches.to_dict('records') if isinstance(matches, pd.DataFrame) else matches
+        count = 0
+        for row in rows:
+            self.add_match(row['player1'], row['player2'], row['match_time'], int(row['winner']),
+                           _optional(row.get('surface')), _optional(row.get('ranking_p1')),
+                           _optional(row.get('ranking_p2')))
+            count += 1
+        return count
+
+    # === Feature ===
+
+    def features(self, player: Hashable, now: Optional[Timestamp] = None) -> Dict[str, Any]:
+        """Feature correnti del giocatore (valori neutri se senza storico)"""
+        state = self.players.get(player)
+        now_ts = to_timestamp(now) if now is not None else datetime.now(timezone.utc).timestamp()
+        if state is not None:
+            state.expire(now_ts - self.max_age)
+        if state is None or state.decayed_weight == 0:
+            return self._empty_features()
+
+        n = len(state.results)
+        recent = list(state.results)[-self.hot_hand_window:]
+        features = {
+            'matches_in_window': n,
+            'win_rate': state.wins / n if n else None,
+            'form_rating': state.score_sum / n if n else 50.0,
+            'decayed_win_rate': state.decayed_won / state.decayed_weight,
+            'decayed_form_rating': state.decayed_score / state.decayed_weight,
+            'current_streak': state.streak,
+            'longest_win_streak': state.longest_streak(True),
+            'longest_loss_streak': state.longest_streak(False),
+            'hot_hand_probability': self._hot_hand(recent),
+            'days_since_last': (now_ts - state.last_ts) / _DAY,
+        }
+        for surface in SURFACES:
+            wins, total = state.surface_counts.get(surface, (0, 0))
+            features[f'{surface.lower()}_matches'] = total
+            features[f'{surface.lower()}_win_rate'] = wins / total if total else None
+        return features
+
+    def _hot_hand(self, recent: List[tuple]) -> float:
+        """Come TennisAdvancedMetrics.calculate_hot_hand_probability sugli ultimi risultati"""
+        if len(recent) < self.hot_hand_window:
+            return 0.5
+        wins = sum(r[1] for r in recent)
+        return max(0.1, min(0.9, 0.5 + (wins / self.hot_hand_window - 0.5) * 0.2))
+
+    def _empty_features(self) -> Dict[str, Any]:
+        features = {
+            'matches_in_window': 0, 'win_rate': None, 'form_rating': 50.0,
+            'decayed_win_rate': None, 'decayed_form_rating': 50.0,
+            'current_streak': 0, 'longest_win_streak': 0, 'longest_loss_streak': 0,
+            'hot_hand_probability': 0.5, 'days_since_last': None,
+        }
+        for surface in SURFACES:
+            features[f'{surface.lower()}_matches'] = 0
+            features[f'{surface.lower()}_win_rate'] = None
+        return features
+
+    def batch_features(self, players: Iterable[Hashable], now: Optional[Timestamp] = None) -> pd.DataFrame:
+        """Feature di più giocatori (es. tutti quelli in programma oggi), una riga per giocatore"""
+        now_ts = to_timestamp(now) if now is not None else datetime.now(timezone.utc).timestamp()
+        players = list(dict.fromkeys(players))
+        return pd.DataFrame([self.features(p, now_ts) for p in players], index=pd.Index(players, name='player'))
+
+    def card_features(self, matches: pd.DataFrame, player1_col: str = 'player1_name',
+                      player2_col: str = 'player2_name', now: Optional[Timestamp] = None) -> pd.DataFrame:
+        """Aggiunge a un DataFrame di partite le feature dei due giocatori (prefissi p1_/p2_)"""
+        if matches.empty:
+            return matches
+        features = self.batch_features(pd.concat([matches[player1_col], matches[player2_col]]), now)
+        out = matches.join(features.add_prefix('p1_'), on=player1_col)
+        return out.join(features.add_prefix('p2_'), on=player2_col)
@@ -0,0 +1,53 @@
+"""
+Regole di staking vettorizzate (Kelly frazionario e vincoli Betfair Italia)
+"""
+import numpy as np
+
+from config.betfair_it import ITALIAN_BETTING_RULES
+
+
+def kelly_stakes(bankroll: float, probabilities: np.ndarray, odds: np.ndarray,
+                 kelly_fraction: float = 0.25) -> np.ndarray:
+    """
+    Calcola le puntate Kelly frazionarie per un array di selezioni
+
+    f* = (p * quota - 1) / (quota - 1), puntata = bankroll * frazione * f*
+    Le selezioni con edge negativo ricevono puntata zero.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    odds = np.asarray(odds, dtype=np.float64)
+
+    net_odds = odds - 1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        full_kelly = (probabilities * odds - 1.0) / net_odds
+    full_kelly = np.where(np.isfinite(full_kelly) & (full_kelly > 0), full_kelly, 0.0)
+
+    return bankroll * kelly_fraction * full_kelly
+
+
+def apply_italian_stake_rules(stakes: np.ndarray, odds: np.ndarray) -> np.ndarray:
+    """
+    Adatta le puntate (in euro) alle regole del mercato italiano
+
+    - arrotondamento per difetto agli incrementi di 0,50€
+    - puntata minima di 2€ (sotto soglia la puntata viene azzerata)
+    - vincita potenziale limitata a max_winnings_per_bet_euros
+    """
+    stakes = np.asarray(stakes, dtype=np.float64)
+    odds = np.asarray(odds, dtype=np.float64)
+
+    increment = ITALIAN_BETTING_RULES['stake_increment_euro_cents']
+    min_stake = ITALIAN_BETTING_RULES['min_back_stake_euro_cents']
+    max_winnings = ITALIAN_BETTING_RULES['max_winnings_per_bet_euros']
+
+    # Tetto sulla vincita: puntata * (quota - 1) <= vincita massima
+    net_odds = odds - 1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cap = np.where(net_odds > 0, max_winnings / net_odds, 0.0)
+    stakes = np.minimum(np.nan_to_num(stakes, nan=0.0), cap)
+
+    # Lavora in centesimi per evitare errori di arrotondamento
+    cents = np.floor(np.round(stakes * 100, 6) / increment) * increment
+    cents = np.where(cents >= min_stake, cents, 0.0)
+
+    return cents / 100.0
@@ -0,0 +1,39 @@
+"""
+Registro delle pagine dell'app Streamlit
+
+app.py è l'unico entrypoint: importa solo questo registro e, ad ogni
+esecuzione, il modulo della pagina aperta. Ogni pagina è un modulo con una
+funzione render(); le sue dipendenze pesanti (pandas, plotly, servizi
+Betfair, sistema statistiche) vengono quindi caricate solo alla prima
+apertura della pagina e poi restano in sys.modules per tutte le sessioni.
+"""
+import importlib
+from typing import Callable, List, NamedTuple
+
+
+class PageSpec(NamedTuple):
+    title: str
+    module: str
+    description: str
+
+
+PAGES: List[PageSpec] = [
+    PageSpec("🎯 Value Betting (Betfair)", "app_pages.value_betting",
+             "Quote Betfair Italia, fair odds ed edge per partita"),
+    PageSpec("📊 Sistema Statistiche Complete", "app_pages.statistics",
+             "Statistiche giocatori, partite, tornei e live"),
+    PageSpec("⚡ Dashboard Integrata", "app_pages.integrated",
+             "Value betting combinato con statistiche e predizioni"),
+    PageSpec("🔧 Configurazione", "app_pages.settings",
+             "Betfair, database statistiche e integrazioni"),
+]
+
+
+def page_titles() -> List[str]:
+    return [page.title for page in PAGES]
+
+
+def load_page(title: str) -> Callable[[], None]:
+    """Importa (una sola volta per processo) il modulo della pagina e ne ritorna render()"""
+    spec = next((page for page in PAGES if page.title == title), PAGES[0])
+    return importlib.import_module(spec.module).render
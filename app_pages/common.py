@@ -0,0 +1,185 @@
+"""
+Dati condivisi dalle pagine: client Betfair, quote del giorno e dati demo
+"""
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.betfair_it import TENNIS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def is_demo_mode() -> bool:
+    return os.getenv('DEMO_MODE', 'true').lower() == 'true'
+
+
+# Keeper attivo per il processo: fermato prima di crearne un altro
+_session_keeper = None
+
+
+@st.cache_resource
+def _betfair_session(app_key: str):
+    """
+    Sessione Betfair con keep-alive in background (una per processo)
+
+    Separata dal client: nessun pulsante della UI svuota questa cache, così
+    non si avviano nuovi thread di keep-alive né nuovi login.
+    """
+    global _session_keeper
+    from services.betfair_session import BetfairItalySession
+    from services.session_keepalive import SessionKeeper
+
+    if _session_keeper is not None:
+        _session_keeper.stop()
+    session = BetfairItalySession(app_key, os.getenv('BETFAIR_USERNAME'), os.getenv('BETFAIR_PASSWORD'))
+    # Login e keep-alive avvengono in background, mai durante il render
+    _session_keeper = SessionKeeper(session, os.getenv('BETFAIR_CERT_PATH'), os.getenv('BETFAIR_KEY_PATH')).start()
+    return session
+
+
+@st.cache_resource
+def init_betfair_client():
+    """Inizializza il client Betfair Italia (una volta per processo)"""
+    app_key = os.getenv('BETFAIR_APP_KEY')
+    if is_demo_mode() or not app_key:
+        return None
+
+    # Servizi Betfair importati solo fuori dalla modalità demo
+    from services.betfair_client import BetfairItalyClient
+
+    try:
+        return BetfairItalyClient(_betfair_session(app_key))
+    except Exception as e:
+        logger.error(f"Errore inizializzazione Betfair: {e}")
+        return None
+
+
+def get_tennis_data_betfair(client) -> pd.DataFrame:
+    """Recupera dati tennis reali da Betfair Italia (dati demo se non disponibili)"""
+    if not client:
+        return generate_mock_tennis_data()
+
+    try:
+        # Il login è gestito dal SessionKeeper: se la sessione non è ancora
+        # pronta si mostrano i dati demo invece di bloccare la pagina
+        if not client.session.is_logged_in():
+            st.warning("⏳ Sessione Betfair in fase di connessione, riprova tra qualche secondo")
+            return generate_mock_tennis_data()
+
+        tennis_odds = client.get_tennis_odds_realtime(
+            competition_filter=TENNIS_CONFIG['competition_filters'][:5]  # Limita per performance
+        )
+
+        if not tennis_odds:
+            st.warning("Nessun dato tennis disponibile da Betfair")
+            return generate_mock_tennis_data()
+
+        matches_data = []
+        for match in tennis_odds:
+            if len(match['runners']) >= 2:
+                player1 = match['runners'][0]
+                player2 = match['runners'][1]
+
+                p1_back = player1['back_prices'][0]['price'] if player1['back_prices'] else 2.0
+                p2_back = player2['back_prices'][0]['price'] if player2['back_prices'] else 2.0
+
+                p1_prob = 1 / p1_back if p1_back > 1 else 0.5
+                p2_prob = 1 / p2_back if p2_back > 1 else 0.5
+
+                matches_data.append({
+                    'match': match['event_name'],
+                    'tournament': match['competition'],
+                    'player1': player1['runner_name'],
+                    'player2': player2['runner_name'],
+                    'player1_odds': p1_back,
+                    'player2_odds': p2_back,
+                    'player1_prob': p1_prob,
+                    'player2_prob': p2_prob,
+                    'market_id': match['market_id'],
+                    'start_time': match['market_start_time'],
+                    'value_bet': abs(p1_prob - p2_prob) > 0.1
+                })
+
+        return pd.DataFrame(matches_data)
+
+    except Exception as e:
+        st.error(f"Errore recupero dati Betfair: {e}")
+        return generate_mock_tennis_data()
+
+
+def generate_mock_tennis_data() -> pd.DataFrame:
+    """Genera dati tennis simulati per modalità demo"""
+    np.random.seed(42)
+
+    tournaments = ["ATP Masters 1000 Roma", "WTA 1000 Roma", "ATP 250 Firenze", "WTA 250 Palermo"]
+    players = [
+        "Jannik Sinner", "Matteo Berrettini", "Lorenzo Musetti", "Fabio Fognini",
+        "Jasmine Paolini", "Martina Trevisan", "Lucia Bronzetti", "Elisabetta Cocciaretto",
+        "Novak Djokovic", "Carlos Alcaraz", "Rafael Nadal", "Daniil Medvedev",
+        "Iga Swiatek", "Aryna Sabalenka", "Coco Gauff", "Jessica Pegula"
+    ]
+
+    matches_data = []
+    for i in range(15):
+        p1, p2 = np.random.choice(players, 2, replace=False)
+        p1_odds = np.random.uniform(1.5, 4.0)
+        p2_odds = np.random.uniform(1.5, 4.0)
+
+        matches_data.append({
+            'match': f"{p1} vs {p2}",
+            'tournament': np.random.choice(tournaments),
+            'player1': p1,
+            'player2': p2,
+            'player1_odds': round(p1_odds, 2),
+            'player2_odds': round(p2_odds, 2),
+            'player1_prob': round(1/p1_odds, 3),
+            'player2_prob': round(1/p2_odds, 3),
+            'market_id': f"mock_{i}",
+            'start_time': datetime.now().isoformat(),
+            'value_bet': np.random.choice([True, False], p=[0.3, 0.7])
+        })
+
+    return pd.DataFrame(matches_data)
+
+
+def prepare_matches(df_matches: pd.DataFrame) -> pd.DataFrame:
+    """Fair odds, edge e colonne comuni a tutte le pagine"""
+    if df_matches.empty:
+        return df_matches
+
+    # Fair odds basate su probabilità implicite Betfair
+    df_matches["fair_odds_p1"] = (1 / df_matches["player1_prob"]).round(2)
+    df_matches["fair_odds_p2"] = (1 / df_matches["player2_prob"]).round(2)
+
+    df_matches = df_matches.rename(columns={
+        'player1_odds': 'odds_p1',
+        'player2_odds': 'odds_p2',
+        'player1': 'player1_name',
+        'player2': 'player2_name',
+        'tournament': 'tournament_name'
+    })
+
+    # Betfair non fornisce superficie e turno
+    df_matches["surface"] = "Hard"
+    df_matches["round"] = "Unknown"
+    df_matches["match_time"] = pd.to_datetime(df_matches["start_time"]).dt.strftime("%H:%M")
+
+    df_matches["value_p1"] = df_matches["odds_p1"] > df_matches["fair_odds_p1"]
+    df_matches["value_p2"] = df_matches["odds_p2"] > df_matches["fair_odds_p2"]
+
+    # Edge come scostamento percentuale vs fair odds
+    df_matches["edge_p1"] = ((df_matches["odds_p1"] / df_matches["fair_odds_p1"] - 1)).round(3)
+    df_matches["edge_p2"] = ((df_matches["odds_p2"] / df_matches["fair_odds_p2"] - 1)).round(3)
+
+    df_matches["elo_p1"] = 1800
+    df_matches["elo_p2"] = 1800
+    return df_matches
+
+
+def load_matches(client) -> pd.DataFrame:
+    return prepare_matches(get_tennis_data_betfair(client))
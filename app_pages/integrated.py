@@ -0,0 +1,162 @@
+"""
+Pagina Dashboard Integrata: value betting + statistiche e predizioni
+"""
+import streamlit as st
+
+from analytics.advanced_metrics import TennisAdvancedMetrics
+from app_pages.common import init_betfair_client, load_matches
+from models.dashboard_aggregates import DashboardAggregates
+from services.data_fetcher import TennisDataFetcher
+from visualization.stats_charts import TennisStatsVisualizer
+
+
+@st.cache_resource
+def init_components():
+    return {
+        'fetcher': TennisDataFetcher(),
+        'aggregates': DashboardAggregates(),
+        'metrics': TennisAdvancedMetrics(),
+        'visualizer': TennisStatsVisualizer()
+    }
+
+
+def render():
+    components = init_components()
+
+    st.header("⚡ Dashboard Integrata")
+    st.markdown("**Combinazione di Value Betting e Analisi Statistiche Avanzate**")
+
+    # Metriche principali integrate
+    totals = components['aggregates'].totals()
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Value Bets Oggi", "12", "+3")
+    with col2:
+        st.metric("Edge Medio", "8.4%", "+1.2%")
+    with col3:
+        st.metric("Giocatori Analizzati", f"{totals.get('players', 0):,}", f"{totals.get('players_delta', 0):+,}")
+    with col4:
+        st.metric("Accuracy Predizioni", "73.2%", "+2.1%")
+
+    st.divider()
+
+    # Sezione partite con statistiche integrate
+    st.subheader("🎾 Partite con Analisi Completa")
+
+    # Recupera dati Betfair
+    df_matches = load_matches(init_betfair_client())
+
+    if not df_matches.empty:
+        # Per ogni partita, aggiungi analisi statistiche
+        for idx, row in df_matches.head(5).iterrows():  # Limita a 5 per performance
+
+            st.markdown(f"### 🎾 {row['player1_name']} vs {row['player2_name']}")
+
+            # Tabs per diverse analisi
+            tab1, tab2, tab3, tab4 = st.tabs(["💰 Value Betting", "📊 Statistiche", "🔮 Predizione", "📈 Grafici"])
+
+            with tab1:
+                # Analisi value betting
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    st.markdown("**Player 1 Value**")
+                    if row["value_p1"]:
+                        st.success(f"✅ VALUE BET")
+                        st.metric("Edge", f"{row['edge_p1']*100:.1f}%")
+                    else:
+                        st.info("No Value")
+                    st.metric("Odds", f"{row['odds_p1']:.2f}")
+                    st.metric("Fair Odds", f"{row['fair_odds_p1']:.2f}")
+
+                with col2:
+                    st.markdown("**Match Info**")
+                    st.write(f"🏟️ Torneo: {row['tournament_name']}")
+                    st.write(f"🎯 Superficie: Hard")
+                    st.write(f"⏰ Orario: {row.get('match_time', 'TBD')}")
+
+                with col3:
+                    st.markdown("**Player 2 Value**")
+                    if row["value_p2"]:
+                        st.success(f"✅ VALUE BET")
+                        st.metric("Edge", f"{row['edge_p2']*100:.1f}%")
+                    else:
+                        st.info("No Value")
+                    st.metric("Odds", f"{row['odds_p2']:.2f}")
+                    st.metric("Fair Odds", f"{row['fair_odds_p2']:.2f}")
+
+            with tab2:
+                # Statistiche simulate per i giocatori
+                p1_stats = components['fetcher'].fetch_player_stats(row['player1_name'])
+                p2_stats = components['fetcher'].fetch_player_stats(row['player2_name'])
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown(f"**📋 {row['player1_name']}**")
+                    st.write(f"🎾 Aces/Match: {p1_stats['avg_aces_per_match']}")
+                    st.write(f"🎯 Prime Servizio: {p1_stats['avg_first_serve_pct']}%")
+                    st.write(f"🏆 Vincenti/Match: {p1_stats['avg_winners_per_match']}")
+                    st.write(f"💥 Errori NF/Match: {p1_stats['avg_unforced_errors_per_match']}")
+                    st.write(f"📊 Dominance Ratio: {p1_stats['dominance_ratio']}")
+
+                with col2:
+                    st.markdown(f"**📋 {row['player2_name']}**")
+                    st.write(f"🎾 Aces/Match: {p2_stats['avg_aces_per_match']}")
+                    st.write(f"🎯 Prime Servizio: {p2_stats['avg_first_serve_pct']}%")
+                    st.write(f"🏆 Vincenti/Match: {p2_stats['avg_winners_per_match']}")
+                    st.write(f"💥 Errori NF/Match: {p2_stats['avg_unforced_errors_per_match']}")
+                    st.write(f"📊 Dominance Ratio: {p2_stats['dominance_ratio']}")
+
+            with tab3:
+                # Predizione match
+                prediction = components['metrics'].predict_match_outcome(p1_stats, p2_stats, "Hard")
+
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    st.metric(
+                        f"Prob. {row['player1_name']}",
+                        f"{prediction['player1_win_probability']:.1%}",
+                        f"Surface: {prediction['surface_advantage_p1']:+.1%}"
+                    )
+
+                with col2:
+                    st.metric(
+                        "Confidenza Predizione",
+                        f"{prediction['confidence']:.1%}",
+                        f"Elo Diff: {prediction['elo_difference']:+.0f}"
+                    )
+
+                with col3:
+                    st.metric(
+                        f"Prob. {row['player2_name']}",
+                        f"{prediction['player2_win_probability']:.1%}",
+                        f"Surface: {prediction['surface_advantage_p2']:+.1%}"
+                    )
+
+                # Confronto predizione vs quote
+                st.markdown("**🔍 Analisi Predizione vs Quote**")
+
+                pred_p1 = prediction['player1_win_probability']
+                pred_p2 = prediction['player2_win_probability']
+
+                implied_p1 = 1 / row['odds_p1']
+                implied_p2 = 1 / row['odds_p2']
+
+                if pred_p1 > implied_p1:
+                    st.success(f"✅ Modello favorisce {row['player1_name']} (Pred: {pred_p1:.1%} vs Quote: {implied_p1:.1%})")
+                elif pred_p2 > implied_p2:
+                    st.success(f"✅ Modello favorisce {row['player2_name']} (Pred: {pred_p2:.1%} vs Quote: {implied_p2:.1%})")
+                else:
+                    st.info("📊 Predizione allineata con le quote")
+
+            with tab4:
+                # Grafici comparativi
+                radar_fig = components['visualizer'].create_player_comparison_radar(
+                    p1_stats, p2_stats, row['player1_name'], row['player2_name']
+                )
+                st.plotly_chart(radar_fig, use_container_width=True)
+
+            st.divider()
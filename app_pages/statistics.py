@@ -0,0 +1,15 @@
+"""
+Pagina Sistema Statistiche Complete (TennisStatsInterface)
+"""
+import streamlit as st
+
+from ui.stats_interface import TennisStatsInterface
+
+
+@st.cache_resource
+def init_stats_interface() -> TennisStatsInterface:
+    return TennisStatsInterface()
+
+
+def render():
+    init_stats_interface().render_main_interface()
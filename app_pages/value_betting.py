@@ -0,0 +1,230 @@
+"""
+Pagina Value Betting: quote Betfair Italia, fair odds ed edge per partita
+"""
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from app_pages.common import init_betfair_client, is_demo_mode, load_matches
+
+
+def render():
+    st.header("🎯 Tennis Value Betting - Betfair Italia")
+
+    # Fetch dati reali (Sofascore)
+    if st.sidebar.button("Fetch dati reali (Sofascore) 🌍"):
+        try:
+            from etl_today import run_etl_today
+            with st.spinner("Scaricando dati reali da Sofascore..."):
+                summary = run_etl_today(verbose=False)
+            st.success(f"ETL ok: eventi={summary['events']} | aggiornati={summary['updated']} | con quote={summary['with_odds']} | skip={summary['skipped']}")
+        except Exception as e:
+            st.error(f"Errore ETL Sofascore: {e}")
+
+    betfair_client = init_betfair_client()
+
+    # Pulsante refresh dati
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        if st.button("🔄 Aggiorna Dati Betfair"):
+            # Solo i dati: client e sessione (con il suo keep-alive) restano attivi
+            st.cache_data.clear()
+            st.rerun()
+
+    with col2:
+        if is_demo_mode():
+            st.info("🔧 Modalità DEMO")
+        else:
+            st.success("🟢 Dati REALI")
+
+    with st.spinner("Caricamento dati tennis da Betfair Italia..."):
+        df_matches = load_matches(betfair_client)
+
+    if df_matches.empty:
+        st.info("Nessun dato tennis disponibile. Verifica la configurazione Betfair o attiva la modalità DEMO.")
+    else:
+        _render_matches(df_matches)
+
+    st.divider()
+    _render_connection_status(betfair_client)
+    _render_bet_form(betfair_client, df_matches)
+
+
+def _render_matches(df_matches: pd.DataFrame):
+    # ---- Filtri partite (sidebar)
+    st.sidebar.header("Filtri partite")
+
+    tournaments = sorted(df_matches["tournament_name"].dropna().unique().tolist())
+    selected_tournaments = st.sidebar.multiselect("🏟️ Tornei", tournaments, default=tournaments)
+
+    surfaces = sorted(df_matches["surface"].dropna().unique().tolist())
+    selected_surfaces = st.sidebar.multiselect("🟦 Superfici", surfaces, default=surfaces)
+
+    only_value = st.sidebar.checkbox("🔥 Solo Value Bets", value=False)
+    min_edge = st.sidebar.slider("📊 Edge minimo (%)", 0, 50, 5)  # percento
+    min_edge_dec = min_edge / 100.0
+
+    # Applica filtri
+    dfm = df_matches[
+        (df_matches["tournament_name"].isin(selected_tournaments)) &
+        (df_matches["surface"].isin(selected_surfaces))
+    ].copy()
+
+    if only_value:
+        dfm = dfm[(dfm["value_p1"]) | (dfm["value_p2"])]
+
+    # Edge soglia su almeno uno dei due lati
+    dfm = dfm[(dfm["edge_p1"] >= min_edge_dec) | (dfm["edge_p2"] >= min_edge_dec)]
+
+    st.caption(f"Partite dopo filtri: {len(dfm)}")
+
+    # Download CSV value bets
+    vb = dfm[
+        (dfm["edge_p1"] >= min_edge_dec) | (dfm["edge_p2"] >= min_edge_dec)
+    ][[
+        "tournament_name","round","surface",
+        "player1_name","odds_p1","fair_odds_p1","edge_p1",
+        "player2_name","odds_p2","fair_odds_p2","edge_p2",
+        "match_time"
+    ]].copy()
+    if not vb.empty:
+        vb_sorted = vb.sort_values(by=["edge_p1","edge_p2"], ascending=False)
+        csv = vb_sorted.to_csv(index=False).encode("utf-8")
+        st.download_button("⬇️ Scarica Value Bets (CSV)", data=csv, file_name="value_bets.csv", mime="text/csv")
+
+    # Render card + grafico per ciascun match
+    if dfm.empty:
+        st.info("Nessuna partita soddisfa i filtri attuali.")
+    else:
+        for _, row in dfm.iterrows():
+            col1, col2, col3 = st.columns([4, 2, 4])
+
+            with col1:
+                badge_html = '<span class="badge">VALUE</span>' if row["value_p1"] and row["edge_p1"] >= min_edge_dec else ""
+                odds_p1_display = f"{row['odds_p1']:.2f}" if pd.notna(row['odds_p1']) else "N/A"
+                st.markdown(f"""
+                <div class="match-card">
+                    <b>{row['player1_name']}</b> {badge_html}<br>
+                    Elo: {int(row['elo_p1'])}<br>
+                    Odds: <span style="color:{'green' if row['value_p1'] and row['edge_p1'] >= min_edge_dec else 'black'}">{odds_p1_display}</span><br>
+                    Fair: {row['fair_odds_p1']}<br>
+                    Edge: {(row['edge_p1']*100):.1f}%
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col2:
+                when = ""
+                try:
+                    when = pd.to_datetime(row["match_time"]).strftime("%H:%M")
+                except Exception:
+                    when = str(row["match_time"]) if pd.notna(row["match_time"]) else "TBD"
+                st.markdown(f"""
+                <div style="text-align:center; font-size:22px;">
+                    <b>VS</b><br>
+                    <span style="font-size:14px;">{row['tournament_name']} - {row['round']} ({row['surface']})</span><br>
+                    <span style="font-size:12px;">{when}</span>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col3:
+                badge_html2 = '<span class="badge">VALUE</span>' if row["value_p2"] and row["edge_p2"] >= min_edge_dec else ""
+                odds_p2_display = f"{row['odds_p2']:.2f}" if pd.notna(row['odds_p2']) else "N/A"
+                st.markdown(f"""
+                <div class="match-card">
+                    <b>{row['player2_name']}</b> {badge_html2}<br>
+                    Elo: {int(row['elo_p2'])}<br>
+                    Odds: <span style="color:{'green' if row['value_p2'] and row['edge_p2'] >= min_edge_dec else 'black'}">{odds_p2_display}</span><br>
+                    Fair: {row['fair_odds_p2']}<br>
+                    Edge: {(row['edge_p2']*100):.1f}%
+                </div>
+                """, unsafe_allow_html=True)
+
+            # 🔹 Grafico quote vs fair (solo se abbiamo almeno una quota reale)
+            if pd.notna(row['odds_p1']) or pd.notna(row['odds_p2']):
+                o1 = row['odds_p1'] if pd.notna(row['odds_p1']) else 0
+                o2 = row['odds_p2'] if pd.notna(row['odds_p2']) else 0
+                fig_match = px.bar(
+                    x=["Odds P1", "Fair P1", "Odds P2", "Fair P2"],
+                    y=[o1, row['fair_odds_p1'], o2, row['fair_odds_p2']],
+                    color=["Real", "Fair", "Real", "Fair"],
+                    title=f"Confronto Quote - {row['player1_name']} vs {row['player2_name']}",
+                    text=[o1, row['fair_odds_p1'], o2, row['fair_odds_p2']]
+                )
+                fig_match.update_traces(texttemplate='%{text:.2f}', textposition="outside")
+                fig_match.update_layout(yaxis_title="Quota", xaxis_title="", showlegend=False, height=380)
+                st.plotly_chart(fig_match, use_container_width=True)
+
+            st.markdown("---")
+
+
+def _render_connection_status(betfair_client):
+    if betfair_client:
+        if betfair_client.session.is_logged_in():
+            st.success("✅ Connesso a Betfair Italia")
+
+            # Mostra informazioni account se disponibili
+            try:
+                funds = betfair_client.get_account_funds()
+                if funds:
+                    st.info(f"💰 Saldo disponibile: €{funds.get('availableToBetBalance', 'N/A')}")
+            except:
+                pass
+        else:
+            st.warning("⚠️ Non connesso a Betfair Italia")
+    else:
+        st.info("🔧 Modalità DEMO attiva - nessuna connessione reale")
+
+
+def _render_bet_form(betfair_client, df_matches: pd.DataFrame):
+    # Sezione piazzamento scommesse (solo se connesso e non in demo)
+    if betfair_client and betfair_client.session.is_logged_in() and not df_matches.empty:
+        st.divider()
+        st.subheader("🎯 Piazza Scommessa (ATTENZIONE: USA FONDI REALI!)")
+
+        st.warning("⚠️ **ATTENZIONE**: Questa funzione piazza scommesse reali con fondi veri!")
+
+        # Selezione partita
+        match_options = [f"{row['player1_name']} vs {row['player2_name']}" for _, row in df_matches.iterrows()]
+        selected_match_idx = st.selectbox("Seleziona partita", range(len(match_options)), 
+                                         format_func=lambda x: match_options[x])
+
+        if selected_match_idx is not None:
+            selected_match = df_matches.iloc[selected_match_idx]
+
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                bet_side = st.selectbox("Scommetti su", [
+                    f"{selected_match['player1_name']} (€{selected_match['odds_p1']:.2f})",
+                    f"{selected_match['player2_name']} (€{selected_match['odds_p2']:.2f})"
+                ])
+
+            with col2:
+                bet_amount = st.number_input("Importo (€)", min_value=2.0, max_value=1000.0, 
+                                           value=10.0, step=0.5)
+
+            with col3:
+                if st.button("🎯 PIAZZA SCOMMESSA", type="primary"):
+                    try:
+                        # Determina selezione
+                        if selected_match['player1_name'] in bet_side:
+                            selection_id = 0  # Placeholder - dovrebbe essere il vero selection_id
+                            odds = selected_match['odds_p1']
+                        else:
+                            selection_id = 1  # Placeholder
+                            odds = selected_match['odds_p2']
+
+                        # Piazza scommessa (commentato per sicurezza)
+                        st.error("🚫 Funzione scommesse disabilitata per sicurezza. Implementare con cautela!")
+
+                        # result = betfair_client.place_bet(
+                        #     market_id=selected_match['market_id'],
+                        #     selection_id=selection_id,
+                        #     side='B',  # Back bet
+                        #     size=bet_amount,
+                        #     price=odds
+                        # )
+                        # st.success(f"✅ Scommessa piazzata: {result}")
+
+                    except Exception as e:
+                        st.error(f"❌ Errore piazzamento scommessa: {e}")
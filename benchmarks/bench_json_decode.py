@@ -0,0 +1,155 @@
+"""
+Benchmark decodifica JSON (stdlib vs orjson vs msgspec)
+
+Uso:
+    python benchmarks/bench_json_decode.py [--market-book FILE] [--schedule FILE] [--repeat N]
+
+Senza file registrati vengono generati payload sintetici con dimensioni
+realistiche (listMarketBook con ladder complete, palinsesto SofaScore).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import json_codec  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def synthetic_market_book(n_markets: int = 40, depth: int = 60, seed: int = 7) -> bytes:
+    """Risposta listMarketBook sintetica con ladder EX_ALL_OFFERS"""
+    rng = random.Random(seed)
+
+    def ladder(start: float, step: float) -> List[Dict[str, float]]:
+        return [{'price': round(start + i * step, 2), 'size': round(rng.uniform(2, 5000), 2)}
+                for i in range(depth)]
+
+    books = []
+    for m in range(n_markets):
+        runners = []
+        for s in range(2):
+            back = rng.uniform(1.2, 4.0)
+            runners.append({
+                'selectionId': 1000000 + m * 10 + s,
+                'handicap': 0.0,
+                'status': 'ACTIVE',
+                'lastPriceTraded': round(back, 2),
+                'totalMatched': round(rng.uniform(0, 1e5), 2),
+                'ex': {
+                    'availableToBack': ladder(back, -0.01),
+                    'availableToLay': ladder(back + 0.01, 0.01),
+                    'tradedVolume': ladder(back - 0.3, 0.01),
+                }
+            })
+        books.append({
+            'marketId': f'1.{200000000 + m}',
+            'isMarketDataDelayed': False,
+            'status': 'OPEN',
+            'betDelay': 0,
+            'bspReconciled': False,
+            'complete': True,
+            'inplay': rng.random() < 0.3,
+            'numberOfWinners': 1,
+            'numberOfRunners': 2,
+            'numberOfActiveRunners': 2,
+            'totalMatched': round(rng.uniform(0, 2e5), 2),
+            'totalAvailable': round(rng.uniform(0, 2e5), 2),
+            'version': rng.randint(1, 10 ** 9),
+            'runners': runners,
+        })
+    return json.dumps({'jsonrpc': '2.0', 'result': books, 'id': '1'}).encode('utf-8')
+
+
+def synthetic_schedule(n_events: int = 3000, seed: int = 7) -> bytes:
+    """Palinsesto giornaliero SofaScore sintetico"""
+    rng = random.Random(seed)
+    events = []
+    for i in range(n_events):
+        events.append({
+            'id': 10000000 + i,
+            'startTimestamp': 1700000000 + i * 60,
+            'tournament': {'name': f'ATP Tour {i % 50}', 'category': {'name': 'ATP'},
+                           'uniqueTournament': {'id': i % 50, 'groundType': 'Hardcourt outdoor'}},
+            'homeTeam': {'id': 2 * i, 'name': f'Player {2 * i}', 'country': {'alpha2': 'IT'}},
+            'awayTeam': {'id': 2 * i + 1, 'name': f'Player {2 * i + 1}', 'country': {'alpha2': 'ES'}},
+            'status': {'code': 0, 'type': 'notstarted', 'description': 'Not started'},
+            'homeScore': {}, 'awayScore': {},
+            'roundInfo': {'round': rng.randint(1, 7)},
+        })
+    return json.dumps({'events': events}).encode('utf-8')
+
+
+def bench(label: str, fn: Callable[[bytes], Any], data: bytes, repeat: int) -> Dict[str, Any]:
+    """Tempo medio e picco di memoria della decodifica"""
+    fn(data)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(data)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    result = fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {'decoder': label, 'ms': elapsed * 1000, 'mb_s': len(data) / elapsed / 1e6, 'peak_kb': peak / 1024}
+
+
+def run(name: str, data: bytes, repeat: int, typed: bool = False):
+    decoders = [('json (stdlib)', json.loads)]
+    if orjson is not None:
+        decoders.append(('orjson', orjson.loads))
+    if msgspec is not None:
+        decoders.append(('msgspec', msgspec.json.Decoder().decode))
+    if typed:
+        decoders.append(('MarketBook tipizzati', json_codec.decode_market_book_response))
+
+    print(f"\n{name}: {len(data) / 1e6:.2f} MB, {repeat} ripetizioni")
+    print(f"{'decoder':<32}{'ms':>10}{'MB/s':>10}{'picco KB':>12}")
+    for label, fn in decoders:
+        r = bench(label, fn, data, repeat)
+        print(f"{r['decoder']:<32}{r['ms']:>10.2f}{r['mb_s']:>10.1f}{r['peak_kb']:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark decodifica JSON")
+    parser.add_argument('--market-book', help="Risposta listMarketBook registrata (JSON-RPC)")
+    parser.add_argument('--schedule', help="Palinsesto SofaScore registrato")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.market_book:
+        with open(args.market_book, 'rb') as f:
+            market_book = f.read()
+    else:
+        market_book = synthetic_market_book()
+
+    if args.schedule:
+        with open(args.schedule, 'rb') as f:
+            schedule = f.read()
+    else:
+        schedule = synthetic_schedule()
+
+    print(f"Backend attivo: {json_codec.JSON_BACKEND}")
+    run('listMarketBook', market_book, args.repeat, typed=True)
+    run('Palinsesto SofaScore', schedule, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark del job metriche partita (analytics/batch_metrics)
+
+Genera N righe sintetiche di match_detailed_stats in un database
+temporaneo, misura il job in blocco (prima esecuzione e riesecuzione
+incrementale senza righe da elaborare) e confronta un campione con le
+funzioni scalari di TennisAdvancedMetrics.
+
+Uso:
+    python benchmarks/bench_match_metrics.py [--rows 1000000] [--chunk 50000] [--scalar-sample 20000]
+"""
+import argparse
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.advanced_metrics import TennisAdvancedMetrics  # noqa: E402
+from analytics.batch_metrics import (_INPUT_COLUMNS, QUALITY_SCALE, compute_match_metrics,  # noqa: E402
+                                     update_match_metrics)
+from models.stats_models import TennisStatsDatabase  # noqa: E402
+
+
+def synthetic_rows(n: int, seed: int = 7) -> np.ndarray:
+    """Statistiche realistiche, con circa l'1% di valori mancanti"""
+    rng = np.random.default_rng(seed)
+    columns = {
+        'first_serve_pct': (50, 75), 'first_serve_won_pct': (60, 85), 'second_serve_won_pct': (40, 60),
+        'first_return_won_pct': (20, 40), 'second_return_won_pct': (40, 60),
+    }
+    data = {}
+    for p in ('p1', 'p2'):
+        for name, (low, high) in columns.items():
+            data[f'{p}_{name}'] = rng.uniform(low, high, n).round(1)
+        data[f'{p}_total_points_won'] = rng.integers(40, 180, n)
+        data[f'{p}_break_points_opportunities'] = rng.integers(0, 15, n)
+        data[f'{p}_winners'] = rng.integers(5, 60, n)
+        data[f'{p}_unforced_errors'] = rng.integers(5, 60, n)
+    data['match_duration_minutes'] = rng.integers(45, 300, n)
+    values = np.column_stack([data[c] for c in _INPUT_COLUMNS]).astype(np.float64)
+    values[rng.random(values.shape) < 0.01] = np.nan
+    return values
+
+
+def populate(db_path: str, values: np.ndarray):
+    TennisStatsDatabase(db_path)
+    conn = sqlite3.connect(db_path)
+    placeholders = ', '.join('?' * (len(_INPUT_COLUMNS) + 1))
+    sql = f"INSERT INTO match_detailed_stats (match_id, {', '.join(_INPUT_COLUMNS)}) VALUES ({placeholders})"
+    rows = values.astype(object)
+    rows[np.isnan(values)] = None
+    with conn:
+        conn.executemany(sql, ((i + 1, *row) for i, row in enumerate(rows.tolist())))
+    conn.close()
+
+
+def scalar_metrics(row: np.ndarray):
+    """Metriche di una riga con le funzioni scalari (valori mancanti = chiave assente)"""
+    stats = {c: v for c, v in zip(_INPUT_COLUMNS, row.tolist()) if not math.isnan(v)}
+    out = []
+    for p in ('p1', 'p2'):
+        try:
+            serve_won = (stats[f'{p}_first_serve_pct'] * stats[f'{p}_first_serve_won_pct'] +
+                         (100 - stats[f'{p}_first_serve_pct']) * stats[f'{p}_second_serve_won_pct']) / 100
+            return_won = (stats[f'{p}_first_return_won_pct'] + stats[f'{p}_second_return_won_pct']) / 2
+            out.append(round(TennisAdvancedMetrics.calculate_dominance_ratio(return_won, 100 - serve_won), 3))
+        except KeyError:
+            out.append(float('nan'))
+    out.append(round(TennisAdvancedMetrics.calculate_match_quality_score(stats) * QUALITY_SCALE, 1))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job metriche partita")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk', type=int, default=50_000)
+    parser.add_argument('--scalar-sample', type=int, default=20_000)
+    args = parser.parse_args()
+
+    values = synthetic_rows(args.rows)
+
+    sample = values[:args.scalar_sample]
+    start = time.perf_counter()
+    expected = np.array([scalar_metrics(row) for row in sample])
+    scalar_s = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = compute_match_metrics(sample)
+    vector_s = time.perf_counter() - start
+    # Tolleranza di un'unità di arrotondamento (somme in ordine diverso sui casi a metà)
+    tolerance = np.array([1e-3, 1e-3, 0.1]) * 1.001
+    mismatches = int((~np.isclose(actual, expected, rtol=0, atol=tolerance, equal_nan=True)).sum())
+    print(f"Calcolo su {len(sample)} righe: scalare {len(sample) / scalar_s:,.0f} righe/s, "
+          f"NumPy {len(sample) / vector_s:,.0f} righe/s, differenze: {mismatches}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'tennis_stats.db')
+        start = time.perf_counter()
+        populate(db_path, values)
+        print(f"Popolamento {args.rows:,} righe: {time.perf_counter() - start:.1f}s")
+
+        result = update_match_metrics(db_path, chunk_size=args.chunk)
+        print(f"Job completo: {result['rows']:,} righe in {result['seconds']:.2f}s "
+              f"({result['rows'] / max(result['seconds'], 1e-9):,.0f} righe/s)")
+        result = update_match_metrics(db_path, chunk_size=args.chunk)
+        print(f"Riesecuzione incrementale: {result['rows']} righe in {result['seconds']:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
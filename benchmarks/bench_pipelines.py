@@ -0,0 +1,245 @@
+"""
+Benchmark offline delle pipeline ETL SofaScore e client Betfair
+
+Le chiamate HTTP vengono servite da cassette registrate (services/http_replay),
+con latenza ed errori simulati: il benchmark è ripetibile e non richiede rete.
+
+Uso:
+    # registrazione dal vivo (SofaScore; Betfair se BETFAIR_* sono impostate)
+    python benchmarks/bench_pipelines.py record --date 2024-06-01
+
+    # cassette sintetiche per una macchina senza alcuna registrazione
+    python benchmarks/bench_pipelines.py synth --events 300
+
+    # replay
+    python benchmarks/bench_pipelines.py run --latency 0.02 --error-rate 0.05 --repeat 3 [--warm-cache]
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.betfair_it import BETFAIR_IT_ENDPOINTS, TENNIS_CONFIG  # noqa: E402
+from etl_today import SOFA_BASE, run_etl_today  # noqa: E402
+from services.betfair_client import BetfairItalyClient  # noqa: E402
+from services.betfair_session import BetfairItalySession  # noqa: E402
+from services.http_replay import Cassette, request_key, use_cassette  # noqa: E402
+
+DEFAULT_CASSETTE_DIR = 'data/cassettes'
+ETL_CASSETTE = 'sofascore_etl.jsonl.gz'
+BETFAIR_CASSETTE = 'betfair_odds.jsonl.gz'
+META_FILE = 'meta.json'
+
+
+def _paths(cassette_dir: str) -> Tuple[str, str, str]:
+    return (os.path.join(cassette_dir, ETL_CASSETTE),
+            os.path.join(cassette_dir, BETFAIR_CASSETTE),
+            os.path.join(cassette_dir, META_FILE))
+
+
+def _replay_session() -> BetfairItalySession:
+    """Sessione Betfair fittizia per il replay (nessun login reale)"""
+    session = BetfairItalySession(app_key='replay')
+    session.session_token = 'replay'
+    return session
+
+
+# === Registrazione ===
+
+def record(cassette_dir: str, date_str: str):
+    etl_path, betfair_path, meta_path = _paths(cassette_dir)
+    os.makedirs(cassette_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with use_cassette(etl_path, mode='record'):
+            summary = run_etl_today(verbose=False, db_path=os.path.join(tmp, 'tennis.db'), date_str=date_str,
+                                    cache_path=None)
+    print(f"ETL registrato: {summary}")
+
+    app_key = os.getenv('BETFAIR_APP_KEY')
+    if app_key:
+        session = BetfairItalySession(app_key, os.getenv('BETFAIR_USERNAME'), os.getenv('BETFAIR_PASSWORD'))
+        with use_cassette(betfair_path, mode='record'):
+            if session.auto_login(os.getenv('BETFAIR_CERT_PATH'), os.getenv('BETFAIR_KEY_PATH')):
+                odds = BetfairItalyClient(session).get_tennis_odds_realtime()
+                print(f"Betfair registrato: {len(odds)} mercati")
+    else:
+        print("BETFAIR_APP_KEY non impostata: cassetta Betfair non registrata")
+
+    with open(meta_path, 'w') as f:
+        json.dump({'date': date_str, 'source': 'live'}, f)
+
+
+# === Cassette sintetiche ===
+
+def _add(cassette: Cassette, method: str, url: str, payload: Any, body: Optional[Dict[str, Any]] = None,
+         status: int = 200):
+    cassette.add({
+        'key': request_key(method, url, json.dumps(body) if body is not None else None),
+        'status': status,
+        'reason': 'OK' if status == 200 else 'Not Found',
+        'headers': {'Content-Type': 'application/json'},
+        'body': base64.b64encode(json.dumps(payload).encode('utf-8')).decode('ascii'),
+        'elapsed': 0.0,
+    })
+
+
+def _rpc(method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {'jsonrpc': '2.0', 'method': f'SportsAPING/v1.0/{method}', 'params': params}
+
+
+def synthesize(cassette_dir: str, n_events: int, n_markets: int, seed: int = 7):
+    """Genera cassette sintetiche con gli stessi URL e payload delle API reali"""
+    rng = random.Random(seed)
+    etl_path, betfair_path, meta_path = _paths(cassette_dir)
+    date_str = '2024-06-01'
+
+    etl = Cassette(etl_path)
+    events = []
+    for i in range(n_events):
+        event_id = 11000000 + i
+        women = i % 3 == 0
+        events.append({
+            'id': event_id,
+            'startTimestamp': 1717200000 + i * 300,
+            'tournament': {'name': f"{'WTA' if women else 'ATP'} Synthetic {i % 20}",
+                           'category': {'name': 'WTA' if women else 'ATP'}},
+            'homeTeam': {'name': f'Player {2 * i}', 'country': {'alpha2': 'IT'}},
+            'awayTeam': {'name': f'Player {2 * i + 1}', 'country': {'alpha2': 'ES'}},
+            'status': {'type': 'notstarted'},
+            'roundInfo': {'name': 'R32'},
+        })
+        # Come nei payload reali: marketId = tipo di mercato, id = istanza
+        market_instance = 260000000 + i
+        if i % 25 == 24:
+            # Nessuna quota featured: l'ETL ripiega sugli endpoint successivi
+            _add(etl, 'GET', f'{SOFA_BASE}/event/{event_id}/odds/1/featured', {'error': 'not found'}, status=404)
+            bookmakers = [
+                {'bookmaker': {'name': f'book{b}'},
+                 'choices': [{'name': '1', 'value': round(rng.uniform(1.2, 3.5), 2)},
+                             {'name': '2', 'value': round(rng.uniform(1.2, 3.5), 2)}]}
+                for b in range(4)
+            ]
+            _add(etl, 'GET', f'{SOFA_BASE}/event/{event_id}/odds/markets',
+                 {'markets': [{'marketId': 1, 'id': market_instance, 'bookmakers': bookmakers}]})
+        else:
+            choices = [{'name': '1', 'fractionalValue': f'{rng.randint(1, 20)}/{rng.randint(2, 12)}'},
+                       {'name': '2', 'fractionalValue': f'{rng.randint(1, 20)}/{rng.randint(2, 12)}'}]
+            _add(etl, 'GET', f'{SOFA_BASE}/event/{event_id}/odds/1/featured',
+                 {'featured': {'default': {'marketId': 1, 'id': market_instance, 'choices': choices}}})
+    _add(etl, 'GET', f'{SOFA_BASE}/sport/tennis/scheduled-events/{date_str}', {'events': events})
+    etl.save()
+
+    betfair = Cassette(betfair_path)
+    url = BETFAIR_IT_ENDPOINTS['betting_json_rpc']
+    bf_events = [{'event': {'id': str(30000000 + m), 'name': f'Player {2 * m} v Player {2 * m + 1}'},
+                  'marketCount': 1} for m in range(n_markets)]
+    event_ids = [e['event']['id'] for e in bf_events]
+    catalogue = [{
+        'marketId': f'1.{220000000 + m}',
+        'event': {'id': event_ids[m], 'name': bf_events[m]['event']['name']},
+        'competition': {'name': 'ATP Synthetic'},
+        'marketStartTime': '2024-06-01T10:00:00.000Z',
+        'runners': [{'selectionId': 5000000 + 2 * m, 'runnerName': f'Player {2 * m}'},
+                    {'selectionId': 5000000 + 2 * m + 1, 'runnerName': f'Player {2 * m + 1}'}],
+    } for m in range(n_markets)]
+    market_ids = [c['marketId'] for c in catalogue]
+
+    def ladder(start: float, step: float) -> List[Dict[str, float]]:
+        return [{'price': round(start + i * step, 2), 'size': round(rng.uniform(2, 2000), 2)} for i in range(3)]
+
+    books = [{
+        'marketId': c['marketId'], 'status': 'OPEN', 'inplay': False, 'totalMatched': 1000.0,
+        'runners': [{'selectionId': r['selectionId'], 'status': 'ACTIVE', 'lastPriceTraded': 2.0,
+                     'ex': {'availableToBack': ladder(2.0, -0.02), 'availableToLay': ladder(2.02, 0.02)}}
+                    for r in c['runners']],
+    } for c in catalogue]
+
+    client = BetfairItalyClient(_replay_session())
+    _add(betfair, 'POST', url, {'jsonrpc': '2.0', 'result': bf_events, 'id': '1'},
+         _rpc('listEvents', {'filter': {'eventTypeIds': [TENNIS_CONFIG['event_type_id']]}}))
+    _add(betfair, 'POST', url, {'jsonrpc': '2.0', 'result': catalogue, 'id': '1'},
+         _rpc('listMarketCatalogue', {
+             'filter': {'eventTypeIds': [TENNIS_CONFIG['event_type_id']], 'marketTypeCodes': ['MATCH_ODDS'], 'eventIds': event_ids},
+             'maxResults': 1000,
+             'marketProjection': ['COMPETITION', 'EVENT', 'EVENT_TYPE', 'MARKET_START_TIME', 'RUNNER_DESCRIPTION']}))
+    _add(betfair, 'POST', url, {'jsonrpc': '2.0', 'result': books, 'id': '1'},
+         _rpc('listMarketBook', client._market_book_params(market_ids)))
+    betfair.save()
+
+    with open(meta_path, 'w') as f:
+        json.dump({'date': date_str, 'source': 'synthetic'}, f)
+    print(f"Cassette sintetiche: {n_events} eventi SofaScore, {n_markets} mercati Betfair in {cassette_dir}")
+
+
+# === Replay ===
+
+def _timed(fn) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(cassette_dir: str, latency: float, error_rate: float, repeat: int, seed: int, warm_cache: bool = False):
+    etl_path, betfair_path, meta_path = _paths(cassette_dir)
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    if os.path.exists(etl_path):
+        timings = []
+        with tempfile.TemporaryDirectory() as shared:
+            for i in range(repeat):
+                with tempfile.TemporaryDirectory() as tmp:
+                    # Cache HTTP fredda a ogni run, o condivisa tra i run con --warm-cache
+                    cache_path = os.path.join(shared if warm_cache else tmp, 'http_cache.db')
+                    with use_cassette(etl_path, mode='replay', latency=latency, error_rate=error_rate, seed=seed + i):
+                        elapsed, summary = _timed(lambda: run_etl_today(
+                            verbose=False, db_path=os.path.join(tmp, 'tennis.db'), date_str=meta['date'],
+                            cache_path=cache_path))
+                timings.append(elapsed)
+                print(f"ETL run {i + 1}: {elapsed:.2f}s {summary}")
+        print(f"ETL mediana: {statistics.median(timings):.2f}s")
+
+    if os.path.exists(betfair_path):
+        timings = []
+        for i in range(repeat):
+            with use_cassette(betfair_path, mode='replay', latency=latency, error_rate=error_rate, seed=seed + i):
+                client = BetfairItalyClient(_replay_session())
+                elapsed, odds = _timed(client.get_tennis_odds_realtime)
+            timings.append(elapsed)
+            print(f"Betfair run {i + 1}: {elapsed:.2f}s, {len(odds)} mercati")
+        print(f"Betfair mediana: {statistics.median(timings):.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline pipeline ETL e Betfair")
+    parser.add_argument('command', choices=['record', 'synth', 'run'])
+    parser.add_argument('--cassette-dir', default=DEFAULT_CASSETTE_DIR)
+    parser.add_argument('--date', default=None, help="Data SofaScore da registrare (YYYY-MM-DD)")
+    parser.add_argument('--events', type=int, default=300)
+    parser.add_argument('--markets', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.0, help="Latenza simulata per richiesta (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Probabilità di errore per richiesta")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--warm-cache', action='store_true', help="Cache HTTP condivisa tra i run ETL")
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.cassette_dir, args.date or time.strftime('%Y-%m-%d', time.gmtime()))
+    elif args.command == 'synth':
+        synthesize(args.cassette_dir, args.events, args.markets, args.seed)
+    else:
+        run(args.cassette_dir, args.latency, args.error_rate, args.repeat, args.seed, args.warm_cache)
+
+
+if __name__ == '__main__':
+    main()
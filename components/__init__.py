@@ -2,6 +2,6 @@
 Componenti UI per l'applicazione Tennis Value Bets
 """
 
-from .auto_refresh import auto_refresh_component, show_refresh_status, update_timestamp
+from .auto_refresh import auto_refresh_component, live_fragment, show_refresh_status, update_timestamp
 
-__all__ = ['auto_refresh_component', 'show_refresh_status', 'update_timestamp']
+__all__ = ['auto_refresh_component', 'live_fragment', 'show_refresh_status', 'update_timestamp']
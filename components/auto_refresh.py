@@ -2,64 +2,48 @@
 Componente per auto-refresh dell'applicazione
 """
 import streamlit as st
-import time
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Callable, Optional
 
-def auto_refresh_component(refresh_interval_minutes=5):
+def live_fragment(render: Callable[[], None], refresh_interval_seconds: Optional[float] = None) -> Callable[[], None]:
     """
-    Componente per auto-refresh automatico della pagina
+    Avvolge render in un fragment Streamlit rieseguito ogni refresh_interval_seconds
+
+    Solo il fragment viene rieseguito (non l'intero script e senza ricaricare
+    la pagina); con intervallo None si aggiorna solo su interazione.
+    """
+    return st.fragment(render, run_every=refresh_interval_seconds)
+
+
+def auto_refresh_component(render: Optional[Callable[[], None]] = None, refresh_interval_minutes=5):
+    """
+    Componente per auto-refresh di una sezione della pagina
     
     Args:
+        render: funzione che disegna la sezione da aggiornare; senza render
+            (chiamata storica auto_refresh_component(minuti)) viene
+            rieseguita l'intera app a ogni intervallo
         refresh_interval_minutes: Intervallo di refresh in minuti
     """
+    if isinstance(render, (int, float)):
+        refresh_interval_minutes, render = render, None
+    interval = refresh_interval_minutes * 60
     
-    # JavaScript per auto-refresh
-    refresh_js = f"""
-    <script>
-        // Auto-refresh ogni {refresh_interval_minutes} minuti
-        setTimeout(function() {{
-            window.location.reload();
-        }}, {refresh_interval_minutes * 60 * 1000});
-        
-        // Mostra countdown
-        let timeLeft = {refresh_interval_minutes * 60};
-        const countdownElement = document.getElementById('refresh-countdown');
-        
-        const countdown = setInterval(function() {{
-            const minutes = Math.floor(timeLeft / 60);
-            const seconds = timeLeft % 60;
-            
-            if (countdownElement) {{
-                countdownElement.innerHTML = `Prossimo aggiornamento: ${{minutes}}:${{seconds.toString().padStart(2, '0')}}`;
-            }}
-            
-            timeLeft--;
-            
-            if (timeLeft < 0) {{
-                clearInterval(countdown);
-            }}
-        }}, 1000);
-    </script>
-    
-    <div id="refresh-countdown" style="
-        position: fixed;
-        top: 20px;
-        right: 20px;
-        background: linear-gradient(45deg, #2d5aa0, #1f4e79);
-        color: white;
-        padding: 0.8rem 1.2rem;
-        border-radius: 25px;
-        font-size: 0.9rem;
-        font-weight: 500;
-        z-index: 1000;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.2);
-        border: 2px solid rgba(255,255,255,0.2);
-    ">
-        🔄 Caricamento automatico attivo
-    </div>
-    """
+    def _render_with_timestamp():
+        if render is None:
+            # Il fragment gira a ogni intervallo: alla prima esecuzione
+            # successiva al render completo rilancia tutta l'app
+            last = st.session_state.get('auto_refresh_at')
+            if last is not None and (datetime.now() - last).total_seconds() >= interval * 0.9:
+                st.rerun()
+            st.session_state.auto_refresh_at = datetime.now()
+        else:
+            render()
+        update_timestamp()
+        st.caption(f"🔄 Aggiornamento automatico ogni {refresh_interval_minutes} min "
+                   f"(ultimo: {datetime.now().strftime('%H:%M:%S')})")
     
-    st.markdown(refresh_js, unsafe_allow_html=True)
+    live_fragment(_render_with_timestamp, interval)()
 
 def get_last_update_info():
     """Restituisce informazioni sull'ultimo aggiornamento"""
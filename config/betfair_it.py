@@ -75,7 +75,21 @@ NETWORK_CONFIG = {
     'read_timeout': 30,
     'max_retries': 3,
     'backoff_factor': 0.5,
-    'retry_status_codes': [429, 500, 502, 503, 504]
+    'retry_status_codes': [429, 500, 502, 503, 504],
+    'pool_connections': 4,  # Pool di connessioni per host
+    'pool_maxsize': 16,  # Connessioni keep-alive per pool (thread concorrenti)
+    'latency_window': 500  # Campioni di latenza conservati per host
+}
+
+# Gestione automatica della sessione (keep-alive e re-login in background)
+SESSION_CONFIG = {
+    'check_interval': 15,  # Secondi tra i controlli del thread di keep-alive
+    'keep_alive_interval': 144,  # Keep-alive prima dell'idle timeout (80% di 180s)
+    'expiry_margin': 600,  # Rinnovo anticipato 10 minuti prima della scadenza
+    'session_hours': 8,  # Durata sessione dopo login/keep-alive
+    'login_backoff': [5, 30, 120, 300],  # Attese tra tentativi di login falliti
+    'keep_alive_backoff': [5, 15, 30, 60],  # Attese tra keep-alive falliti per errori temporanei
+    'token_cache_path': 'data/.betfair_session.json'  # Token condiviso tra processi
 }
 
 # Messaggi di errore comuni
@@ -1,7 +1,7 @@
 import os
 import sqlite3
 import random
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, date
 
 class DatabaseManager:
@@ -158,6 +158,83 @@ class DatabaseManager:
         conn.commit()
         conn.close()
 
+    # === BULK UPSERT (ETL multi-giorno / backfill) ===
+
+    def _bulk_conn(self):
+        conn = self._conn()
+        # Scritture in blocco: un fsync per transazione invece che per riga
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def bulk_upsert_players(self, players: List[Tuple[str, str, Optional[str]]]) -> Dict[str, int]:
+        """
+        Upsert di (name, country, gender) in una sola transazione, con la
+        stessa semantica di upsert_player_by_name applicata in ordine.
+        Ritorna {name: player_id}.
+        """
+        if not players:
+            return {}
+        conn = self._bulk_conn()
+        cur = conn.cursor()
+        cur.executemany("""
+            INSERT INTO players (name, country, gender) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                country = COALESCE(NULLIF(excluded.country, ''), players.country),
+                gender = COALESCE(excluded.gender, players.gender)
+        """, [(name, country or "", gender) for name, country, gender in players])
+
+        names = list(dict.fromkeys(name for name, _, _ in players))
+        ids: Dict[str, int] = {}
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            cur.execute(f"SELECT name, id FROM players WHERE name IN ({','.join('?' * len(chunk))})", chunk)
+            ids.update(cur.fetchall())
+
+        cur.executemany("INSERT OR IGNORE INTO player_stats (player_id) VALUES (?)", [(pid,) for pid in ids.values()])
+        conn.commit()
+        conn.close()
+        return ids
+
+    def bulk_upsert_matches(self, matches: List[Tuple[int, int, str, str, str, Optional[str], Optional[str]]]) -> List[int]:
+        """
+        Upsert di (player1_id, player2_id, tournament_name, round, surface,
+        match_time, status) in una sola transazione. Ritorna gli id delle
+        partite allineati all'input.
+        """
+        if not matches:
+            return []
+        conn = self._bulk_conn()
+        cur = conn.cursor()
+        ids: List[int] = []
+        for row in matches:
+            cur.execute("""
+                INSERT INTO matches (player1_id, player2_id, tournament_name, round, surface, match_time, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(player1_id, player2_id, tournament_name, round, match_time) DO UPDATE SET
+                    surface = COALESCE(excluded.surface, matches.surface),
+                    status = COALESCE(excluded.status, matches.status)
+                RETURNING id
+            """, row)
+            ids.append(cur.fetchone()[0])
+        conn.commit()
+        conn.close()
+        return ids
+
+    def bulk_upsert_match_odds(self, odds: List[Tuple[int, Optional[float], Optional[float], Optional[str]]]):
+        """Aggiorna (match_id, odds_p1, odds_p2, source_book) mantenendo le quote esistenti se None"""
+        if not odds:
+            return
+        conn = self._bulk_conn()
+        conn.executemany("""
+            UPDATE matches
+            SET odds_p1 = COALESCE(?, odds_p1),
+                odds_p2 = COALESCE(?, odds_p2),
+                source_book = COALESCE(?, source_book)
+            WHERE id = ?
+        """, [(o1, o2, book, match_id) for match_id, o1, o2, book in odds])
+        conn.commit()
+        conn.close()
+
     # === PUBLIC METHODS (usati da app.py) ===
 
     def get_all_players_with_stats(self) -> List[Dict[str, Any]]:
@@ -0,0 +1,178 @@
+"""
+Backfill SofaScore su un intervallo di date
+
+Ogni giorno è uno shard indipendente: i worker scaricano le giornate in
+parallelo (solo rete + cache HTTP), il thread principale le scrive una alla
+volta tramite gli upsert in blocco di DatabaseManager. L'avanzamento è
+registrato per giorno nella tabella etl_checkpoints, quindi un backfill
+interrotto riprende dai giorni mancanti o falliti.
+
+Uso:
+    python etl_backfill.py --start 2024-01-01 --end 2024-12-31 --workers 8
+"""
+import argparse
+import datetime as dt
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+from db import DatabaseManager
+from etl_today import fetch_day, load_day
+from models.dashboard_aggregates import refresh_after_etl
+from services.http_cache import HttpCache
+
+DONE = "done"
+FAILED = "failed"
+
+# Giorni scaricati o in attesa di scrittura per worker
+MAX_IN_FLIGHT_PER_WORKER = 2
+
+
+class CheckpointStore:
+    """Stato del backfill per giorno (stesso database delle partite)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.init_database()
+
+    def _conn(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        conn = self._conn()
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS etl_checkpoints (
+            day TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            events INTEGER,
+            matches INTEGER,
+            with_odds INTEGER,
+            finished_at TEXT,
+            error TEXT
+        )
+        """)
+        conn.commit()
+        conn.close()
+
+    def done_days(self) -> set:
+        conn = self._conn()
+        rows = conn.execute("SELECT day FROM etl_checkpoints WHERE status = ?", (DONE,)).fetchall()
+        conn.close()
+        return {r[0] for r in rows}
+
+    def mark(self, day: str, status: str, events: int = 0, matches: int = 0, with_odds: int = 0,
+             error: Optional[str] = None):
+        conn = self._conn()
+        conn.execute("""
+        INSERT INTO etl_checkpoints (day, status, events, matches, with_odds, finished_at, error)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(day) DO UPDATE SET
+            status = excluded.status, events = excluded.events, matches = excluded.matches,
+            with_odds = excluded.with_odds, finished_at = excluded.finished_at, error = excluded.error
+        """, (day, status, events, matches, with_odds, dt.datetime.utcnow().isoformat(), error))
+        conn.commit()
+        conn.close()
+
+
+def date_range(start: str, end: str) -> List[str]:
+    """Giorni YYYY-MM-DD da start a end inclusi"""
+    first = dt.date.fromisoformat(start)
+    last = dt.date.fromisoformat(end)
+    if last < first:
+        raise ValueError(f"Intervallo non valido: {start} > {end}")
+    return [(first + dt.timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+
+def run_backfill(start: str, end: str, workers: int = 4, db_path: str = "data/tennis.db",
+                 cache_path: Optional[str] = "data/http_cache.db", with_odds: bool = True,
+                 force: bool = False, verbose: bool = True) -> Dict[str, Any]:
+    """
+    Esegue il backfill dei giorni [start, end]
+
+    Args:
+        workers: giorni scaricati in parallelo
+        with_odds: scarica anche le quote di ogni evento (una o più richieste per evento)
+        force: rielabora anche i giorni già completati
+
+    Returns:
+        dict con days, skipped_days, failed_days, events, matches, with_odds, dashboard, elapsed_s
+    """
+    db = DatabaseManager(db_path)
+    checkpoints = CheckpointStore(db_path)
+    cache = HttpCache(cache_path) if cache_path else None
+
+    days = date_range(start, end)
+    done = set() if force else checkpoints.done_days()
+    pending = [d for d in days if d not in done]
+
+    summary = {'days': len(days), 'skipped_days': len(days) - len(pending), 'failed_days': [],
+               'events': 0, 'matches': 0, 'with_odds': 0}
+    t0 = time.perf_counter()
+
+    workers = max(1, workers)
+    # Giorni in volo limitati: i fetch non superano di troppo l'unico writer
+    # SQLite e in memoria restano al più MAX_IN_FLIGHT_PER_WORKER * workers shard
+    max_in_flight = MAX_IN_FLIGHT_PER_WORKER * workers
+    remaining = iter(pending)
+    futures: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='etl-day') as pool:
+        while True:
+            for day in islice(remaining, max_in_flight - len(futures)):
+                futures[pool.submit(fetch_day, day, cache, with_odds)] = day
+            if not futures:
+                break
+
+            completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in completed:
+                # pop: il future completato (e il suo shard) non resta referenziato
+                day = futures.pop(future)
+                try:
+                    shard = future.result()
+                    # Scritture serializzate nel thread principale: SQLite ha un solo writer
+                    loaded = load_day(db, shard['rows'], shard['odds'])
+                except Exception as e:
+                    checkpoints.mark(day, FAILED, error=str(e)[:500])
+                    summary['failed_days'].append(day)
+                    if verbose:
+                        print(f"{day}: errore {str(e)[:160]}")
+                    continue
+
+                events = shard['events']
+                del shard
+                checkpoints.mark(day, DONE, events, loaded['matches'], loaded['with_odds'])
+                summary['events'] += events
+                summary['matches'] += loaded['matches']
+                summary['with_odds'] += loaded['with_odds']
+                if verbose:
+                    print(f"{day}: {events} eventi, {loaded['matches']} partite, {loaded['with_odds']} con quote")
+
+    summary['failed_days'].sort()
+    # Un solo refresh incrementale degli aggregati per tutto l'intervallo
+    summary['dashboard'] = refresh_after_etl(db_path, verbose=verbose)
+    summary['elapsed_s'] = round(time.perf_counter() - t0, 2)
+    if cache is not None:
+        summary['http_cache'] = dict(cache.stats)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill SofaScore per intervallo di date")
+    parser.add_argument('--start', required=True, help='primo giorno (YYYY-MM-DD)')
+    parser.add_argument('--end', help='ultimo giorno incluso (default: start)')
+    parser.add_argument('--workers', type=int, default=4, help='giorni scaricati in parallelo')
+    parser.add_argument('--db', default='data/tennis.db')
+    parser.add_argument('--cache', default='data/http_cache.db', help="cache HTTP ('' per disattivarla)")
+    parser.add_argument('--no-odds', action='store_true', help='non scaricare le quote degli eventi')
+    parser.add_argument('--force', action='store_true', help='rielabora anche i giorni già completati')
+    args = parser.parse_args()
+
+    summary = run_backfill(args.start, args.end or args.start, workers=args.workers, db_path=args.db,
+                           cache_path=args.cache or None, with_odds=not args.no_odds, force=args.force)
+    print("Backfill summary:", summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ from typing import Dict, Any, Optional, Tuple, List
 import requests
 
 from db import DatabaseManager
+from models.dashboard_aggregates import refresh_after_etl
+from services import http_transport, json_codec, sofascore_odds
+from services.http_cache import HttpCache
 
 SOFA_BASE = "https://api.sofascore.com/api/v1"
 
@@ -14,32 +17,36 @@ def _headers():
     ua = os.environ.get("SOFA_UA", "Mozilla/5.0 (compatible; TennisValueBets/1.0)")
     return {"User-Agent": ua, "Accept": "application/json"}
 
-def _get(url: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3, backoff: float = 0.7):
-    last_err = None
+def _fetch(url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+           max_retries: int = 3, backoff: float = 0.7) -> requests.Response:
+    # Errori di connessione e status 429/5xx sono già ritentati dal trasporto
+    # condiviso; qui resta solo il 403 intermittente dell'anti-bot SofaScore
     for i in range(max_retries):
-        try:
-            r = requests.get(url, params=params, headers=_headers(), timeout=15)
-            if r.status_code == 200:
-                return r.json()
-            elif r.status_code in (403, 429, 500, 502, 503):
-                last_err = Exception(f"HTTP {r.status_code}: {r.text[:160]}")
-                time.sleep(backoff * (i + 1) + random.random())
-            else:
-                r.raise_for_status()
-        except Exception as e:
-            last_err = e
+        r = http_transport.get(url, params=params, headers={**_headers(), **(headers or {})}, timeout=15)
+        if r.status_code == 403 and i < max_retries - 1:
             time.sleep(backoff * (i + 1) + random.random())
-    if last_err:
-        raise last_err
+            continue
+        return r
+
+def _get(url: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3, backoff: float = 0.7,
+         cache: Optional[HttpCache] = None):
+    if cache is not None:
+        key = requests.Request("GET", url, params=params).prepare().url
+        return cache.get_json(key, lambda conditional: _fetch(url, params, conditional, max_retries, backoff))
+
+    r = _fetch(url, params, max_retries=max_retries, backoff=backoff)
+    if r.status_code == 200:
+        return json_codec.loads(r.content)
+    raise requests.HTTPError(f"HTTP {r.status_code}: {r.text[:160]}", response=r)
 
 def iso_date_utc_today() -> str:
     return dt.datetime.utcnow().strftime("%Y-%m-%d")
 
-def fetch_scheduled_events(date_str: Optional[str] = None) -> List[Dict[str, Any]]:
+def fetch_scheduled_events(date_str: Optional[str] = None, cache: Optional[HttpCache] = None) -> List[Dict[str, Any]]:
     if not date_str:
         date_str = iso_date_utc_today()
     url = f"{SOFA_BASE}/sport/tennis/scheduled-events/{date_str}"
-    data = _get(url)
+    data = _get(url, cache=cache)
     return data.get("events", [])
 
 def extract_players(ev: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
@@ -91,141 +98,152 @@ def gender_from_tournament(cat: Dict[str, Any], tournament_name: str) -> Optiona
         return "M"
     return None
 
-def fetch_event_odds_featured(event_id: int) -> Dict[str, Any]:
-    # Proviamo featured, poi markets, poi all
+def fetch_event_odds_featured(event_id: int, cache: Optional[HttpCache] = None) -> Dict[str, Any]:
+    # Proviamo featured, poi markets, poi all (i 404 restano in cache negativa)
     for path in [f"/event/{event_id}/odds/1/featured",
                  f"/event/{event_id}/odds/markets",
                  f"/event/{event_id}/odds/1/all"]:
         url = f"{SOFA_BASE}{path}"
         try:
-            return _get(url)
+            return _get(url, cache=cache)
         except Exception:
             continue
     return {}
 
 def best_winner_odds(odds_payload: Dict[str, Any]) -> Tuple[Optional[float], Optional[float], Optional[str]]:
-    best_p1 = None
-    best_p2 = None
-    best_bk = None
-
-    def consider(odds_list: List[Dict[str, Any]], bk_name: str):
-        nonlocal best_p1, best_p2, best_bk
-        o1, o2 = None, None
-        for o in odds_list or []:
-            label = str(o.get("name") or o.get("choice") or o.get("outcome") or o.get("handicap") or "").lower()
-            price = o.get("value") or o.get("decimalOdds") or o.get("odd") or o.get("price")
-            if price is None:
-                continue
-            try:
-                price = float(price)
-            except:
-                continue
-            if label in ("1", "home", "player1", "p1"):
-                o1 = price
-            elif label in ("2", "away", "player2", "p2"):
-                o2 = price
-        if o1 is not None and (best_p1 is None or o1 > best_p1):
-            best_p1 = o1
-            best_bk = bk_name
-        if o2 is not None and (best_p2 is None or o2 > best_p2):
-            best_p2 = o2
-            best_bk = bk_name
-
-    # featuredOdds
-    fo = odds_payload.get("featuredOdds")
-    if isinstance(fo, list):
-        for bk in fo:
-            bk_name = bk.get("bookmaker", {}).get("name") or bk.get("bookmakerName") or "book"
-            markets = bk.get("markets") or bk.get("odds") or []
-            for m in markets or []:
-                choices = m.get("choices") or m.get("outcomes") or []
-                consider(choices, bk_name)
-
-    # markets (id=1 winner)
-    for m in odds_payload.get("markets", []) or []:
-        mid = str(m.get("id") or m.get("key"))
-        if mid != "1":
-            continue
-        for bk in m.get("bookmakers") or []:
-            bk_name = bk.get("bookmaker", {}).get("name") or bk.get("name") or "book"
-            choices = bk.get("choices") or bk.get("outcomes") or []
-            consider(choices, bk_name)
+    return sofascore_odds.best_winner_odds(odds_payload)
 
-    return best_p1, best_p2, best_bk
+def store_best_odds(db: DatabaseManager, odds_payloads: Dict[Any, Dict[str, Any]], match_ids: Dict[Any, int]) -> int:
+    """
+    Calcola la miglior quota di tutti gli eventi della giornata in un solo
+    passaggio vettorizzato e la salva sulle partite. Ritorna il numero di
+    partite con almeno una quota.
+    """
+    best = sofascore_odds.best_winner_odds_by_event(odds_payloads)
+    with_odds = 0
+    rows = []
+    for event_id, match_id in match_ids.items():
+        o1, o2, bk = best.get(event_id, (None, None, None))
+        if o1 is not None or o2 is not None:
+            with_odds += 1
+        rows.append((match_id, o1, o2, bk or "sofa"))
+    db.bulk_upsert_match_odds(rows)
+    return with_odds
+
+def parse_event(ev: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Normalizza un evento SofaScore nei campi della tabella matches (None se mancano i giocatori)"""
+    tournament = ev.get("tournament", {}) or {}
+    category = tournament.get("category", {}) or {}
+    tournament_name = tournament.get("name") or "Tournament"
+
+    p1_name, p2_name, p1_cty, p2_cty = extract_players(ev)
+    if not p1_name or not p2_name:
+        return None
+
+    start_ts = ev.get("startTimestamp")
+    match_time = None
+    if start_ts:
+        match_time = dt.datetime.utcfromtimestamp(int(start_ts)).isoformat()
+
+    return {
+        "event_id": ev.get("id"),
+        "p1_name": p1_name,
+        "p2_name": p2_name,
+        "p1_country": p1_cty or "",
+        "p2_country": p2_cty or "",
+        "gender": gender_from_tournament(category, tournament_name) or "M",
+        "tournament_name": tournament_name,
+        "surface": (ev.get("season", {}) or {}).get("surface") or ev.get("surface") or "Hard",
+        "match_time": match_time,
+        "round": (ev.get("roundInfo", {}) or {}).get("name") or ev.get("round") or "R32",
+        "status": (ev.get("status") or {}).get("type") or "not_started",
+    }
 
-def run_etl_today(verbose: bool = True) -> Dict[str, Any]:
-    db = DatabaseManager()
-    date_str = iso_date_utc_today()
-    events = fetch_scheduled_events(date_str)
+def fetch_day(date_str: str, cache: Optional[HttpCache] = None, with_odds: bool = True,
+              verbose: bool = False) -> Dict[str, Any]:
+    """
+    Scarica e normalizza una giornata (solo rete, nessuna scrittura su DB):
+    eseguibile in parallelo su più giorni.
 
-    inserted = updated = skipped = 0
-    matches_with_odds = 0
+    Returns:
+        dict con events (totale), rows (eventi validi), skipped e odds {event_id: payload}
+    """
+    events = fetch_scheduled_events(date_str, cache=cache)
+    rows: List[Dict[str, Any]] = []
+    odds_payloads: Dict[Any, Dict[str, Any]] = {}
+    skipped = 0
 
     for idx, ev in enumerate(events):
         try:
-            tournament = ev.get("tournament", {}) or {}
-            category = tournament.get("category", {}) or {}
-            tournament_name = tournament.get("name") or "Tournament"
-
-            surface = (ev.get("season", {}) or {}).get("surface") or ev.get("surface") or "Hard"
-
-            p1_name, p2_name, p1_cty, p2_cty = extract_players(ev)
-            if not p1_name or not p2_name:
-                skipped += 1
-                if verbose and idx < 3:
-                    print("Skip missing players:", {"id": ev.get("id"), "keys": list(ev.keys())[:12]})
-                continue
-
-            gender = gender_from_tournament(category, tournament_name) or "M"
-
-            start_ts = ev.get("startTimestamp")
-            match_time = None
-            if start_ts:
-                match_time = dt.datetime.utcfromtimestamp(int(start_ts)).isoformat()
-
-            round_name = (ev.get("roundInfo", {}) or {}).get("name") or ev.get("round") or "R32"
-
-            # Upsert players
-            p1_id = db.upsert_player_by_name(name=p1_name, country=p1_cty or "", gender=gender)
-            p2_id = db.upsert_player_by_name(name=p2_name, country=p2_cty or "", gender=gender)
-
-            # Upsert match base
-            mid_before = None
-            match_id = db.upsert_match(
-                player1_id=p1_id,
-                player2_id=p2_id,
-                tournament_name=tournament_name,
-                round=round_name,
-                surface=surface,
-                match_time=match_time,
-                status=(ev.get("status") or {}).get("type") or "not_started",
-            )
-
-            # Odds (non blocca ETL se fallisce)
-            try:
-                odds_json = fetch_event_odds_featured(ev.get("id"))
-                o1, o2, bk = best_winner_odds(odds_json)
-                if o1 is not None or o2 is not None:
-                    matches_with_odds += 1
-                db.upsert_match_odds(match_id=match_id, odds_p1=o1, odds_p2=o2, source_book=bk or "sofa")
-            except Exception:
-                pass
-
-            updated += 1
-            if verbose and (updated % 50 == 0):
-                print(f"Processed {updated} events...")
-
+            row = parse_event(ev)
         except Exception as e:
             skipped += 1
             if verbose and idx < 5:
                 print("Error on event:", ev.get("id"), str(e)[:160])
             continue
+        if row is None:
+            skipped += 1
+            if verbose and idx < 3:
+                print("Skip missing players:", {"id": ev.get("id"), "keys": list(ev.keys())[:12]})
+            continue
+        rows.append(row)
+
+        # Odds (non blocca ETL se fallisce): elaborate in blocco a fine giornata
+        if with_odds:
+            try:
+                odds_payloads[row["event_id"]] = fetch_event_odds_featured(row["event_id"], cache=cache)
+            except Exception:
+                pass
+
+    return {"events": len(events), "rows": rows, "skipped": skipped, "odds": odds_payloads}
+
+def load_day(db: DatabaseManager, rows: List[Dict[str, Any]],
+             odds_payloads: Optional[Dict[Any, Dict[str, Any]]] = None) -> Dict[str, int]:
+    """Scrive una giornata tramite gli upsert in blocco (una transazione per tabella)"""
+    players = []
+    for row in rows:
+        players.append((row["p1_name"], row["p1_country"], row["gender"]))
+        players.append((row["p2_name"], row["p2_country"], row["gender"]))
+    player_ids = db.bulk_upsert_players(players)
+
+    ids = db.bulk_upsert_matches([
+        (player_ids[row["p1_name"]], player_ids[row["p2_name"]], row["tournament_name"], row["round"],
+         row["surface"], row["match_time"], row["status"])
+        for row in rows
+    ])
+
+    with_odds = 0
+    if odds_payloads:
+        match_ids = {row["event_id"]: mid for row, mid in zip(rows, ids) if row["event_id"] in odds_payloads}
+        with_odds = store_best_odds(db, odds_payloads, match_ids)
+    return {"matches": len(ids), "with_odds": with_odds}
+
+def run_etl_today(verbose: bool = True, db_path: str = "data/tennis.db",
+                  date_str: Optional[str] = None,
+                  cache_path: Optional[str] = "data/http_cache.db") -> Dict[str, Any]:
+    db = DatabaseManager(db_path)
+    cache = HttpCache(cache_path) if cache_path else None
+    day = fetch_day(date_str or iso_date_utc_today(), cache=cache, verbose=verbose)
+
+    updated = matches_with_odds = 0
+    skipped = day["skipped"]
+    try:
+        loaded = load_day(db, day["rows"], day["odds"])
+        updated, matches_with_odds = loaded["matches"], loaded["with_odds"]
+    except Exception as e:
+        skipped += len(day["rows"])
+        if verbose:
+            print("Error storing day:", str(e)[:160])
+    if verbose:
+        print(f"Processed {updated} events...")
 
     return {
-        "events": len(events),
+        "events": day["events"],
         "updated": updated,
         "skipped": skipped,
-        "with_odds": matches_with_odds
+        "with_odds": matches_with_odds,
+        "http_cache": dict(cache.stats) if cache else None,
+        "dashboard": refresh_after_etl(db_path, verbose=verbose)
     }
 
 if __name__ == "__main__":
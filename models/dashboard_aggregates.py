@@ -0,0 +1,442 @@
+"""
+Aggregati precalcolati per la Dashboard Generale
+
+Le tabelle dash_* vivono in tennis_stats.db e sono alimentate da
+tennis.db (players, player_stats, matches, collegato con ATTACH) e dalle
+statistiche dettagliate di tennis_stats.db. refresh() elabora solo ciò che
+è cambiato dall'ultimo aggiornamento (watermark in dash_state):
+
+- giocatori nuovi (players.id), con anagrafica modificata o con
+  statistiche aggiornate (player_detailed_stats.last_updated)
+- partite nuove (matches.id): partite giocate e tornei coperti
+- partite analizzate nuove (match_detailed_stats.created_at)
+
+La distribuzione per paese è mantenuta per differenza (si sottraggono i
+vecchi paesi dei giocatori modificati e si sommano i nuovi). La dashboard
+legge ogni widget con una sola query indicizzata, indipendentemente dalla
+dimensione dei dati.
+"""
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from analytics.batch_metrics import update_after_etl
+from models.stats_models import TennisStatsDatabase
+
+logger = logging.getLogger(__name__)
+
+# Partite analizzate conservate in dash_recent_matches
+RECENT_LIMIT = 50
+
+# Variazione minima di forma (punti su 100) per segnalare un trend
+TREND_THRESHOLD = 2.0
+
+_WATERMARKS = {
+    'last_player_id': 0,
+    'last_match_id': 0,
+    'stats_updated_at': '',
+    'analysed_at': '',
+}
+
+
+class DashboardAggregates:
+    """
+    Viste aggregate della dashboard con refresh incrementale
+
+    Uso:
+        aggregates = DashboardAggregates()
+        aggregates.refresh()          # dopo ogni ETL
+        aggregates.top_elo(10)        # una query per widget
+    """
+
+    def __init__(self, stats_db_path: str = "data/tennis_stats.db", core_db_path: str = "data/tennis.db"):
+        self.stats_db_path = stats_db_path
+        self.core_db_path = core_db_path
+        # Garantisce le tabelle sorgente di tennis_stats.db
+        TennisStatsDatabase(stats_db_path)
+        self.init_database()
+
+    def _conn(self):
+        return sqlite3.connect(self.stats_db_path, timeout=30)
+
+    def init_database(self):
+        conn = self._conn()
+        cur = conn.cursor()
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS dash_state (
+            key TEXT PRIMARY KEY,
+            value
+        )
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS dash_players (
+            player_id INTEGER PRIMARY KEY,
+            name TEXT,
+            country TEXT,
+            gender TEXT,
+            elo_rating REAL,
+            ranking INTEGER,
+            form_rating REAL,
+            prev_form_rating REAL,
+            matches_played INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS dash_countries (
+            country TEXT PRIMARY KEY,
+            players INTEGER DEFAULT 0
+        )
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS dash_tournaments (
+            tournament_name TEXT PRIMARY KEY
+        )
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS dash_recent_matches (
+            match_id INTEGER PRIMARY KEY,
+            player1_name TEXT,
+            player2_name TEXT,
+            tournament_name TEXT,
+            match_time TIMESTAMP,
+            match_quality_score REAL,
+            analysed_at TIMESTAMP
+        )
+        """)
+
+        # Indici di lettura dei widget
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_dash_players_elo ON dash_players(elo_rating DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_dash_players_form ON dash_players(form_rating DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_dash_countries_players ON dash_countries(players DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_dash_recent_analysed ON dash_recent_matches(analysed_at DESC)")
+
+        # Indici sui watermark delle tabelle sorgente
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_player_stats_updated ON player_detailed_stats(last_updated)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_match_stats_created ON match_detailed_stats(created_at)")
+
+        conn.commit()
+        conn.close()
+
+    # === Stato ===
+
+    def _state(self, conn) -> Dict[str, Any]:
+        return dict(conn.execute("SELECT key, value FROM dash_state").fetchall())
+
+    def _set_state(self, conn, values: Dict[str, Any]):
+        conn.executemany("""
+            INSERT INTO dash_state (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        """, list(values.items()))
+
+    # === Refresh ===
+
+    def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Aggiorna gli aggregati con le modifiche successive all'ultimo refresh
+
+        Args:
+            full: ricostruisce tutto da zero (es. dopo modifiche manuali a player_stats)
+
+        Returns:
+            dict con players, matches, analysed (righe elaborate) ed elapsed_ms
+        """
+        if not os.path.exists(self.core_db_path):
+            logger.warning(f"Database {self.core_db_path} non trovato: aggregati dashboard non aggiornati")
+            return {'players': 0, 'matches': 0, 'analysed': 0, 'elapsed_ms': 0.0}
+
+        t0 = time.perf_counter()
+        conn = self._conn()
+        try:
+            conn.execute("ATTACH DATABASE ? AS core", (self.core_db_path,))
+            conn.execute("BEGIN IMMEDIATE")
+            if full:
+                for table in ('dash_players', 'dash_countries', 'dash_tournaments', 'dash_recent_matches'):
+                    conn.execute(f"DELETE FROM {table}")
+                conn.execute("DELETE FROM dash_state")
+
+            state = {**_WATERMARKS, **self._state(conn)}
+            wm = {}
+            players = self._refresh_players(conn, state, wm)
+            matches = self._refresh_matches(conn, state, wm)
+            analysed = self._refresh_recent_matches(conn, state, wm)
+            self._refresh_totals(conn, state, wm)
+
+            wm['refreshed_at'] = datetime.now().isoformat(timespec='seconds')
+            self._set_state(conn, wm)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+        logger.info(f"Aggregati dashboard: {players} giocatori, {matches} partite, {analysed} analisi ({elapsed_ms} ms)")
+        return {'players': players, 'matches': matches, 'analysed': analysed, 'elapsed_ms': elapsed_ms}
+
+    def _refresh_players(self, conn, state: Dict[str, Any], wm: Dict[str, Any]) -> int:
+        """Ricalcola le righe dei giocatori nuovi o con statistiche aggiornate"""
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS dirty_players (player_id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM dirty_players")
+        conn.execute("INSERT OR IGNORE INTO dirty_players SELECT id FROM core.players WHERE id > ?",
+                     (state['last_player_id'],))
+        conn.execute("""
+            INSERT OR IGNORE INTO dirty_players
+            SELECT player_id FROM player_detailed_stats WHERE last_updated >= ?
+        """, (state['stats_updated_at'],))
+        # players non ha un timestamp di modifica: anagrafica confrontata sulla chiave primaria
+        conn.execute("""
+            INSERT OR IGNORE INTO dirty_players
+            SELECT p.id FROM core.players p
+            JOIN dash_players a ON a.player_id = p.id
+            WHERE a.name IS NOT p.name
+               OR a.country IS NOT COALESCE(NULLIF(p.country, ''), 'N/D')
+               OR a.gender IS NOT p.gender
+        """)
+
+        dirty = conn.execute("SELECT COUNT(*) FROM dirty_players").fetchone()[0]
+        if dirty:
+            # Distribuzione per paese: toglie il contributo precedente...
+            conn.execute("""
+                UPDATE dash_countries SET players = players - old.n
+                FROM (
+                    SELECT country, COUNT(*) AS n FROM dash_players
+                    WHERE player_id IN (SELECT player_id FROM dirty_players)
+                    GROUP BY country
+                ) AS old
+                WHERE dash_countries.country = old.country
+            """)
+
+            conn.execute("""
+                INSERT INTO dash_players (player_id, name, country, gender, elo_rating, ranking, form_rating, updated_at)
+                SELECT p.id, p.name,
+                       COALESCE(NULLIF(p.country, ''), 'N/D'),
+                       p.gender,
+                       COALESCE(d.elo_rating, s.elo_rating, 1800),
+                       COALESCE(d.atp_ranking, d.wta_ranking, s.ranking),
+                       COALESCE(d.recent_form_rating,
+                                CASE WHEN d.recent_wins + d.recent_losses > 0
+                                     THEN 100.0 * d.recent_wins / (d.recent_wins + d.recent_losses) END),
+                       CURRENT_TIMESTAMP
+                FROM dirty_players x
+                JOIN core.players p ON p.id = x.player_id
+                LEFT JOIN core.player_stats s ON s.player_id = p.id
+                LEFT JOIN player_detailed_stats d ON d.player_id = p.id
+                WHERE 1
+                ON CONFLICT(player_id) DO UPDATE SET
+                    name = excluded.name,
+                    country = excluded.country,
+                    gender = excluded.gender,
+                    elo_rating = excluded.elo_rating,
+                    ranking = excluded.ranking,
+                    prev_form_rating = CASE WHEN excluded.form_rating IS NOT dash_players.form_rating
+                                            THEN dash_players.form_rating
+                                            ELSE dash_players.prev_form_rating END,
+                    form_rating = excluded.form_rating,
+                    updated_at = excluded.updated_at
+            """)
+
+            # ...e somma quello attuale
+            conn.execute("""
+                INSERT INTO dash_countries (country, players)
+                SELECT country, COUNT(*) FROM dash_players
+                WHERE player_id IN (SELECT player_id FROM dirty_players)
+                GROUP BY country
+                ON CONFLICT(country) DO UPDATE SET players = dash_countries.players + excluded.players
+            """)
+            conn.execute("DELETE FROM dash_countries WHERE players <= 0")
+
+        wm['last_player_id'] = conn.execute(
+            "SELECT COALESCE(MAX(id), ?) FROM core.players", (state['last_player_id'],)).fetchone()[0]
+        wm['stats_updated_at'] = conn.execute(
+            "SELECT COALESCE(MAX(last_updated), ?) FROM player_detailed_stats", (state['stats_updated_at'],)).fetchone()[0]
+        return dirty
+
+    def _refresh_matches(self, conn, state: Dict[str, Any], wm: Dict[str, Any]) -> int:
+        """Partite giocate per giocatore e tornei coperti dalle partite nuove"""
+        last_match_id = state['last_match_id']
+        new_matches = conn.execute("SELECT COUNT(*) FROM core.matches WHERE id > ?", (last_match_id,)).fetchone()[0]
+        if new_matches:
+            conn.execute("""
+                UPDATE dash_players SET matches_played = matches_played + delta.n
+                FROM (
+                    SELECT player_id, COUNT(*) AS n FROM (
+                        SELECT player1_id AS player_id FROM core.matches WHERE id > ?1
+                        UNION ALL
+                        SELECT player2_id FROM core.matches WHERE id > ?1
+                    ) GROUP BY player_id
+                ) AS delta
+                WHERE dash_players.player_id = delta.player_id
+            """, (last_match_id,))
+            conn.execute("""
+                INSERT OR IGNORE INTO dash_tournaments (tournament_name)
+                SELECT DISTINCT tournament_name FROM core.matches
+                WHERE id > ? AND tournament_name IS NOT NULL AND tournament_name != ''
+            """, (last_match_id,))
+
+        wm['last_match_id'] = conn.execute(
+            "SELECT COALESCE(MAX(id), ?) FROM core.matches", (last_match_id,)).fetchone()[0]
+        return new_matches
+
+    def _refresh_recent_matches(self, conn, state: Dict[str, Any], wm: Dict[str, Any]) -> int:
+        """Ultime partite con statistiche dettagliate (max RECENT_LIMIT)"""
+        cur = conn.execute("""
+            INSERT INTO dash_recent_matches
+                (match_id, player1_name, player2_name, tournament_name, match_time, match_quality_score, analysed_at)
+            SELECT ms.match_id, p1.name, p2.name, m.tournament_name, m.match_time,
+                   ms.match_quality_score, ms.created_at
+            FROM match_detailed_stats ms
+            LEFT JOIN core.matches m ON m.id = ms.match_id
+            LEFT JOIN core.players p1 ON p1.id = m.player1_id
+            LEFT JOIN core.players p2 ON p2.id = m.player2_id
+            WHERE ms.created_at >= ?
+            ON CONFLICT(match_id) DO UPDATE SET
+                player1_name = excluded.player1_name,
+                player2_name = excluded.player2_name,
+                tournament_name = excluded.tournament_name,
+                match_time = excluded.match_time,
+                match_quality_score = excluded.match_quality_score,
+                analysed_at = excluded.analysed_at
+        """, (state['analysed_at'],))
+        analysed = cur.rowcount
+
+        if analysed:
+            conn.execute("""
+                DELETE FROM dash_recent_matches WHERE match_id NOT IN (
+                    SELECT match_id FROM dash_recent_matches ORDER BY analysed_at DESC LIMIT ?
+                )
+            """, (RECENT_LIMIT,))
+
+        wm['analysed_at'] = conn.execute(
+            "SELECT COALESCE(MAX(created_at), ?) FROM match_detailed_stats", (state['analysed_at'],)).fetchone()[0]
+        return analysed
+
+    def _refresh_totals(self, conn, state: Dict[str, Any], wm: Dict[str, Any]):
+        """Totali delle metriche principali e variazione rispetto al refresh precedente"""
+        totals = {
+            'players': conn.execute("SELECT COUNT(*) FROM dash_players").fetchone()[0],
+            'analysed_matches': conn.execute("SELECT COUNT(*) FROM match_detailed_stats").fetchone()[0],
+            'tournaments': conn.execute("SELECT COUNT(*) FROM dash_tournaments").fetchone()[0],
+        }
+        for key, value in totals.items():
+            wm[key] = value
+            wm[f'{key}_delta'] = value - state.get(key, 0)
+
+    # === Letture per la dashboard ===
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        conn = self._conn()
+        cur = conn.execute(sql, params)
+        cols = [c[0] for c in cur.description]
+        rows = cur.fetchall()
+        conn.close()
+        return [dict(zip(cols, r)) for r in rows]
+
+    def totals(self) -> Dict[str, Any]:
+        """Totali e variazioni dell'ultimo refresh ({} se mai aggiornati)"""
+        conn = self._conn()
+        state = self._state(conn)
+        conn.close()
+        return state if 'refreshed_at' in state else {}
+
+    def top_elo(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return self._query("""
+            SELECT player_id, name, country, elo_rating, ranking FROM dash_players
+            ORDER BY elo_rating DESC LIMIT ?
+        """, (limit,))
+
+    def country_distribution(self, limit: int = 6) -> List[Dict[str, Any]]:
+        """Primi limit paesi per numero di giocatori, il resto raggruppato in 'Altri'"""
+        return self._query("""
+            WITH ranked AS (
+                SELECT country, players, ROW_NUMBER() OVER (ORDER BY players DESC, country) AS pos
+                FROM dash_countries
+            )
+            SELECT CASE WHEN pos <= ?1 THEN country ELSE 'Altri' END AS country, SUM(players) AS players
+            FROM ranked
+            GROUP BY 1
+            ORDER BY MIN(pos)
+        """, (limit,))
+
+    def in_form(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Giocatori con la forma migliore e trend rispetto al valore precedente"""
+        rows = self._query("""
+            SELECT player_id, name, form_rating, prev_form_rating FROM dash_players
+            WHERE form_rating IS NOT NULL
+            ORDER BY form_rating DESC LIMIT ?
+        """, (limit,))
+        for row in rows:
+            change = row['form_rating'] - (row['prev_form_rating'] if row['prev_form_rating'] is not None else row['form_rating'])
+            row['trend'] = 'up' if change >= TREND_THRESHOLD else 'down' if change <= -TREND_THRESHOLD else 'flat'
+        return rows
+
+    def recent_matches(self, limit: int = 5) -> List[Dict[str, Any]]:
+        return self._query("""
+            SELECT match_id, player1_name, player2_name, tournament_name, match_time,
+                   match_quality_score, analysed_at
+            FROM dash_recent_matches
+            ORDER BY analysed_at DESC LIMIT ?
+        """, (limit,))
+
+    def player_choices(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Giocatori selezionabili (per Elo decrescente)"""
+        return self._query("""
+            SELECT player_id, name FROM dash_players
+            ORDER BY elo_rating DESC LIMIT ?
+        """, (limit,))
+
+    def player_profile(self, player_id: int) -> Dict[str, Any]:
+        """Statistiche dettagliate del giocatore completate con Elo, ranking e forma aggregati"""
+        rows = self._query("""
+            SELECT a.elo_rating AS agg_elo_rating, a.ranking AS agg_ranking,
+                   a.form_rating AS agg_form_rating, a.matches_played, d.*
+            FROM dash_players a
+            LEFT JOIN player_detailed_stats d ON d.player_id = a.player_id
+            WHERE a.player_id = ?
+        """, (player_id,))
+        if not rows:
+            return {}
+        # Solo i valori presenti: le card usano i default per quelli mancanti
+        profile = {k: v for k, v in rows[0].items() if v is not None}
+        profile['elo_rating'] = profile.pop('agg_elo_rating', profile.get('elo_rating', 1800))
+        if 'agg_ranking' in profile:
+            profile['atp_ranking'] = profile.pop('agg_ranking')
+        if 'agg_form_rating' in profile:
+            profile['recent_form_rating'] = profile.pop('agg_form_rating')
+        return profile
+
+
+def refresh_after_etl(core_db_path: str = "data/tennis.db", stats_db_path: Optional[str] = None,
+                      verbose: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Refresh incrementale a fine ETL: un errore qui non deve far fallire il caricamento
+
+    Senza stats_db_path si usa tennis_stats.db nella cartella di core_db_path.
+    Prima del refresh calcola le metriche delle partite analizzate nuove, così
+    dash_recent_matches riceve già match_quality_score, e le copia in
+    player_match_stats.
+    """
+    if stats_db_path is None:
+        stats_db_path = os.path.join(os.path.dirname(core_db_path), "tennis_stats.db")
+    try:
+        aggregates = DashboardAggregates(stats_db_path, core_db_path)
+        update_after_etl(stats_db_path, verbose)
+        TennisStatsDatabase(stats_db_path).migrate_player_match_stats(core_db_path)
+        result = aggregates.refresh()
+    except Exception as e:
+        logger.error(f"Errore refresh aggregati dashboard: {e}")
+        if verbose:
+            print("Error refreshing dashboard aggregates:", str(e)[:160])
+        return None
+    if verbose:
+        print(f"Dashboard aggregates: {result}")
+    return result
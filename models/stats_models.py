@@ -2,22 +2,87 @@
 """
 Modelli estesi per statistiche dettagliate delle partite di tennis
 """
+import os
 import sqlite3
+import threading
 import pandas as pd
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import numpy as np
 
+from analytics.batch_metrics import update_match_metrics
+from analytics.momentum import momentum_score
+
+# Statistiche per giocatore di match_detailed_stats (colonne p1_/p2_ speculari)
+PLAYER_MATCH_COLUMNS = {
+    'first_serve_pct': 'REAL', 'first_serve_won_pct': 'REAL', 'second_serve_won_pct': 'REAL',
+    'aces': 'INTEGER', 'double_faults': 'INTEGER',
+    'service_games_won': 'INTEGER', 'service_games_total': 'INTEGER',
+    'break_points_saved': 'INTEGER', 'break_points_faced': 'INTEGER',
+    'first_return_won_pct': 'REAL', 'second_return_won_pct': 'REAL',
+    'break_points_converted': 'INTEGER', 'break_points_opportunities': 'INTEGER',
+    'return_games_won': 'INTEGER', 'return_games_total': 'INTEGER',
+    'winners': 'INTEGER', 'unforced_errors': 'INTEGER',
+    'net_points_won': 'INTEGER', 'net_points_total': 'INTEGER',
+    'total_points_won': 'INTEGER', 'total_points_total': 'INTEGER',
+    'dominance_ratio': 'REAL', 'momentum_score': 'REAL',
+}
+
+# Aggregati per giocatore su player_match_stats (stessi nomi di player_detailed_stats)
+_PLAYER_AGGREGATES = """
+    COUNT(*) AS matches,
+    AVG(first_serve_pct) AS avg_first_serve_pct,
+    AVG(first_serve_won_pct) AS avg_first_serve_won_pct,
+    AVG(second_serve_won_pct) AS avg_second_serve_won_pct,
+    AVG(aces) AS avg_aces_per_match,
+    AVG(double_faults) AS avg_double_faults_per_match,
+    100.0 * SUM(service_games_won) / NULLIF(SUM(service_games_total), 0) AS avg_service_games_won_pct,
+    100.0 * SUM(break_points_saved) / NULLIF(SUM(break_points_faced), 0) AS avg_break_points_saved_pct,
+    AVG(first_return_won_pct) AS avg_first_return_won_pct,
+    AVG(second_return_won_pct) AS avg_second_return_won_pct,
+    100.0 * SUM(break_points_converted) / NULLIF(SUM(break_points_opportunities), 0) AS avg_break_points_converted_pct,
+    100.0 * SUM(return_games_won) / NULLIF(SUM(return_games_total), 0) AS avg_return_games_won_pct,
+    AVG(winners) AS avg_winners_per_match,
+    AVG(unforced_errors) AS avg_unforced_errors_per_match,
+    100.0 * SUM(net_points_won) / NULLIF(SUM(net_points_total), 0) AS avg_net_points_won_pct,
+    100.0 * SUM(total_points_won) / NULLIF(SUM(total_points_total), 0) AS avg_total_points_won_pct,
+    AVG(dominance_ratio) AS dominance_ratio,
+    AVG(momentum_score) AS momentum_score
+"""
+
 class TennisStatsDatabase:
     """Database manager esteso per statistiche complete"""
     
+    # SQL di upsert per insieme di colonne, condiviso tra le istanze
+    _upsert_sql_cache: Dict[Tuple[Tuple[str, ...], bool, Tuple[Optional[str], ...]], str] = {}
+    
     def __init__(self, db_path="data/tennis_stats.db"):
         self.db_path = db_path
+        self._player_columns: Optional[frozenset] = None
+        # DEFAULT delle colonne (espressione SQL di PRAGMA table_info, None se assente)
+        self._player_defaults: Dict[str, Optional[str]] = {}
+        # Connessione di scrittura riusata dagli upsert di player_detailed_stats:
+        # sqlite3 mantiene preparati gli statement nella propria cache
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
         self.init_extended_database()
     
     def _conn(self):
         return sqlite3.connect(self.db_path)
     
+    def _writer_conn(self) -> sqlite3.Connection:
+        """Connessione di scrittura dell'istanza (da usare con _writer_lock)"""
+        if self._writer is None:
+            self._writer = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._writer
+    
+    def close(self):
+        """Chiude la connessione di scrittura (riaperta al prossimo upsert)"""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+    
     def init_extended_database(self):
         """Inizializza database con tabelle per statistiche complete"""
         conn = self._conn()
@@ -156,6 +221,23 @@ class TennisStatsDatabase:
         )
         """)
         
+        # Statistiche per giocatore e partita (formato lungo: una riga per lato).
+        # La chiave (player_id, match_id) raggruppa sul disco le partite di ogni
+        # giocatore: gli aggregati per giocatore sono una scansione di intervallo.
+        cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS player_match_stats (
+            player_id INTEGER NOT NULL,
+            match_id INTEGER NOT NULL,
+            side INTEGER NOT NULL,
+            opponent_id INTEGER,
+            match_time TIMESTAMP,
+            surface TEXT,
+            {', '.join(f"{col} {sql_type}" for col, sql_type in PLAYER_MATCH_COLUMNS.items())},
+            PRIMARY KEY(player_id, match_id),
+            FOREIGN KEY(match_id) REFERENCES match_detailed_stats(match_id)
+        ) WITHOUT ROWID
+        """)
+        
         # Tabella head-to-head
         cur.execute("""
         CREATE TABLE IF NOT EXISTS head_to_head (
@@ -236,6 +318,7 @@ class TennisStatsDatabase:
         # Indici per performance
         cur.execute("CREATE INDEX IF NOT EXISTS idx_player_stats_ranking ON player_detailed_stats(atp_ranking, wta_ranking)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_match_stats_match ON match_detailed_stats(match_id)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_player_match_stats_match ON player_match_stats(match_id, side)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_h2h_players ON head_to_head(player1_id, player2_id)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_trends_player_date ON historical_trends(player_id, date)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_tournament_perf ON tournament_performance(player_id, tournament_name, year)")
@@ -256,37 +339,103 @@ class TennisStatsDatabase:
         """
         Calcola Momentum Score basato su punti recenti vinti/persi
         Usa exponentially weighted moving average con leverage
+        (punti in ordine cronologico, il più recente è l'ultimo)
         """
-        if not recent_points:
-            return 0.5
-        
-        if leverage_weights is None:
-            # Pesi decrescenti esponenziali (più recente = più importante)
-            leverage_weights = [0.5 ** i for i in range(len(recent_points))]
-        
-        weighted_sum = sum(point * weight for point, weight in zip(recent_points, leverage_weights))
-        total_weight = sum(leverage_weights)
-        
-        return weighted_sum / total_weight if total_weight > 0 else 0.5
+        return momentum_score(recent_points, leverage_weights)
+    
+    def _player_stats_columns(self) -> frozenset:
+        """Colonne aggiornabili di player_detailed_stats (lette una volta con PRAGMA)"""
+        if self._player_columns is None:
+            conn = self._conn()
+            try:
+                rows = conn.execute("PRAGMA table_info(player_detailed_stats)").fetchall()
+            finally:
+                conn.close()
+            self._player_defaults = {row[1]: row[4] for row in rows}
+            self._player_columns = frozenset(row[1] for row in rows) - {'player_id', 'last_updated'}
+        return self._player_columns
+    
+    def _validate_player_stats_columns(self, columns) -> Tuple[str, ...]:
+        columns = tuple(columns)
+        unknown = [col for col in columns if col not in self._player_stats_columns()]
+        if unknown:
+            raise ValueError(f"Colonne non valide per player_detailed_stats: {', '.join(map(str, unknown))}")
+        if not columns:
+            raise ValueError("Nessuna statistica da aggiornare")
+        return columns
+    
+    def _player_stats_upsert_sql(self, columns: Tuple[str, ...], keep_existing: bool = False) -> str:
+        """
+        Testo SQL dell'upsert per un insieme di colonne (già validate), costruito
+        una volta sola: lo stesso testo riusa lo statement preparato nella cache
+        della connessione di scrittura
+
+        keep_existing: un valore NULL non sovrascrive quello già salvato e,
+        per un giocatore nuovo, lascia il DEFAULT della colonna (es. elo_rating 1800).
+        """
+        defaults = tuple(self._player_defaults.get(col) for col in columns) if keep_existing else ()
+        key = (columns, keep_existing, defaults)
+        sql = self._upsert_sql_cache.get(key)
+        if sql is None:
+            if keep_existing:
+                # Parametri numerati: l'UPDATE confronta il valore passato, non
+                # excluded.col che per i NULL contiene già il DEFAULT
+                values = ', '.join(f"?{i}" if default is None else f"COALESCE(?{i}, {default})"
+                                   for i, default in enumerate(defaults, start=2))
+                updates = ', '.join(f"{col} = COALESCE(?{i}, player_detailed_stats.{col})"
+                                    for i, col in enumerate(columns, start=2))
+            else:
+                values = ', '.join('?' * len(columns))
+                updates = ', '.join(f"{col} = excluded.{col}" for col in columns)
+            sql = (f"INSERT INTO player_detailed_stats (player_id, {', '.join(columns)}) "
+                   f"VALUES ({'?1' if keep_existing else '?'}, {values}) "
+                   f"ON CONFLICT(player_id) DO UPDATE SET {updates}, last_updated = CURRENT_TIMESTAMP")
+            self._upsert_sql_cache[key] = sql
+        return sql
     
     def update_player_detailed_stats(self, player_id: int, stats: Dict[str, Any]):
-        """Aggiorna statistiche dettagliate giocatore"""
-        conn = self._conn()
-        cur = conn.cursor()
-        
-        # Costruisce query dinamica basata sui campi forniti
-        fields = list(stats.keys())
-        placeholders = ', '.join([f"{field} = ?" for field in fields])
-        values = list(stats.values()) + [player_id]
+        """Aggiorna statistiche dettagliate giocatore (solo i campi forniti)"""
+        columns = self._validate_player_stats_columns(stats.keys())
+        with self._writer_lock:
+            conn = self._writer_conn()
+            with conn:
+                conn.execute(self._player_stats_upsert_sql(columns), [player_id, *stats.values()])
+    
+    def bulk_update_player_detailed_stats(self, stats: pd.DataFrame) -> int:
+        """
+        Aggiorna statistiche di molti giocatori in una sola transazione
+
+        Args:
+            stats: una riga per giocatore, con colonna (o indice) player_id e
+                colonne di player_detailed_stats. I valori mancanti (NaN)
+                non sovrascrivono quelli già salvati (per un giocatore nuovo
+                resta il DEFAULT della colonna). Per le medie di
+                get_player_match_aggregates() va tolto il conteggio partite,
+                che non è una colonna di player_detailed_stats:
+                db.bulk_update_player_detailed_stats(aggregates.drop(columns='matches'))
+
+        Returns:
+            numero di giocatori aggiornati
+        """
+        if stats.empty:
+            return 0
+        if 'player_id' not in stats.columns:
+            stats = stats.reset_index()
+        if 'player_id' not in stats.columns:
+            raise ValueError("Manca la colonna player_id")
         
-        cur.execute(f"""
-            INSERT OR REPLACE INTO player_detailed_stats (player_id, {', '.join(fields)})
-            VALUES (?, {', '.join(['?' for _ in fields])})
-            ON CONFLICT(player_id) DO UPDATE SET {placeholders}, last_updated = CURRENT_TIMESTAMP
-        """, [player_id] + list(stats.values()) + list(stats.values()))
+        columns = self._validate_player_stats_columns(col for col in stats.columns if col != 'player_id')
+        sql = self._player_stats_upsert_sql(columns, keep_existing=True)
+        values = [stats['player_id'].astype('int64').tolist()]
+        for col in columns:
+            series = stats[col]
+            values.append(series.astype(object).where(series.notna(), None).tolist())
         
-        conn.commit()
-        conn.close()
+        with self._writer_lock:
+            conn = self._writer_conn()
+            with conn:
+                conn.executemany(sql, zip(*values))
+        return len(stats)
     
     def get_player_detailed_stats(self, player_id: int) -> Optional[Dict[str, Any]]:
         """Recupera statistiche dettagliate giocatore"""
@@ -304,6 +453,78 @@ class TennisStatsDatabase:
         conn.close()
         return None
     
+    def migrate_player_match_stats(self, core_db_path: str = "data/tennis.db", full: bool = False) -> int:
+        """
+        Copia match_detailed_stats in player_match_stats (una riga per giocatore)
+
+        Giocatori, data e superficie vengono da tennis.db (collegato con ATTACH).
+        Elabora solo le partite non ancora copiate (full=True ricostruisce la
+        tabella); le partite senza giocatori in tennis.db vengono saltate.
+        Prima calcola le metriche mancanti, così dominance_ratio è già presente.
+
+        Returns:
+            righe inserite o aggiornate
+        """
+        if not os.path.exists(core_db_path):
+            return 0
+        update_match_metrics(self.db_path)
+        
+        columns = ', '.join(PLAYER_MATCH_COLUMNS)
+        updates = ', '.join(f"{col} = excluded.{col}" for col in PLAYER_MATCH_COLUMNS)
+        conn = self._conn()
+        try:
+            conn.execute("ATTACH DATABASE ? AS core", (core_db_path,))
+            with conn:
+                if full:
+                    conn.execute("DELETE FROM player_match_stats")
+                copied = 0
+                for side, player, opponent in ((1, 'player1_id', 'player2_id'), (2, 'player2_id', 'player1_id')):
+                    prefixed = ', '.join(f"ms.p{side}_{col}" for col in PLAYER_MATCH_COLUMNS)
+                    cur = conn.execute(f"""
+                        INSERT INTO player_match_stats
+                            (player_id, match_id, side, opponent_id, match_time, surface, {columns})
+                        SELECT m.{player}, ms.match_id, {side}, m.{opponent}, m.match_time, m.surface, {prefixed}
+                        FROM match_detailed_stats ms
+                        JOIN core.matches m ON m.id = ms.match_id
+                        WHERE m.{player} IS NOT NULL
+                          AND NOT EXISTS (SELECT 1 FROM player_match_stats p
+                                          WHERE p.match_id = ms.match_id AND p.side = {side})
+                        ON CONFLICT(player_id, match_id) DO UPDATE SET
+                            side = excluded.side, opponent_id = excluded.opponent_id,
+                            match_time = excluded.match_time, surface = excluded.surface, {updates}
+                    """)
+                    copied += cur.rowcount
+        finally:
+            conn.close()
+        return copied
+    
+    def get_player_match_aggregates(self, player_ids: Optional[List[int]] = None,
+                                    surface: Optional[str] = None) -> pd.DataFrame:
+        """
+        Medie per giocatore su tutte le partite analizzate (una riga per giocatore)
+
+        Un solo GROUP BY su player_match_stats, letto in ordine di chiave
+        primaria: le colonne hanno i nomi di player_detailed_stats, tranne
+        matches (partite considerate).
+        """
+        where, params = [], []
+        if player_ids is not None:
+            where.append(f"player_id IN ({', '.join('?' * len(player_ids))})")
+            params.extend(player_ids)
+        if surface:
+            where.append("surface = ?")
+            params.append(surface)
+        sql = f"SELECT player_id, {_PLAYER_AGGREGATES} FROM player_match_stats"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY player_id"
+        
+        conn = self._conn()
+        try:
+            return pd.read_sql_query(sql, conn, params=params, index_col='player_id')
+        finally:
+            conn.close()
+    
     def get_head_to_head(self, player1_id: int, player2_id: int) -> Dict[str, Any]:
         """Recupera statistiche head-to-head tra due giocatori"""
         conn = self._conn()
@@ -5,13 +5,16 @@ Gestisce recupero dati tennis, quote e piazzamento scommesse
 """
 
 import requests
-import json
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import uuid
 
+import numpy as np
+
 from config.betfair_it import (
     BETFAIR_IT_ENDPOINTS,
     RATE_LIMITS,
@@ -21,6 +24,46 @@ from config.betfair_it import (
     NETWORK_CONFIG
 )
 from services.betfair_session import BetfairItalySession
+from services import http_transport, json_codec
+
+
+def validate_italian_orders(sides: np.ndarray, sizes: np.ndarray, prices: np.ndarray) -> List[Optional[str]]:
+    """
+    Valida in un unico passaggio vettorizzato un insieme di istruzioni
+    rispetto alle regole del mercato italiano
+
+    Returns:
+        Lista allineata agli input con il messaggio di errore (None se valida)
+    """
+    sides = np.asarray(sides, dtype=object)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+
+    min_stake = ITALIAN_BETTING_RULES['min_back_stake_euro_cents']
+    increment = ITALIAN_BETTING_RULES['stake_increment_euro_cents']
+    max_winnings = ITALIAN_BETTING_RULES['max_winnings_per_bet_euros']
+
+    is_back = sides == 'B'
+    is_lay = sides == 'L'
+    size_cents = np.round(sizes * 100)
+    potential_winnings = np.where(is_back, sizes * (prices - 1), sizes)
+
+    # Controlli in ordine di priorità: vince il primo violato
+    checks = [
+        (~(is_back | is_lay), "Lato non valido (usare 'B' o 'L')"),
+        (~np.isfinite(sizes) | (sizes <= 0), "Importo non valido"),
+        (~np.isfinite(prices) | (prices <= 1), "Quota non valida"),
+        (is_back & (size_cents < min_stake), f"Puntata minima: {min_stake/100}€"),
+        (is_back & (size_cents % increment != 0), f"Puntata deve essere multipla di {increment/100}€"),
+        (potential_winnings > max_winnings, f"Vincita potenziale supera il limite di {max_winnings}€"),
+    ]
+
+    errors: List[Optional[str]] = [None] * len(sizes)
+    for mask, message in reversed(checks):
+        for i in np.flatnonzero(mask):
+            errors[i] = message
+    return errors
+
 
 class BetfairItalyClient:
     """Client per interagire con Betfair Italia API"""
@@ -29,22 +72,25 @@ class BetfairItalyClient:
         self.session = session
         self.logger = logging.getLogger(__name__)
         self.last_request_time = 0
+        self._rate_lock = threading.Lock()
         
     def _rate_limit_check(self):
-        """Applica rate limiting tra richieste"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """Applica rate limiting tra richieste (thread-safe)"""
         min_interval = 1.0 / RATE_LIMITS['requests_per_second']
         
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            time.sleep(sleep_time)
-            
-        self.last_request_time = time.time()
+        # Ogni chiamante prenota il proprio slot sotto lock e attende fuori
+        with self._rate_lock:
+            current_time = time.time()
+            slot = max(current_time, self.last_request_time + min_interval)
+            self.last_request_time = slot
+        
+        if slot > current_time:
+            time.sleep(slot - current_time)
     
-    def _make_api_request(self, method: str, params: Dict[str, Any], endpoint: str = 'betting_json_rpc') -> Dict[str, Any]:
+    def _post_rpc(self, method: str, params: Dict[str, Any], endpoint: str = 'betting_json_rpc') -> bytes:
         """
-        Effettua richiesta API con gestione errori e retry
+        Invia la richiesta JSON-RPC con retry e restituisce il corpo grezzo
+        della risposta (la decodifica è a carico del chiamante)
         """
         if not self.session.is_logged_in():
             raise RuntimeError("Sessione non attiva")
@@ -52,6 +98,7 @@ class BetfairItalyClient:
         self._rate_limit_check()
         
         headers = self.session.get_auth_headers()
+        headers['Content-Type'] = 'application/json'
         
         # Payload JSON-RPC
         payload = {
@@ -60,28 +107,21 @@ class BetfairItalyClient:
             'params': params,
             'id': str(uuid.uuid4())
         }
+        body = json_codec.dumps(payload)
         
         url = BETFAIR_IT_ENDPOINTS[endpoint]
         
         for attempt in range(NETWORK_CONFIG['max_retries']):
             try:
-                response = requests.post(
+                response = http_transport.post(
                     url,
                     headers=headers,
-                    json=payload,
+                    data=body,
                     timeout=(NETWORK_CONFIG['connect_timeout'], NETWORK_CONFIG['read_timeout'])
                 )
                 
                 if response.status_code == 200:
-                    result = response.json()
-                    
-                    if 'error' in result:
-                        error_code = result['error'].get('code', 'UNKNOWN')
-                        error_message = result['error'].get('message', 'Errore sconosciuto')
-                        self.logger.error(f"Errore API: {error_code} - {error_message}")
-                        raise RuntimeError(f"Errore API: {error_message}")
-                    
-                    return result.get('result', {})
+                    return response.content
                 
                 elif response.status_code in NETWORK_CONFIG['retry_status_codes']:
                     if attempt < NETWORK_CONFIG['max_retries'] - 1:
@@ -104,6 +144,24 @@ class BetfairItalyClient:
         
         raise RuntimeError("Richiesta API fallita dopo tutti i tentativi")
     
+    def _raise_api_error(self, error: Dict[str, Any]):
+        """Registra e solleva un errore JSON-RPC"""
+        error_code = error.get('code', 'UNKNOWN')
+        error_message = error.get('message', 'Errore sconosciuto')
+        self.logger.error(f"Errore API: {error_code} - {error_message}")
+        raise RuntimeError(f"Errore API: {error_message}")
+    
+    def _make_api_request(self, method: str, params: Dict[str, Any], endpoint: str = 'betting_json_rpc') -> Dict[str, Any]:
+        """
+        Effettua richiesta API con gestione errori e retry
+        """
+        result = json_codec.loads(self._post_rpc(method, params, endpoint))
+        
+        if 'error' in result:
+            self._raise_api_error(result['error'])
+        
+        return result.get('result', {})
+    
     def get_tennis_events(self, days_ahead: int = 7) -> List[Dict[str, Any]]:
         """
         Recupera eventi tennis disponibili nei prossimi giorni
@@ -153,10 +211,8 @@ class BetfairItalyClient:
             self.logger.error(f"Errore recupero mercati tennis: {e}")
             return []
     
-    def get_market_odds(self, market_ids: List[str], price_projection: Dict[str, Any] = None) -> Dict[str, Any]:
-        """
-        Recupera quote in tempo reale per mercati specifici
-        """
+    def _market_book_params(self, market_ids: List[str], price_projection: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Parametri listMarketBook con controllo del peso della richiesta"""
         if price_projection is None:
             price_projection = {
                 'priceData': ['EX_BEST_OFFERS', 'EX_ALL_OFFERS'],
@@ -173,10 +229,16 @@ class BetfairItalyClient:
             self.logger.warning(f"Richiesta troppo pesante, limitando a {RATE_LIMITS['data_request_weight_limit'] // weight_per_market} mercati")
             market_ids = market_ids[:RATE_LIMITS['data_request_weight_limit'] // weight_per_market]
         
-        params = {
+        return {
             'marketIds': market_ids,
             'priceProjection': price_projection
         }
+    
+    def get_market_odds(self, market_ids: List[str], price_projection: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Recupera quote in tempo reale per mercati specifici
+        """
+        params = self._market_book_params(market_ids, price_projection)
         
         try:
             result = self._make_api_request('listMarketBook', params)
@@ -186,6 +248,23 @@ class BetfairItalyClient:
             self.logger.error(f"Errore recupero quote: {e}")
             return []
     
+    def get_market_books(self, market_ids: List[str], price_projection: Dict[str, Any] = None) -> List[json_codec.MarketBook]:
+        """
+        Recupera quote come MarketBook tipizzati (decodifica diretta in strutture
+        compatte, senza dizionari annidati)
+        """
+        params = self._market_book_params(market_ids, price_projection)
+        
+        try:
+            books, error = json_codec.decode_market_book_response(self._post_rpc('listMarketBook', params))
+            if error is not None:
+                self._raise_api_error(error)
+            self.logger.info(f"Recuperate quote per {len(books)} mercati")
+            return books
+        except Exception as e:
+            self.logger.error(f"Errore recupero quote: {e}")
+            return []
+    
     def get_tennis_odds_realtime(self, competition_filter: List[str] = None) -> List[Dict[str, Any]]:
         """
         Recupera quote tennis in tempo reale con filtri
@@ -207,34 +286,37 @@ class BetfairItalyClient:
         if not markets:
             return []
         
-        # Step 3: Recupera quote per i mercati
+        # Step 3: Recupera quote per i mercati (indicizzate per marketId)
         market_ids = [m['marketId'] for m in markets]
-        odds_data = self.get_market_odds(market_ids)
+        books_by_market = {book.marketId: book for book in self.get_market_books(market_ids)}
         
         # Step 4: Combina dati per output strutturato
         tennis_odds = []
         for market in markets:
             market_id = market['marketId']
-            market_odds = next((o for o in odds_data if o['marketId'] == market_id), None)
+            market_book = books_by_market.get(market_id)
             
-            if market_odds and market_odds.get('status') == 'OPEN':
+            if market_book is not None and market_book.status == 'OPEN':
                 match_info = {
                     'market_id': market_id,
+                    'event_id': market['event']['id'],
                     'event_name': market['event']['name'],
                     'competition': market['competition']['name'],
                     'market_start_time': market['marketStartTime'],
                     'runners': []
                 }
                 
-                for runner in market_odds.get('runners', []):
+                runner_names = {r['selectionId']: r['runnerName'] for r in market.get('runners', [])}
+                
+                for runner in market_book.runners:
+                    ex = runner.ex
                     runner_info = {
-                        'selection_id': runner['selectionId'],
-                        'runner_name': next((r['runnerName'] for r in market['runners'] 
-                                           if r['selectionId'] == runner['selectionId']), 'Unknown'),
-                        'status': runner['status'],
-                        'back_prices': runner.get('ex', {}).get('availableToBack', []),
-                        'lay_prices': runner.get('ex', {}).get('availableToLay', []),
-                        'last_price_traded': runner.get('lastPriceTraded')
+                        'selection_id': runner.selectionId,
+                        'runner_name': runner_names.get(runner.selectionId, 'Unknown'),
+                        'status': runner.status,
+                        'back_prices': json_codec.price_sizes_to_dicts(ex.availableToBack) if ex else [],
+                        'lay_prices': json_codec.price_sizes_to_dicts(ex.availableToLay) if ex else [],
+                        'last_price_traded': runner.lastPriceTraded
                     }
                     match_info['runners'].append(runner_info)
                 
@@ -254,32 +336,13 @@ class BetfairItalyClient:
             price: Quota
         """
         # Validazione regole italiane
-        size_cents = int(size * 100)
-        
-        if side == 'B':  # Back bet
-            if size_cents < ITALIAN_BETTING_RULES['min_back_stake_euro_cents']:
-                raise ValueError(f"Puntata minima: {ITALIAN_BETTING_RULES['min_back_stake_euro_cents']/100}€")
-            if size_cents % ITALIAN_BETTING_RULES['stake_increment_euro_cents'] != 0:
-                raise ValueError(f"Puntata deve essere multipla di {ITALIAN_BETTING_RULES['stake_increment_euro_cents']/100}€")
-        
-        # Controllo vincita massima
-        potential_winnings = size * (price - 1) if side == 'B' else size
-        if potential_winnings > ITALIAN_BETTING_RULES['max_winnings_per_bet_euros']:
-            raise ValueError(f"Vincita potenziale supera il limite di {ITALIAN_BETTING_RULES['max_winnings_per_bet_euros']}€")
+        error = validate_italian_orders([side], [size], [price])[0]
+        if error:
+            raise ValueError(error)
         
         params = {
             'marketId': market_id,
-            'instructions': [{
-                'selectionId': selection_id,
-                'handicap': 0,
-                'side': side,
-                'orderType': 'LIMIT',
-                'limitOrder': {
-                    'size': size,
-                    'price': price,
-                    'persistenceType': 'LAPSE'
-                }
-            }]
+            'instructions': [self._limit_instruction(selection_id, side, size, price)]
         }
         
         try:
@@ -290,6 +353,127 @@ class BetfairItalyClient:
             self.logger.error(f"Errore piazzamento scommessa: {e}")
             raise
     
+    @staticmethod
+    def _limit_instruction(selection_id: int, side: str, size: float, price: float) -> Dict[str, Any]:
+        """Istruzione LIMIT per placeOrders"""
+        return {
+            'selectionId': selection_id,
+            'handicap': 0,
+            'side': side,
+            'orderType': 'LIMIT',
+            'limitOrder': {
+                'size': size,
+                'price': price,
+                'persistenceType': 'LAPSE'
+            }
+        }
+    
+    def _place_market_batch(self, market_id: str, instructions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Invia un singolo placeOrders (stesso mercato, max 50 istruzioni)"""
+        params = {
+            'marketId': market_id,
+            'instructions': instructions,
+            # customerRef rende idempotenti i retry di rete del batch
+            'customerRef': uuid.uuid4().hex
+        }
+        return self._make_api_request('placeOrders', params)
+    
+    def place_bets(self, orders: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Piazza più scommesse in blocco (ATTENZIONE: usa fondi reali!)
+        
+        Le istruzioni vengono validate insieme, raggruppate per mercato in
+        batch da al massimo RATE_LIMITS['place_orders_instructions_limit']
+        e inviate in parallelo.
+        
+        Args:
+            orders: lista di dict con market_id, selection_id, side, size, price
+            max_workers: batch inviati in parallelo (default: burst_requests)
+        
+        Returns:
+            Un risultato per ordine, nello stesso ordine dell'input, con
+            status (SUCCESS / FAILURE / INVALID / ERROR), bet_id, size_matched,
+            average_price_matched ed error
+        """
+        if not orders:
+            return []
+        
+        errors = validate_italian_orders(
+            [o['side'] for o in orders],
+            [o['size'] for o in orders],
+            [o['price'] for o in orders]
+        )
+        
+        results: List[Dict[str, Any]] = [
+            {
+                'market_id': o['market_id'],
+                'selection_id': o['selection_id'],
+                'side': o['side'],
+                'size': o['size'],
+                'price': o['price'],
+                'status': 'INVALID' if error else None,
+                'bet_id': None,
+                'size_matched': None,
+                'average_price_matched': None,
+                'error': error
+            }
+            for o, error in zip(orders, errors)
+        ]
+        
+        # Raggruppamento per mercato, spezzato al limite di istruzioni
+        limit = RATE_LIMITS['place_orders_instructions_limit']
+        by_market: Dict[str, List[int]] = {}
+        for i, (order, error) in enumerate(zip(orders, errors)):
+            if error is None:
+                by_market.setdefault(order['market_id'], []).append(i)
+        batches = [
+            (market_id, indices[start:start + limit])
+            for market_id, indices in by_market.items()
+            for start in range(0, len(indices), limit)
+        ]
+        
+        if not batches:
+            return results
+        
+        def submit(batch: Tuple[str, List[int]]) -> Tuple[List[int], Optional[Dict[str, Any]], Optional[str]]:
+            market_id, indices = batch
+            instructions = [
+                self._limit_instruction(orders[i]['selection_id'], orders[i]['side'],
+                                        orders[i]['size'], orders[i]['price'])
+                for i in indices
+            ]
+            try:
+                return indices, self._place_market_batch(market_id, instructions), None
+            except Exception as e:
+                self.logger.error(f"Errore piazzamento batch mercato {market_id}: {e}")
+                return indices, None, str(e)
+        
+        workers = max_workers or min(len(batches), RATE_LIMITS['burst_requests'])
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for indices, report, error in executor.map(submit, batches):
+                if report is None:
+                    for i in indices:
+                        results[i].update(status='ERROR', error=error)
+                    continue
+                
+                # instructionReports segue l'ordine delle istruzioni inviate
+                instruction_reports = report.get('instructionReports') or []
+                for position, i in enumerate(indices):
+                    ir = instruction_reports[position] if position < len(instruction_reports) else {}
+                    status = ir.get('status') or report.get('status') or 'FAILURE'
+                    error_code = ir.get('errorCode') or (report.get('errorCode') if status != 'SUCCESS' else None)
+                    results[i].update(
+                        status=status,
+                        bet_id=ir.get('betId'),
+                        size_matched=ir.get('sizeMatched'),
+                        average_price_matched=ir.get('averagePriceMatched'),
+                        error=error_code
+                    )
+        
+        placed = sum(1 for r in results if r['status'] == 'SUCCESS')
+        self.logger.info(f"Piazzate {placed}/{len(orders)} scommesse in {len(batches)} batch")
+        return results
+    
     def get_account_funds(self) -> Dict[str, Any]:
         """Recupera informazioni sui fondi dell'account"""
         try:
@@ -299,10 +483,36 @@ class BetfairItalyClient:
             self.logger.error(f"Errore recupero fondi: {e}")
             return {}
     
+    def list_current_orders(self, bet_ids: List[str] = None, market_ids: List[str] = None,
+                            order_projection: str = 'ALL', date_range: Dict[str, str] = None,
+                            order_by: str = 'BY_PLACE_TIME', sort_dir: str = 'EARLIEST_TO_LATEST',
+                            from_record: int = 0, record_count: int = 1000) -> Dict[str, Any]:
+        """
+        Pagina di listCurrentOrders con filtri
+        
+        Returns:
+            dict con currentOrders e moreAvailable (solleva in caso di errore API)
+        """
+        params: Dict[str, Any] = {
+            'orderProjection': order_projection,
+            'orderBy': order_by,
+            'sortDir': sort_dir,
+            'fromRecord': from_record,
+            'recordCount': record_count
+        }
+        if bet_ids:
+            params['betIds'] = bet_ids
+        if market_ids:
+            params['marketIds'] = market_ids
+        if date_range:
+            params['dateRange'] = date_range
+        
+        return self._make_api_request('listCurrentOrders', params)
+    
     def get_current_orders(self) -> List[Dict[str, Any]]:
         """Recupera ordini correnti"""
         try:
-            result = self._make_api_request('listCurrentOrders', {})
+            result = self.list_current_orders()
             return result.get('currentOrders', [])
         except Exception as e:
             self.logger.error(f"Errore recupero ordini correnti: {e}")
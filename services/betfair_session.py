@@ -7,6 +7,7 @@ Supporta login interattivo e certificato per betfair.it
 import requests
 import time
 import logging
+import threading
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 import json
@@ -16,8 +17,15 @@ from config.betfair_it import (
     DEFAULT_HEADERS, 
     RATE_LIMITS,
     NETWORK_CONFIG,
-    ERROR_MESSAGES
+    ERROR_MESSAGES,
+    SESSION_CONFIG
 )
+from services import http_transport
+
+# Esiti di BetfairItalySession.keep_alive_status
+KEEP_ALIVE_SUCCESS = 'SUCCESS'
+KEEP_ALIVE_INVALID = 'INVALID'
+KEEP_ALIVE_ERROR = 'ERROR'
 
 class BetfairItalySession:
     """Gestisce l'autenticazione e la sessione per Betfair Italia"""
@@ -28,12 +36,11 @@ class BetfairItalySession:
         self.password = password
         self.session_token = None
         self.session_expires = None
+        self._token_lock = threading.RLock()
         self.last_request_time = 0
         self.request_count = 0
-        self.session = requests.Session()
-        
-        # Configurazione timeout e retry
-        self.session.timeout = (NETWORK_CONFIG['connect_timeout'], NETWORK_CONFIG['read_timeout'])
+        # Connessioni, timeout e retry sono gestiti dal trasporto condiviso
+        # (services.http_transport), con una sessione keep-alive per host
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -83,7 +90,7 @@ class BetfairItalySession:
         }
         
         try:
-            response = self.session.post(
+            response = http_transport.post(
                 BETFAIR_IT_ENDPOINTS['login_interactive'],
                 headers=headers,
                 data=data
@@ -93,9 +100,8 @@ class BetfairItalySession:
                 result = response.json()
                 
                 if result.get('status') == 'SUCCESS':
-                    self.session_token = result.get('token')
                     # Sessione valida per 8 ore di default
-                    self.session_expires = datetime.now() + timedelta(hours=8)
+                    self.adopt_token(result.get('token'))
                     self.logger.info("Login interattivo completato con successo")
                     return True
                 else:
@@ -122,7 +128,7 @@ class BetfairItalySession:
         headers['X-Application'] = self.app_key
         
         try:
-            response = self.session.post(
+            response = http_transport.post(
                 BETFAIR_IT_ENDPOINTS['login_cert'],
                 headers=headers,
                 cert=(cert_path, key_path)
@@ -132,8 +138,7 @@ class BetfairItalySession:
                 result = response.json()
                 
                 if result.get('status') == 'SUCCESS':
-                    self.session_token = result.get('token')
-                    self.session_expires = datetime.now() + timedelta(hours=8)
+                    self.adopt_token(result.get('token'))
                     self.logger.info("Login certificato completato con successo")
                     return True
                 else:
@@ -151,8 +156,19 @@ class BetfairItalySession:
     
     def keep_alive(self) -> bool:
         """Mantiene attiva la sessione"""
+        return self.keep_alive_status() == KEEP_ALIVE_SUCCESS
+    
+    def keep_alive_status(self) -> str:
+        """
+        Keep-alive con esito dettagliato
+        
+        Returns:
+            KEEP_ALIVE_SUCCESS, KEEP_ALIVE_INVALID (Betfair non riconosce
+            più il token: serve un nuovo login) o KEEP_ALIVE_ERROR (errore
+            di rete o del server, il token può essere ancora valido)
+        """
         if not self.is_logged_in():
-            return False
+            return KEEP_ALIVE_INVALID
             
         self._rate_limit_check()
         
@@ -161,7 +177,7 @@ class BetfairItalySession:
         headers['X-Authentication'] = self.session_token
         
         try:
-            response = self.session.post(
+            response = http_transport.post(
                 BETFAIR_IT_ENDPOINTS['keep_alive'],
                 headers=headers
             )
@@ -170,14 +186,20 @@ class BetfairItalySession:
                 result = response.json()
                 if result.get('status') == 'SUCCESS':
                     # Estende la sessione
-                    self.session_expires = datetime.now() + timedelta(hours=8)
+                    self.adopt_token(self.session_token)
                     self.logger.debug("Keep alive completato con successo")
-                    return True
+                    return KEEP_ALIVE_SUCCESS
+                if result.get('error') == 'NO_SESSION':
+                    self.logger.warning("Keep alive: sessione non più valida")
+                    return KEEP_ALIVE_INVALID
+                self.logger.warning(f"Keep alive non riuscito: {result.get('error')}")
+            else:
+                self.logger.warning(f"Keep alive: HTTP {response.status_code}")
                     
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             self.logger.error(f"Errore durante keep alive: {e}")
             
-        return False
+        return KEEP_ALIVE_ERROR
     
     def logout(self) -> bool:
         """Termina la sessione"""
@@ -189,13 +211,12 @@ class BetfairItalySession:
         headers['X-Authentication'] = self.session_token
         
         try:
-            response = self.session.post(
+            response = http_transport.post(
                 BETFAIR_IT_ENDPOINTS['logout'],
                 headers=headers
             )
             
-            self.session_token = None
-            self.session_expires = None
+            self.clear_token()
             self.logger.info("Logout completato")
             return True
             
@@ -210,12 +231,26 @@ class BetfairItalySession:
             
         if self.session_expires and datetime.now() >= self.session_expires:
             self.logger.warning("Sessione scaduta")
-            self.session_token = None
-            self.session_expires = None
+            self.clear_token()
             return False
             
         return True
     
+    def adopt_token(self, token: str, expires: Optional[datetime] = None):
+        """
+        Imposta il token di sessione (login, keep-alive o token condiviso
+        da un altro processo tramite la cache)
+        """
+        with self._token_lock:
+            self.session_token = token
+            self.session_expires = expires or datetime.now() + timedelta(hours=SESSION_CONFIG['session_hours'])
+    
+    def clear_token(self):
+        """Invalida il token di sessione locale"""
+        with self._token_lock:
+            self.session_token = None
+            self.session_expires = None
+    
     def get_auth_headers(self) -> Dict[str, str]:
         """Restituisce gli headers per le richieste autenticate"""
         if not self.is_logged_in():
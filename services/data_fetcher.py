@@ -2,7 +2,7 @@
 """
 Servizio per raccogliere dati statistici da fonti esterne
 """
-import requests
+import os
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Any
@@ -11,20 +11,21 @@ import random
 from datetime import datetime, timedelta
 import logging
 
+from analytics.live_state import FeedReplayer
+
 logger = logging.getLogger(__name__)
 
 class TennisDataFetcher:
     """Fetcher per dati tennis da multiple fonti"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
+    def __init__(self, live_feed_path: Optional[str] = None):
         # Rate limiting
         self.last_request_time = 0
         self.min_request_interval = 1.0  # secondi tra richieste
+        
+        # Feed live punto per punto (JSONL) riprodotto nel LiveStateTracker
+        live_feed_path = live_feed_path or os.getenv('LIVE_FEED_PATH')
+        self.live_feed = FeedReplayer(live_feed_path, speed=float(os.getenv('LIVE_FEED_SPEED', '1'))) if live_feed_path else None
     
     def _rate_limit(self):
         """Implementa rate limiting"""
@@ -255,7 +256,10 @@ class TennisDataFetcher:
         return history
     
     def get_live_matches(self) -> List[Dict[str, Any]]:
-        """Simula fetch partite live con statistiche in tempo reale"""
+        """Partite live dal feed punto per punto se configurato, altrimenti simulate"""
+        if self.live_feed is not None:
+            return self.live_feed.live_matches()
+        
         logger.info("Fetching live matches...")
         
         # In produzione userebbe API come Sofascore o simili
@@ -0,0 +1,256 @@
+"""
+Collegamento mercati Betfair -> partite SofaScore (tabella matches)
+
+I mercati MATCH_ODDS non hanno alcun riferimento agli eventi SofaScore
+caricati dall'ETL. Il matcher confronta ogni mercato solo con le partite
+dello stesso blocco (fascia oraria di inizio e genere), valuta i candidati
+con l'identità dei giocatori risolta da PlayerResolver e salva il
+collegamento in betfair_event_map. Ad ogni refresh vengono elaborati solo
+i mercati nuovi; quelli senza corrispondenza sono ritentati dopo
+retry_interval secondi (l'ETL potrebbe aver aggiunto la partita).
+"""
+import logging
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from services.player_resolver import NameKey, PlayerResolver, score_names
+
+logger = logging.getLogger(__name__)
+
+# Tolleranza sull'orario di inizio (Betfair e SofaScore differiscono spesso
+# di qualche minuto, e i match "a seguire" slittano anche di ore)
+WINDOW_MINUTES = 180
+MIN_SCORE = 0.8
+MIN_MARGIN = 0.05
+RETRY_INTERVAL = 600
+
+
+def parse_utc(value: Any) -> Optional[datetime]:
+    """ISO 8601 (anche con 'Z' o offset) -> datetime UTC naive"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def gender_from_competition(name: str) -> Optional[str]:
+    """Genere dal nome della competizione Betfair (None se non deducibile)"""
+    lowered = (name or '').lower()
+    if 'wta' in lowered or 'women' in lowered or 'ladies' in lowered or 'itf w' in lowered:
+        return 'F'
+    if 'atp' in lowered or 'men' in lowered or 'challenger' in lowered or 'itf m' in lowered:
+        return 'M'
+    return None
+
+
+class _LocalMatch:
+    __slots__ = ('id', 'player1_id', 'player2_id', 'start', 'gender')
+
+    def __init__(self, match_id: int, player1_id: int, player2_id: int, start: datetime, gender: Optional[str]):
+        self.id = match_id
+        self.player1_id = player1_id
+        self.player2_id = player2_id
+        self.start = start
+        self.gender = gender
+
+
+class EventMatcher:
+    """
+    Mappa incrementale marketId Betfair -> matches.id
+
+    Uso:
+        matcher = EventMatcher("data/tennis.db")
+        odds = client.get_tennis_odds_realtime()
+        matcher.join(odds)   # aggiunge 'match_id' (None se non collegato)
+    """
+
+    def __init__(self, db_path: str = "data/tennis.db", resolver: Optional[PlayerResolver] = None,
+                 window_minutes: int = WINDOW_MINUTES, min_score: float = MIN_SCORE,
+                 retry_interval: float = RETRY_INTERVAL):
+        self.db_path = db_path
+        self.resolver = resolver or PlayerResolver(db_path)
+        self.window = timedelta(minutes=window_minutes)
+        self.min_score = min_score
+        self.retry_interval = retry_interval
+
+        self.init_database()
+        self.mapping: Dict[str, int] = self._load_mapping()
+        self._unmatched: Dict[str, float] = {}
+        self.stats: Dict[str, int] = {'matched': 0, 'unmatched': 0, 'ambiguous': 0, 'candidates': 0}
+
+    def _conn(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        conn = self._conn()
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS betfair_event_map (
+            market_id TEXT PRIMARY KEY,
+            betfair_event_id TEXT,
+            match_id INTEGER NOT NULL,
+            score REAL,
+            swapped INTEGER DEFAULT 0,
+            matched_at TEXT,
+            FOREIGN KEY (match_id) REFERENCES matches (id)
+        )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_betfair_map_match ON betfair_event_map(match_id)")
+        conn.commit()
+        conn.close()
+
+    def _load_mapping(self) -> Dict[str, int]:
+        conn = self._conn()
+        rows = conn.execute("SELECT market_id, match_id FROM betfair_event_map").fetchall()
+        conn.close()
+        return dict(rows)
+
+    # === Blocking ===
+
+    def _load_block(self, starts: List[datetime]) -> Dict[Tuple[int, Optional[str]], List[_LocalMatch]]:
+        """Partite locali nell'intervallo dei mercati, indicizzate per (fascia, genere)"""
+        lo = (min(starts) - self.window).isoformat()
+        hi = (max(starts) + self.window).isoformat()
+        conn = self._conn()
+        rows = conn.execute("""
+            SELECT m.id, m.player1_id, m.player2_id, m.match_time, p1.gender
+            FROM matches m
+            LEFT JOIN players p1 ON p1.id = m.player1_id
+            WHERE m.match_time BETWEEN ? AND ?
+        """, (lo, hi)).fetchall()
+        conn.close()
+
+        blocks: Dict[Tuple[int, Optional[str]], List[_LocalMatch]] = defaultdict(list)
+        for match_id, p1, p2, match_time, gender in rows:
+            start = parse_utc(match_time)
+            if start is not None:
+                blocks[(self._bucket(start), gender)].append(_LocalMatch(match_id, p1, p2, start, gender))
+        return blocks
+
+    def _bucket(self, start: datetime) -> int:
+        return int(start.timestamp() // self.window.total_seconds())
+
+    def _candidates(self, blocks, start: datetime, gender: Optional[str]) -> List[_LocalMatch]:
+        bucket = self._bucket(start)
+        genders = [gender, None] if gender else {g for _, g in blocks}
+        return [
+            m
+            for b in (bucket - 1, bucket, bucket + 1)
+            for g in genders
+            for m in blocks.get((b, g), ())
+            if abs(m.start - start) <= self.window
+        ]
+
+    # === Scoring ===
+
+    def _runner_score(self, name: str, runner_id: Optional[int], player_id: int) -> float:
+        if runner_id is not None:
+            return 1.0 if runner_id == player_id else 0.0
+        key = self.resolver.keys.get(player_id)
+        return score_names(NameKey(name), key) if key is not None else 0.0
+
+    def _score(self, names: List[str], ids: List[Optional[int]], start: datetime,
+               match: _LocalMatch) -> Tuple[float, bool]:
+        """Punteggio (0-1) del candidato e se l'ordine dei giocatori è invertito"""
+        straight = (self._runner_score(names[0], ids[0], match.player1_id)
+                    + self._runner_score(names[1], ids[1], match.player2_id)) / 2
+        swapped = (self._runner_score(names[0], ids[0], match.player2_id)
+                   + self._runner_score(names[1], ids[1], match.player1_id)) / 2
+        # Leggera preferenza per l'orario più vicino a parità di giocatori
+        proximity = 1.0 - 0.05 * abs((match.start - start).total_seconds()) / self.window.total_seconds()
+        if swapped > straight:
+            return swapped * proximity, True
+        return straight * proximity, False
+
+    # === Matching ===
+
+    def match_markets(self, markets: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Collega i mercati non ancora mappati
+
+        Args:
+            markets: dict con market_id, market_start_time, competition,
+                event_id (opzionale) e runners [{runner_name}] (formato di
+                get_tennis_odds_realtime)
+
+        Returns:
+            {market_id: match_id} per i mercati indicati già o appena collegati
+        """
+        markets = list(markets)
+        now = time.time()
+        pending = []
+        for market in markets:
+            market_id = market['market_id']
+            if market_id in self.mapping or now - self._unmatched.get(market_id, -self.retry_interval) < self.retry_interval:
+                continue
+            start = parse_utc(market.get('market_start_time'))
+            runners = [r.get('runner_name', '') for r in market.get('runners', [])]
+            if start is None or len(runners) != 2:
+                self._unmatched[market_id] = now
+                continue
+            pending.append((market, start, runners))
+
+        if pending:
+            self._match_pending(pending, now)
+        return {m['market_id']: self.mapping[m['market_id']] for m in markets if m['market_id'] in self.mapping}
+
+    def _match_pending(self, pending: List[Tuple[Dict[str, Any], datetime, List[str]]], now: float):
+        blocks = self._load_block([start for _, start, _ in pending])
+        # Giocatori inseriti dall'ETL dopo la costruzione dell'indice
+        if any(m.player1_id not in self.resolver.keys or m.player2_id not in self.resolver.keys
+               for block in blocks.values() for m in block):
+            self.resolver.load()
+        rows = []
+
+        for market, start, names in pending:
+            gender = gender_from_competition(market.get('competition', ''))
+            ids = self.resolver.resolve_many(names, gender=gender, source='betfair')
+            candidates = self._candidates(blocks, start, gender)
+            self.stats['candidates'] += len(candidates)
+
+            scored = sorted((self._score(names, ids, start, m) + (m.id,) for m in candidates), reverse=True)
+            if not scored or scored[0][0] < self.min_score:
+                self.stats['unmatched'] += 1
+                self._unmatched[market['market_id']] = now
+                continue
+            if len(scored) > 1 and scored[0][0] - scored[1][0] < MIN_MARGIN:
+                self.stats['ambiguous'] += 1
+                self._unmatched[market['market_id']] = now
+                continue
+
+            score, swapped, match_id = scored[0]
+            self.mapping[market['market_id']] = match_id
+            self._unmatched.pop(market['market_id'], None)
+            self.stats['matched'] += 1
+            rows.append((market['market_id'], market.get('event_id'), match_id, round(score, 4),
+                         int(swapped), datetime.now().isoformat()))
+
+        if rows:
+            conn = self._conn()
+            conn.executemany("""
+            INSERT INTO betfair_event_map (market_id, betfair_event_id, match_id, score, swapped, matched_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(market_id) DO UPDATE SET
+                match_id = excluded.match_id, score = excluded.score,
+                swapped = excluded.swapped, matched_at = excluded.matched_at
+            """, rows)
+            conn.commit()
+            conn.close()
+        logger.debug(f"Matching Betfair: {len(rows)}/{len(pending)} nuovi mercati collegati")
+
+    def join(self, markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Aggiunge match_id (o None) a ogni mercato, elaborando solo quelli nuovi (in place)"""
+        mapping = self.match_markets(markets)
+        for market in markets:
+            market['match_id'] = mapping.get(market['market_id'])
+        return markets
@@ -0,0 +1,194 @@
+"""
+Cache HTTP su disco per gli endpoint SofaScore
+
+Le risposte JSON sono salvate in SQLite per URL, con TTL per endpoint.
+Scaduto il TTL la risposta viene rivalidata con If-None-Match /
+If-Modified-Since (un 304 rinnova la voce senza riscaricare il payload),
+usando solo i validatori forniti dal server: senza ETag né Last-Modified
+la risposta viene riscaricata per intero.
+I 404 sono memorizzati come voci negative: i percorsi di fallback che non
+esistono per un evento non vengono più interrogati fino a scadenza.
+"""
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from services import json_codec
+
+logger = logging.getLogger(__name__)
+
+# TTL (secondi) per endpoint: primo pattern che corrisponde al percorso
+ENDPOINT_TTLS: List[Tuple[str, int]] = [
+    (r'/scheduled-events/', 300),
+    (r'/event/\d+/odds/', 120),
+]
+DEFAULT_TTL = 60
+
+# Durata delle voci negative (404) per endpoint: le quote di un evento
+# possono aprire dopo il run mattutino, quindi il 404 scade presto
+NEGATIVE_ENDPOINT_TTLS: List[Tuple[str, int]] = [
+    (r'/event/\d+/odds/', 15 * 60),
+]
+# Durata dei 404 stabili (endpoint senza regola specifica)
+NEGATIVE_TTL = 6 * 3600
+
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+class HttpCache:
+    """Cache HTTP persistente con rivalidazione condizionale"""
+
+    def __init__(self, db_path: str = "data/http_cache.db",
+                 endpoint_ttls: Optional[List[Tuple[str, int]]] = None,
+                 negative_ttl: int = NEGATIVE_TTL,
+                 negative_endpoint_ttls: Optional[List[Tuple[str, int]]] = None):
+        self.db_path = db_path
+        self.endpoint_ttls = [(re.compile(p), ttl) for p, ttl in (endpoint_ttls or ENDPOINT_TTLS)]
+        self.negative_ttl = negative_ttl
+        self.negative_endpoint_ttls = [(re.compile(p), ttl)
+                                       for p, ttl in (negative_endpoint_ttls or NEGATIVE_ENDPOINT_TTLS)]
+        self.stats: Dict[str, int] = {'hits': 0, 'negative_hits': 0, 'revalidated': 0, 'misses': 0, 'not_found': 0}
+        # La cache è usata anche dal pool di thread del backfill
+        self._stats_lock = threading.Lock()
+        self.init_database()
+
+    def _conn(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def init_database(self):
+        conn = self._conn()
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            status INTEGER,
+            etag TEXT,
+            last_modified TEXT,
+            body BLOB,
+            fetched_at REAL,
+            expires_at REAL
+        )
+        """)
+        conn.commit()
+        conn.close()
+
+    def _ttl(self, url: str, response: Optional[requests.Response] = None) -> int:
+        for pattern, ttl in self.endpoint_ttls:
+            if pattern.search(url):
+                return ttl
+        if response is not None:
+            match = _MAX_AGE.search(response.headers.get('Cache-Control', ''))
+            if match:
+                return int(match.group(1))
+        return DEFAULT_TTL
+
+    def _negative_ttl(self, url: str) -> int:
+        for pattern, ttl in self.negative_endpoint_ttls:
+            if pattern.search(url):
+                return ttl
+        return self.negative_ttl
+
+    def _lookup(self, url: str) -> Optional[Tuple[int, Optional[str], Optional[str], Optional[bytes], float]]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT status, etag, last_modified, body, expires_at FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+        conn.close()
+        return row
+
+    def _store(self, url: str, status: int, etag: Optional[str], last_modified: Optional[str],
+               body: Optional[bytes], ttl: int):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("""
+        INSERT INTO http_cache (url, status, etag, last_modified, body, fetched_at, expires_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            status = excluded.status, etag = excluded.etag, last_modified = excluded.last_modified,
+            body = excluded.body, fetched_at = excluded.fetched_at, expires_at = excluded.expires_at
+        """, (url, status, etag, last_modified, body, now, now + ttl))
+        conn.commit()
+        conn.close()
+
+    def _touch(self, url: str, ttl: int):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("UPDATE http_cache SET fetched_at = ?, expires_at = ? WHERE url = ?", (now, now + ttl, url))
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _not_found(url: str) -> requests.HTTPError:
+        response = requests.Response()
+        response.status_code = 404
+        response.url = url
+        return requests.HTTPError(f"HTTP 404 (cache): {url}", response=response)
+
+    def get_json(self, url: str, fetch: Callable[[Dict[str, str]], requests.Response]) -> Any:
+        """
+        Restituisce il JSON dell'URL dalla cache o tramite `fetch`
+
+        Args:
+            url: chiave della cache (URL completo di query)
+            fetch: funzione che esegue la GET con gli header condizionali indicati
+
+        Raises:
+            requests.HTTPError per 404 (anche da cache negativa) e altri errori HTTP
+        """
+        cached = self._lookup(url)
+        now = time.time()
+
+        if cached is not None:
+            status, _, _, body, expires_at = cached
+            if now < expires_at:
+                if status == 404:
+                    self._count('negative_hits')
+                    raise self._not_found(url)
+                self._count('hits')
+                return json_codec.loads(body)
+
+        conditional: Dict[str, str] = {}
+        if cached is not None and cached[0] == 200:
+            if cached[1]:
+                conditional['If-None-Match'] = cached[1]
+            if cached[2]:
+                conditional['If-Modified-Since'] = cached[2]
+
+        response = fetch(conditional)
+
+        if response.status_code == 304 and cached is not None:
+            self._count('revalidated')
+            self._touch(url, self._ttl(url, response))
+            return json_codec.loads(cached[3])
+
+        if response.status_code == 200:
+            self._count('misses')
+            data = json_codec.loads(response.content)
+            # Solo validatori del server: una data dell'orologio locale
+            # potrebbe produrre 304 errati e servire quote vecchie
+            self._store(url, 200, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                        response.content, self._ttl(url, response))
+            return data
+
+        if response.status_code == 404:
+            self._count('not_found')
+            self._store(url, 404, None, None, None, self._negative_ttl(url))
+            raise self._not_found(url)
+
+        raise requests.HTTPError(f"HTTP {response.status_code}: {response.text[:160]}", response=response)
+
+    def purge_expired(self, older_than: float = 7 * 86400) -> int:
+        """Elimina le voci scadute da più di `older_than` secondi"""
+        conn = self._conn()
+        cur = conn.execute("DELETE FROM http_cache WHERE expires_at < ?", (time.time() - older_than,))
+        conn.commit()
+        conn.close()
+        return cur.rowcount
@@ -0,0 +1,334 @@
+"""
+Registrazione e riproduzione delle chiamate HTTP (cassette)
+
+Cattura gli scambi reali con SofaScore e Betfair (JSON-RPC) in cassette
+JSONL compresse con gzip e li riproduce offline, con latenza ed errori
+simulati configurabili. Si aggancia a `requests.Session.get_adapter`, quindi
+copre sia `requests.get/post` sia le sessioni create dai client senza
+modificarne il codice. In riproduzione la politica urllib3 Retry
+dell'adapter montato sulla sessione (es. quella di http_transport) resta
+attiva: gli errori simulati passano dagli stessi retry del traffico reale.
+
+Esempio:
+    with use_cassette('data/cassettes/etl.jsonl.gz', mode='replay', latency=0.05):
+        run_etl_today(db_path=tmp_db)
+"""
+import base64
+import gzip
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from urllib3.response import HTTPResponse
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ('record', 'replay', 'auto')
+
+# Campi sensibili sostituiti nelle risposte registrate (es. login Betfair)
+REDACTED_FIELDS = ('token', 'sessionToken')
+REDACTED_VALUE = 'REDACTED'
+
+# Parametri JSON-RPC esclusi dalla chiave: finestre temporali calcolate
+# su datetime.now() che cambierebbero a ogni esecuzione
+IGNORED_RPC_PARAMS = ('marketStartTime',)
+
+# Header di risposta conservati nella cassetta
+_KEPT_RESPONSE_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+
+def _json_body(body: Union[bytes, str, None]) -> Optional[Any]:
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except (TypeError, ValueError):
+        return None
+
+
+def _strip_params(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_params(v) for k, v in value.items() if k not in IGNORED_RPC_PARAMS}
+    if isinstance(value, list):
+        return [_strip_params(v) for v in value]
+    return value
+
+
+def request_key(method: str, url: str, body: Union[bytes, str, None] = None) -> str:
+    """
+    Chiave di abbinamento richiesta -> registrazione
+
+    Metodo + URL senza query + parametri di query ordinati; per le chiamate
+    JSON-RPC anche metodo e parametri del payload (id e IGNORED_RPC_PARAMS
+    vengono ignorati).
+    Il corpo delle altre richieste (es. credenziali di login) non entra
+    nella chiave e non viene salvato.
+    """
+    parts = urlsplit(url)
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    key: Dict[str, Any] = {
+        'method': method.upper(),
+        'url': urlunsplit((parts.scheme, parts.netloc, parts.path, '', '')),
+        'query': query,
+    }
+    payload = _json_body(body)
+    if isinstance(payload, dict) and 'jsonrpc' in payload:
+        key['rpc'] = [payload.get('method'), _strip_params(payload.get('params'))]
+    return json.dumps(key, sort_keys=True, separators=(',', ':'))
+
+
+def _redact(body: bytes) -> bytes:
+    payload = _json_body(body)
+    if not isinstance(payload, dict) or not any(f in payload for f in REDACTED_FIELDS):
+        return body
+    for field in REDACTED_FIELDS:
+        if field in payload:
+            payload[field] = REDACTED_VALUE
+    return json.dumps(payload).encode('utf-8')
+
+
+class Cassette:
+    """Raccolta di interazioni registrate, indicizzate per chiave di richiesta"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions: List[Dict[str, Any]] = []
+        self._queues: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> 'Cassette':
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    self.add(json.loads(line))
+        logger.info(f"Cassetta {self.path}: {len(self.interactions)} interazioni caricate")
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.path)
+        logger.info(f"Cassetta {self.path}: {len(self.interactions)} interazioni salvate")
+
+    def add(self, interaction: Dict[str, Any]):
+        self.interactions.append(interaction)
+        self._queues[interaction['key']].append(interaction)
+
+    def record(self, key: str, response: requests.Response, elapsed: float):
+        headers = {h: response.headers[h] for h in _KEPT_RESPONSE_HEADERS if h in response.headers}
+        interaction = {
+            'key': key,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': headers,
+            'body': base64.b64encode(_redact(response.content)).decode('ascii'),
+            'elapsed': round(elapsed, 6),
+        }
+        with self._lock:
+            self.add(interaction)
+
+    def next_for(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Prossima registrazione per la chiave: le richieste ripetute vengono
+        servite nell'ordine di registrazione, poi si ripete l'ultima
+        """
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            return self._last.get(key)
+
+
+def _build_response(request: requests.PreparedRequest, interaction: Dict[str, Any]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = interaction['status']
+    response.reason = interaction.get('reason') or ''
+    response.headers = CaseInsensitiveDict(interaction.get('headers') or {})
+    response._content = base64.b64decode(interaction['body'])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class RecordingAdapter(BaseAdapter):
+    """Inoltra le richieste all'adapter reale e registra le risposte"""
+
+    def __init__(self, wrapped: BaseAdapter, cassette: Cassette):
+        super().__init__()
+        self.wrapped = wrapped
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = self.wrapped.send(request, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.cassette.record(request_key(request.method, request.url, request.body), response, elapsed)
+        return response
+
+    def close(self):
+        self.wrapped.close()
+
+
+class SimulatedConnectionError(requests.exceptions.ConnectionError):
+    """Errore di connessione iniettato dal ReplayAdapter"""
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Serve le risposte dalla cassetta senza accesso alla rete
+
+    Args:
+        latency: secondi di attesa per richiesta; una tupla (min, max) estrae
+            un valore uniforme, 'recorded' usa la latenza registrata
+        error_rate: probabilità di iniettare un errore per richiesta
+        error_status: status HTTP dell'errore iniettato (None = errore di connessione)
+    """
+
+    def __init__(self, cassette: Cassette, latency: Union[float, Tuple[float, float], str] = 0.0,
+                 error_rate: float = 0.0, error_status: Optional[int] = 503, seed: Optional[int] = None):
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _delay(self, interaction: Dict[str, Any]) -> float:
+        if self.latency == 'recorded':
+            return interaction.get('elapsed', 0.0)
+        if isinstance(self.latency, tuple):
+            with self._rng_lock:
+                return self._rng.uniform(*self.latency)
+        return float(self.latency or 0.0)
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, request.body)
+        interaction = self.cassette.next_for(key)
+        if interaction is None:
+            raise requests.exceptions.ConnectionError(
+                f"Nessuna registrazione per {request.method} {request.url}", request=request)
+
+        delay = self._delay(interaction)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._rng_lock:
+            inject_error = self.error_rate > 0 and self._rng.random() < self.error_rate
+        if inject_error:
+            if self.error_status is None:
+                raise SimulatedConnectionError("Errore di rete simulato", request=request)
+            interaction = {'status': self.error_status, 'reason': 'Simulated error',
+                           'headers': {'Content-Type': 'text/plain'},
+                           'body': base64.b64encode(b'simulated error').decode('ascii')}
+
+        return _build_response(request, interaction)
+
+    def close(self):
+        pass
+
+
+class RetryingReplayAdapter(BaseAdapter):
+    """
+    Applica alla riproduzione la politica Retry dell'adapter reale
+
+    Come HTTPAdapter con urllib3: gli status in status_forcelist e gli
+    errori di connessione simulati vengono ritentati (con backoff e
+    Retry-After) finché la politica lo consente. Le richieste senza
+    registrazione non vengono ritentate.
+    """
+
+    def __init__(self, replay: ReplayAdapter, max_retries: Optional[Retry]):
+        super().__init__()
+        self.replay = replay
+        # Stesso default di requests per gli adapter senza politica di retry
+        self.max_retries = max_retries if isinstance(max_retries, Retry) else Retry(0, read=False)
+
+    def send(self, request, **kwargs):
+        retries = self.max_retries
+        while True:
+            try:
+                response = self.replay.send(request, **kwargs)
+            except SimulatedConnectionError as e:
+                try:
+                    retries = retries.increment(request.method, request.url,
+                                                error=NewConnectionError(None, str(e)))
+                except (MaxRetryError, NewConnectionError):
+                    raise e
+                retries.sleep()
+                continue
+
+            has_retry_after = 'Retry-After' in response.headers
+            if not retries.is_retry(request.method, response.status_code, has_retry_after):
+                return response
+            raw = HTTPResponse(body=b'', headers=dict(response.headers), status=response.status_code,
+                               preload_content=False)
+            try:
+                retries = retries.increment(request.method, request.url, response=raw)
+            except MaxRetryError:
+                if retries.raise_on_status:
+                    raise requests.exceptions.RetryError(
+                        f"Retry esauriti per {request.method} {request.url}", request=request)
+                return response
+            retries.sleep(raw)
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def use_cassette(path: str, mode: str = 'auto', latency: Union[float, Tuple[float, float], str] = 0.0,
+                 error_rate: float = 0.0, error_status: Optional[int] = 503,
+                 seed: Optional[int] = None) -> Iterator[Cassette]:
+    """
+    Attiva registrazione o riproduzione per tutte le sessioni requests
+
+    Args:
+        path: file cassetta (.jsonl.gz)
+        mode: 'record' (rete reale, sovrascrive la cassetta), 'replay'
+            (solo cassetta) o 'auto' (replay se la cassetta esiste)
+    """
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Modalità cassetta non valida: {mode}")
+
+    cassette = Cassette(path)
+    replaying = mode == 'replay' or (mode == 'auto' and cassette.exists())
+    if replaying:
+        cassette.load()
+        replay_adapter = ReplayAdapter(cassette, latency, error_rate, error_status, seed)
+
+    original_get_adapter = requests.Session.get_adapter
+
+    def get_adapter(session, url):
+        if replaying:
+            return RetryingReplayAdapter(replay_adapter,
+                                         getattr(original_get_adapter(session, url), 'max_retries', None))
+        return RecordingAdapter(original_get_adapter(session, url), cassette)
+
+    requests.Session.get_adapter = get_adapter
+    try:
+        yield cassette
+    finally:
+        requests.Session.get_adapter = original_get_adapter
+        if not replaying:
+            cassette.save()
@@ -0,0 +1,152 @@
+"""
+Trasporto HTTP condiviso per tutti i fetcher
+
+Una requests.Session per host, con pool keep-alive dimensionati, retry
+urllib3 guidati da NETWORK_CONFIG e timeout di default. Le richieste GET
+vengono ritentate anche sugli status in retry_status_codes (rispettando
+Retry-After); per le POST (login, JSON-RPC, placeOrders) si ritentano solo
+gli errori di connessione, perché il server non ha ancora ricevuto nulla.
+Ogni risposta alimenta le metriche di latenza per host.
+"""
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+from urllib.parse import urlsplit
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.betfair_it import NETWORK_CONFIG
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = (NETWORK_CONFIG['connect_timeout'], NETWORK_CONFIG['read_timeout'])
+
+
+class _HostMetrics:
+    """Latenze e contatori di un host"""
+
+    __slots__ = ('requests', 'errors', 'samples')
+
+    def __init__(self, window: int):
+        self.requests = 0
+        self.errors = 0
+        self.samples: Deque[float] = deque(maxlen=window)
+
+
+_sessions: Dict[str, requests.Session] = {}
+_metrics: Dict[str, _HostMetrics] = {}
+_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter con timeout di default quando il chiamante non lo specifica"""
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def build_retry() -> Retry:
+    """Politica di retry urllib3 da NETWORK_CONFIG"""
+    return Retry(
+        total=NETWORK_CONFIG['max_retries'],
+        connect=NETWORK_CONFIG['max_retries'],
+        read=NETWORK_CONFIG['max_retries'],
+        status=NETWORK_CONFIG['max_retries'],
+        backoff_factor=NETWORK_CONFIG['backoff_factor'],
+        status_forcelist=NETWORK_CONFIG['retry_status_codes'],
+        # Read/status solo per metodi idempotenti: una POST non viene reinviata
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def _host_key(url_or_host: str) -> str:
+    parts = urlsplit(url_or_host if '://' in url_or_host else f'https://{url_or_host}')
+    return parts.netloc.lower()
+
+
+def _record_response(response: requests.Response, *args, **kwargs):
+    host = _host_key(response.url or '')
+    with _lock:
+        metrics = _metrics.get(host)
+        if metrics is None:
+            metrics = _metrics[host] = _HostMetrics(NETWORK_CONFIG['latency_window'])
+        metrics.requests += 1
+        if response.status_code >= 400:
+            metrics.errors += 1
+        metrics.samples.append(response.elapsed.total_seconds() * 1000)
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=NETWORK_CONFIG['pool_connections'],
+        pool_maxsize=NETWORK_CONFIG['pool_maxsize'],
+        max_retries=build_retry()
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.hooks['response'].append(_record_response)
+    return session
+
+
+def session_for(url_or_host: str) -> requests.Session:
+    """Sessione condivisa (thread-safe) per l'host dell'URL"""
+    host = _host_key(url_or_host)
+    session = _sessions.get(host)
+    if session is None:
+        with _lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = _sessions[host] = _new_session()
+    return session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return session_for(url).get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return session_for(url).post(url, **kwargs)
+
+
+def host_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metriche per host: richieste, errori (status >= 400) e latenze in ms"""
+    with _lock:
+        snapshot = {host: (m.requests, m.errors, np.array(m.samples)) for host, m in _metrics.items()}
+
+    result = {}
+    for host, (count, errors, samples) in snapshot.items():
+        result[host] = {
+            'requests': count,
+            'errors': errors,
+            'mean_ms': float(samples.mean()) if samples.size else None,
+            'p50_ms': float(np.percentile(samples, 50)) if samples.size else None,
+            'p95_ms': float(np.percentile(samples, 95)) if samples.size else None,
+            'max_ms': float(samples.max()) if samples.size else None,
+        }
+    return result
+
+
+def reset_metrics():
+    with _lock:
+        _metrics.clear()
+
+
+def close_all():
+    """Chiude tutte le sessioni (es. a fine processo o nei benchmark)"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,194 @@
+"""
+Decodifica JSON veloce per i payload SofaScore e Betfair
+
+Usa orjson o msgspec quando installati, con fallback sulla libreria standard.
+Per listMarketBook sono disponibili strutture tipizzate (MarketBook, Runner,
+PriceSize): con msgspec il payload viene decodificato direttamente in Struct
+compatte, senza passare da dizionari annidati.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+if orjson is not None:
+    JSON_BACKEND = 'orjson'
+elif msgspec is not None:
+    JSON_BACKEND = 'msgspec'
+else:
+    JSON_BACKEND = 'json'
+
+_msgspec_decoder = msgspec.json.Decoder() if msgspec is not None else None
+_msgspec_encoder = msgspec.json.Encoder() if msgspec is not None else None
+_msgspec_sorted_encoder = msgspec.json.Encoder(order='sorted') if msgspec is not None else None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decodifica JSON generico con il backend più veloce disponibile"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if _msgspec_decoder is not None:
+        return _msgspec_decoder.decode(data.encode('utf-8') if isinstance(data, str) else data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Codifica JSON in bytes con il backend più veloce disponibile
+
+    Args:
+        sort_keys: chiavi ordinate (output canonico, es. per hash)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS) if sort_keys else orjson.dumps(obj)
+    if _msgspec_encoder is not None:
+        return (_msgspec_sorted_encoder if sort_keys else _msgspec_encoder).encode(obj)
+    return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys).encode('utf-8')
+
+
+# === Schemi Betfair listMarketBook ===
+
+if msgspec is not None:
+
+    class PriceSize(msgspec.Struct, frozen=True):
+        """Livello di prezzo della ladder"""
+        price: float
+        size: float
+
+    class ExchangePrices(msgspec.Struct):
+        """Prezzi disponibili e volumi scambiati di un runner"""
+        availableToBack: List[PriceSize] = []
+        availableToLay: List[PriceSize] = []
+        tradedVolume: List[PriceSize] = []
+
+    class Runner(msgspec.Struct):
+        """Runner di un MarketBook"""
+        selectionId: int
+        handicap: float = 0.0
+        status: str = ''
+        lastPriceTraded: Optional[float] = None
+        totalMatched: Optional[float] = None
+        ex: Optional[ExchangePrices] = None
+
+    class MarketBook(msgspec.Struct):
+        """MarketBook Betfair (i campi non elencati vengono ignorati)"""
+        marketId: str
+        status: str = ''
+        inplay: bool = False
+        totalMatched: Optional[float] = None
+        totalAvailable: Optional[float] = None
+        runners: List[Runner] = []
+
+    class _MarketBookRpcResponse(msgspec.Struct):
+        result: List[MarketBook] = []
+        error: Optional[Dict[str, Any]] = None
+
+    _market_book_decoder = msgspec.json.Decoder(_MarketBookRpcResponse)
+
+else:
+
+    class PriceSize:
+        """Livello di prezzo della ladder"""
+        __slots__ = ('price', 'size')
+
+        def __init__(self, price: float, size: float):
+            self.price = price
+            self.size = size
+
+    class ExchangePrices:
+        """Prezzi disponibili e volumi scambiati di un runner"""
+        __slots__ = ('availableToBack', 'availableToLay', 'tradedVolume')
+
+        def __init__(self, availableToBack=None, availableToLay=None, tradedVolume=None):
+            self.availableToBack = availableToBack or []
+            self.availableToLay = availableToLay or []
+            self.tradedVolume = tradedVolume or []
+
+    class Runner:
+        """Runner di un MarketBook"""
+        __slots__ = ('selectionId', 'handicap', 'status', 'lastPriceTraded', 'totalMatched', 'ex')
+
+        def __init__(self, selectionId: int, handicap: float = 0.0, status: str = '',
+                     lastPriceTraded: Optional[float] = None, totalMatched: Optional[float] = None,
+                     ex: Optional[ExchangePrices] = None):
+            self.selectionId = selectionId
+            self.handicap = handicap
+            self.status = status
+            self.lastPriceTraded = lastPriceTraded
+            self.totalMatched = totalMatched
+            self.ex = ex
+
+    class MarketBook:
+        """MarketBook Betfair (i campi non elencati vengono ignorati)"""
+        __slots__ = ('marketId', 'status', 'inplay', 'totalMatched', 'totalAvailable', 'runners')
+
+        def __init__(self, marketId: str, status: str = '', inplay: bool = False,
+                     totalMatched: Optional[float] = None, totalAvailable: Optional[float] = None,
+                     runners: Optional[List[Runner]] = None):
+            self.marketId = marketId
+            self.status = status
+            self.inplay = inplay
+            self.totalMatched = totalMatched
+            self.totalAvailable = totalAvailable
+            self.runners = runners or []
+
+    def _ladder(levels: Optional[List[Dict[str, Any]]]) -> List[PriceSize]:
+        return [PriceSize(level['price'], level['size']) for level in levels or []]
+
+    def _market_book_from_dict(data: Dict[str, Any]) -> MarketBook:
+        runners = []
+        for runner in data.get('runners') or []:
+            ex = runner.get('ex')
+            runners.append(Runner(
+                selectionId=runner['selectionId'],
+                handicap=runner.get('handicap', 0.0),
+                status=runner.get('status', ''),
+                lastPriceTraded=runner.get('lastPriceTraded'),
+                totalMatched=runner.get('totalMatched'),
+                ex=ExchangePrices(
+                    _ladder(ex.get('availableToBack')),
+                    _ladder(ex.get('availableToLay')),
+                    _ladder(ex.get('tradedVolume'))
+                ) if ex is not None else None
+            ))
+        return MarketBook(
+            marketId=data['marketId'],
+            status=data.get('status', ''),
+            inplay=data.get('inplay', False),
+            totalMatched=data.get('totalMatched'),
+            totalAvailable=data.get('totalAvailable'),
+            runners=runners
+        )
+
+
+def decode_market_book_response(data: Union[bytes, str]) -> Tuple[List['MarketBook'], Optional[Dict[str, Any]]]:
+    """
+    Decodifica una risposta JSON-RPC listMarketBook
+
+    Returns:
+        (lista di MarketBook, errore JSON-RPC o None)
+    """
+    if msgspec is not None:
+        response = _market_book_decoder.decode(data)
+        return response.result, response.error
+
+    response = loads(data)
+    if 'error' in response:
+        return [], response['error']
+    return [_market_book_from_dict(book) for book in response.get('result') or []], None
+
+
+def price_sizes_to_dicts(levels: List['PriceSize']) -> List[Dict[str, float]]:
+    """Converte una ladder tipizzata nel formato dizionario usato dall'app"""
+    return [{'price': level.price, 'size': level.size} for level in levels]
@@ -0,0 +1,100 @@
+"""
+Snapshot di processo delle partite live
+
+Un solo fetch per intervallo (ttl) viene condiviso da tutte le sessioni
+Streamlit: le pagine leggono lo snapshot in memoria invece di interrogare
+la sorgente ad ogni rerun. Ogni partita ha una revisione che cambia solo
+quando cambiano i suoi dati, così l'interfaccia sa quali card aggiornare.
+"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from services import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Età massima dello snapshot prima di un nuovo fetch (secondi)
+SNAPSHOT_TTL = 5.0
+
+
+class SnapshotView(NamedTuple):
+    version: int
+    fetched_at: float
+    matches: Dict[str, Dict[str, Any]]
+    revs: Dict[str, int]
+
+
+class LiveSnapshot:
+    """
+    Snapshot condiviso delle partite live con revisione per partita
+
+    Uso:
+        snapshot = LiveSnapshot(fetcher.get_live_matches)
+        view = snapshot.get()       # fetch al più ogni ttl secondi
+        view.revs[match_id]         # cambia solo se cambiano i dati della partita
+    """
+
+    def __init__(self, fetch: Callable[[], List[Dict[str, Any]]], ttl: float = SNAPSHOT_TTL,
+                 key: str = 'match_id'):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.key = key
+
+        self._view = SnapshotView(0, 0.0, {}, {})
+        self._digests: Dict[str, bytes] = {}
+        self._fetch_lock = threading.Lock()
+        self.stats: Dict[str, int] = {'fetches': 0, 'errors': 0, 'changed': 0}
+
+    def get(self, force: bool = False) -> SnapshotView:
+        """Snapshot corrente, aggiornato se più vecchio di ttl (o se force)"""
+        if force or time.time() - self._view.fetched_at >= self.ttl:
+            # Un solo fetch alla volta: le altre sessioni usano lo snapshot precedente
+            if self._fetch_lock.acquire(blocking=not self._view.fetched_at):
+                try:
+                    if force or time.time() - self._view.fetched_at >= self.ttl:
+                        self._refresh()
+                finally:
+                    self._fetch_lock.release()
+        return self._view
+
+    def _refresh(self):
+        try:
+            rows = self.fetch()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Errore fetch partite live: {e}")
+            # Riprova al prossimo intervallo mantenendo i dati precedenti
+            self._view = self._view._replace(fetched_at=time.time())
+            return
+        self.stats['fetches'] += 1
+
+        old = self._view
+        version = old.version + 1
+        matches: Dict[str, Dict[str, Any]] = {}
+        revs: Dict[str, int] = {}
+        digests: Dict[str, bytes] = {}
+        changed = 0
+
+        for row in rows:
+            match_id = str(row[self.key])
+            digest = hashlib.blake2b(json_codec.dumps(row, sort_keys=True), digest_size=16).digest()
+            matches[match_id] = row
+            digests[match_id] = digest
+            if self._digests.get(match_id) == digest:
+                revs[match_id] = old.revs[match_id]
+            else:
+                # Revisione = versione in cui la partita è cambiata (sempre crescente)
+                revs[match_id] = version
+                changed += 1
+
+        if not changed and len(matches) == len(old.matches):
+            # Nessuna variazione: stessa versione, solo timestamp aggiornato
+            self._view = old._replace(fetched_at=time.time())
+            return
+
+        self.stats['changed'] += changed
+        self._digests = digests
+        self._view = SnapshotView(version, time.time(), matches, revs)
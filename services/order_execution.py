@@ -0,0 +1,304 @@
+"""
+Esecuzione ordini a bassa latenza per Betfair Italia
+
+Percorso dedicato al piazzamento in-play: connessione HTTP mantenuta calda,
+header di autenticazione serializzati una sola volta, template JSON
+pre-serializzati per mercato e token bucket al posto dello sleep fisso del
+client generico. Ogni fase (validazione, serializzazione, rate limit, rete,
+decodifica) è misurata con perf_counter_ns.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.betfair_it import BETFAIR_IT_ENDPOINTS, NETWORK_CONFIG, RATE_LIMITS, TENNIS_CONFIG
+from services import json_codec
+from services.betfair_client import validate_italian_orders
+from services.betfair_session import BetfairItalySession
+
+logger = logging.getLogger(__name__)
+
+# Fasi misurate per ogni ordine
+LATENCY_STAGES = ('validate', 'serialize', 'rate_limit', 'signal_to_wire', 'network', 'decode', 'total')
+
+
+class TokenBucket:
+    """Token bucket thread-safe: consente burst senza sleep fino a esaurimento"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Preleva un token, attendendo solo se il bucket è vuoto. Ritorna l'attesa in secondi"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class LatencyStats:
+    """Campioni di latenza per fase (ns) con finestra mobile"""
+
+    def __init__(self, window: int = 1000):
+        self._samples: Dict[str, Deque[int]] = {stage: deque(maxlen=window) for stage in LATENCY_STAGES}
+        self._lock = threading.Lock()
+
+    def add(self, timings: Dict[str, int]):
+        with self._lock:
+            for stage, ns in timings.items():
+                self._samples[stage].append(ns)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Percentili in millisecondi per ogni fase"""
+        with self._lock:
+            snapshot = {stage: np.fromiter(s, dtype=np.int64) for stage, s in self._samples.items() if s}
+        return {
+            stage: {
+                'count': int(values.size),
+                'p50_ms': float(np.percentile(values, 50)) / 1e6,
+                'p95_ms': float(np.percentile(values, 95)) / 1e6,
+                'p99_ms': float(np.percentile(values, 99)) / 1e6,
+                'max_ms': float(values.max()) / 1e6,
+            }
+            for stage, values in snapshot.items()
+        }
+
+
+class OrderTemplate:
+    """
+    Template placeOrders pre-serializzato per un mercato
+
+    Le parti fisse del payload JSON-RPC sono codificate una volta: al momento
+    dell'invio vengono inseriti solo selezione, lato, importo e quota.
+    """
+
+    __slots__ = ('market_id', 'selection_ids', '_prefix', '_suffix')
+
+    def __init__(self, market_id: str, selection_ids: Optional[List[int]] = None):
+        self.market_id = market_id
+        self.selection_ids = frozenset(int(s) for s in selection_ids) if selection_ids else None
+        self._prefix = (
+            b'{"jsonrpc":"2.0","method":"SportsAPING/v1.0/placeOrders","params":{"marketId":'
+            + json_codec.dumps(market_id) + b',"instructions":['
+        )
+        self._suffix = b'],"customerRef":"'
+
+    def render(self, selection_id: int, side: str, size: float, price: float, customer_ref: str) -> bytes:
+        instruction = (
+            b'{"selectionId":%d,"handicap":0,"side":"%s","orderType":"LIMIT",'
+            b'"limitOrder":{"size":%r,"price":%r,"persistenceType":"LAPSE"}}'
+            % (selection_id, side.encode('ascii'), float(size), float(price))
+        )
+        ref = customer_ref.encode('ascii')
+        return self._prefix + instruction + self._suffix + ref + b'"},"id":"' + ref + b'"}'
+
+
+class BetfairOrderExecutor:
+    """
+    Esecutore ordini a bassa latenza
+
+    Uso tipico:
+        executor = BetfairOrderExecutor(session)
+        executor.warm()
+        executor.prepare_market(market_id, [sel1, sel2])
+        report = executor.place(market_id, sel1, 'B', 5.0, 2.1)
+        executor.latency_summary()
+    """
+
+    def __init__(self, session: BetfairItalySession, keep_warm_interval: Optional[float] = None):
+        self.session = session
+        self.url = BETFAIR_IT_ENDPOINTS['betting_json_rpc']
+        self.timeout = (NETWORK_CONFIG['connect_timeout'], NETWORK_CONFIG['read_timeout'])
+        self.keep_warm_interval = keep_warm_interval or RATE_LIMITS['connection_idle_timeout'] / 2
+
+        # Sessione HTTP dedicata: nessun retry automatico (placeOrders non è idempotente)
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
+        self.bucket = TokenBucket(RATE_LIMITS['requests_per_second'], RATE_LIMITS['burst_requests'])
+        self.stats = LatencyStats()
+        self.templates: Dict[str, OrderTemplate] = {}
+
+        self._headers: Optional[Dict[str, str]] = None
+        self._headers_token: Optional[str] = None
+        self._keep_warm_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # === Preparazione ===
+
+    def _auth_headers(self) -> Dict[str, str]:
+        """Header di autenticazione serializzati una volta e rigenerati solo al cambio token"""
+        token = self.session.session_token
+        if self._headers is None or token != self._headers_token:
+            headers = self.session.get_auth_headers()
+            headers['Content-Type'] = 'application/json'
+            self._headers = headers
+            self._headers_token = token
+        return self._headers
+
+    def prepare_market(self, market_id: str, selection_ids: Optional[List[int]] = None) -> OrderTemplate:
+        """Pre-serializza il template ordini di un mercato"""
+        template = OrderTemplate(market_id, selection_ids)
+        self.templates[market_id] = template
+        return template
+
+    def warm(self) -> bool:
+        """Apre (o riattiva) la connessione verso l'endpoint betting"""
+        body = json_codec.dumps({
+            'jsonrpc': '2.0',
+            'method': 'SportsAPING/v1.0/listEventTypes',
+            'params': {'filter': {'eventTypeIds': [TENNIS_CONFIG['event_type_id']]}},
+            'id': 'warm'
+        })
+        try:
+            self.bucket.acquire()
+            response = self.http.post(self.url, data=body, headers=self._auth_headers(), timeout=self.timeout)
+            return response.status_code == 200
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Warm-up connessione fallito: {e}")
+            return False
+
+    def start_keep_warm(self):
+        """Avvia un thread che mantiene calda la connessione sotto l'idle timeout"""
+        if self._keep_warm_thread and self._keep_warm_thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(self.keep_warm_interval):
+                if self.session.is_logged_in():
+                    self.warm()
+
+        self._keep_warm_thread = threading.Thread(target=loop, name='betfair-keep-warm', daemon=True)
+        self._keep_warm_thread.start()
+
+    def close(self):
+        self._stop.set()
+        self.http.close()
+
+    # === Esecuzione ===
+
+    def place(self, market_id: str, selection_id: int, side: str, size: float, price: float,
+              signal_ns: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Piazza un singolo ordine LIMIT (ATTENZIONE: usa fondi reali!)
+
+        Args:
+            signal_ns: istante del segnale (time.perf_counter_ns); default l'ingresso nel metodo
+
+        Returns:
+            dict con status, bet_id, size_matched, average_price_matched, error e latency_ms
+        """
+        t0 = time.perf_counter_ns()
+        signal_ns = signal_ns or t0
+
+        error = validate_italian_orders([side], [size], [price])[0]
+        template = self.templates.get(market_id) or self.prepare_market(market_id)
+        if error is None and template.selection_ids is not None and selection_id not in template.selection_ids:
+            error = f"Selezione {selection_id} non presente nel mercato {market_id}"
+        t1 = time.perf_counter_ns()
+        if error:
+            return self._report('INVALID', error=error)
+
+        customer_ref = uuid.uuid4().hex
+        body = template.render(selection_id, side, size, price, customer_ref)
+        headers = self._auth_headers()
+        t2 = time.perf_counter_ns()
+
+        self.bucket.acquire()
+        t3 = time.perf_counter_ns()
+
+        response, error = self._send(body, headers)
+        t4 = time.perf_counter_ns()
+
+        report = None
+        if response is not None:
+            try:
+                report = json_codec.loads(response.content)
+            except ValueError as e:
+                error = f"Risposta non valida: {e}"
+        t5 = time.perf_counter_ns()
+
+        timings = {
+            'validate': t1 - t0,
+            'serialize': t2 - t1,
+            'rate_limit': t3 - t2,
+            'signal_to_wire': t3 - signal_ns,
+            'network': t4 - t3,
+            'decode': t5 - t4,
+            'total': t5 - signal_ns,
+        }
+        self.stats.add(timings)
+        latency_ms = {stage: ns / 1e6 for stage, ns in timings.items()}
+
+        if error or report is None:
+            return self._report('ERROR', error=error, latency_ms=latency_ms)
+        if 'error' in report:
+            return self._report('ERROR', error=report['error'].get('message', 'Errore sconosciuto'),
+                                latency_ms=latency_ms)
+
+        result = report.get('result') or {}
+        instruction_reports = result.get('instructionReports') or [{}]
+        ir = instruction_reports[0]
+        status = ir.get('status') or result.get('status') or 'FAILURE'
+        return self._report(
+            status,
+            bet_id=ir.get('betId'),
+            size_matched=ir.get('sizeMatched'),
+            average_price_matched=ir.get('averagePriceMatched'),
+            error=ir.get('errorCode') or (result.get('errorCode') if status != 'SUCCESS' else None),
+            latency_ms=latency_ms
+        )
+
+    def _send(self, body: bytes, headers: Dict[str, str]) -> Tuple[Optional[requests.Response], Optional[str]]:
+        """
+        Invio sulla connessione calda; un solo nuovo tentativo se la connessione
+        è caduta (il customerRef rende il reinvio sicuro)
+        """
+        for attempt in range(2):
+            try:
+                response = self.http.post(self.url, data=body, headers=headers, timeout=self.timeout)
+                if response.status_code != 200:
+                    return None, f"HTTP {response.status_code}"
+                return response, None
+            except requests.exceptions.ConnectionError as e:
+                if attempt == 0:
+                    logger.warning(f"Connessione caduta, reinvio ordine: {e}")
+                    continue
+                return None, str(e)
+            except requests.exceptions.RequestException as e:
+                return None, str(e)
+        return None, "Invio fallito"
+
+    @staticmethod
+    def _report(status: str, bet_id: Optional[str] = None, size_matched: Optional[float] = None,
+                average_price_matched: Optional[float] = None, error: Optional[str] = None,
+                latency_ms: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        return {
+            'status': status,
+            'bet_id': bet_id,
+            'size_matched': size_matched,
+            'average_price_matched': average_price_matched,
+            'error': error,
+            'latency_ms': latency_ms or {}
+        }
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Percentili di latenza per fase (ms)"""
+        return self.stats.summary()
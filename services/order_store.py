@@ -0,0 +1,284 @@
+"""
+Archivio locale di ordini e posizioni Betfair
+
+Mantiene una copia degli ordini sincronizzata con listCurrentOrders tramite
+fetch incrementali paginati (dateRange + fromRecord) e la indicizza per
+betId, mercato e selezione. L'esposizione netta per mercato è mantenuta in
+modo incrementale: ogni aggiornamento di un ordine sottrae il contributo
+precedente e aggiunge il nuovo, quindi la lettura non richiede di
+scorrere gli ordini né di chiamare l'API.
+
+Modello dell'esposizione (mercato vincente, una sola selezione vince):
+    T      = somma su tutti gli ordini del P&L se la loro selezione perde
+             (back: -stake, lay: +stake)
+    W[s]   = correzione se vince la selezione s (back: stake * quota,
+             lay: -stake * quota)
+    P&L(s vince) = T + W[s]
+"""
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from services.betfair_client import BetfairItalyClient
+
+logger = logging.getLogger(__name__)
+
+# Stati Betfair degli ordini
+EXECUTABLE = 'EXECUTABLE'
+EXECUTION_COMPLETE = 'EXECUTION_COMPLETE'
+
+# Limiti Betfair per listCurrentOrders
+PAGE_SIZE = 1000
+BET_IDS_PER_REQUEST = 250
+
+
+class _MarketBook:
+    """Aggregati di esposizione di un mercato (matched e non matched)"""
+
+    __slots__ = ('lose', 'win', 'lose_unmatched', 'win_unmatched', 'bet_ids', 'runners')
+
+    def __init__(self):
+        self.lose = 0.0
+        self.win: Dict[int, float] = defaultdict(float)
+        self.lose_unmatched = 0.0
+        self.win_unmatched: Dict[int, float] = defaultdict(float)
+        self.bet_ids: Set[str] = set()
+        self.runners: Optional[frozenset] = None
+
+
+def _contribution(order: Dict[str, Any]) -> Tuple[float, float, float, float]:
+    """
+    Contributo di un ordine agli aggregati: (T, W, T non matched, W non matched)
+    """
+    side = order.get('side')
+    sign = 1.0 if side == 'BACK' or side == 'B' else -1.0
+
+    matched = float(order.get('sizeMatched') or 0.0)
+    avg_price = float(order.get('averagePriceMatched') or 0.0)
+    remaining = float(order.get('sizeRemaining') or 0.0)
+    price = float((order.get('priceSize') or {}).get('price') or 0.0)
+
+    return (
+        -sign * matched,
+        sign * matched * avg_price,
+        -sign * remaining,
+        sign * remaining * price,
+    )
+
+
+class OrderStore:
+    """
+    Copia locale degli ordini correnti con esposizione per mercato
+
+    La sincronizzazione incrementale usa due passate su listCurrentOrders:
+    BY_PLACE_TIME dal cursore di piazzamento (nuovi ordini) e BY_MATCH_TIME
+    dal cursore di abbinamento (ordini abbinati nel frattempo). Gli ordini
+    EXECUTABLE che escono dall'elenco (annullati o scaduti senza abbinamenti)
+    vengono riconciliati rileggendoli per betId.
+    """
+
+    def __init__(self, client: Optional[BetfairItalyClient] = None, page_size: int = PAGE_SIZE):
+        self.client = client
+        self.page_size = page_size
+
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self._by_selection: Dict[Tuple[str, int], Set[str]] = defaultdict(set)
+        self._markets: Dict[str, _MarketBook] = defaultdict(_MarketBook)
+        self._contributions: Dict[str, Tuple[float, float, float, float]] = {}
+
+        self.placed_cursor: Optional[str] = None
+        self.matched_cursor: Optional[str] = None
+        self._lock = threading.RLock()
+
+    # === Aggiornamento ===
+
+    def apply_order(self, order: Dict[str, Any]) -> bool:
+        """
+        Inserisce o aggiorna un ordine (formato currentOrder Betfair).
+        Usabile anche per i delta dell'order stream. Ritorna True se cambiato.
+        """
+        bet_id = str(order['betId'])
+        market_id = order['marketId']
+        selection_id = int(order['selectionId'])
+
+        with self._lock:
+            previous = self.orders.get(bet_id)
+            if previous == order:
+                return False
+
+            market = self._markets[market_id]
+            old = self._contributions.get(bet_id)
+            if old is not None:
+                market.lose -= old[0]
+                market.win[selection_id] -= old[1]
+                market.lose_unmatched -= old[2]
+                market.win_unmatched[selection_id] -= old[3]
+
+            new = _contribution(order)
+            market.lose += new[0]
+            market.win[selection_id] += new[1]
+            market.lose_unmatched += new[2]
+            market.win_unmatched[selection_id] += new[3]
+
+            self._contributions[bet_id] = new
+            self.orders[bet_id] = order
+            market.bet_ids.add(bet_id)
+            self._by_selection[(market_id, selection_id)].add(bet_id)
+
+            placed = order.get('placedDate')
+            if placed and (self.placed_cursor is None or placed > self.placed_cursor):
+                self.placed_cursor = placed
+            matched = order.get('matchedDate')
+            if matched and (self.matched_cursor is None or matched > self.matched_cursor):
+                self.matched_cursor = matched
+            return True
+
+    def apply_orders(self, orders: Iterable[Dict[str, Any]]) -> int:
+        """Applica un insieme di ordini, ritorna il numero di ordini cambiati"""
+        return sum(1 for order in orders if self.apply_order(order))
+
+    def register_runners(self, market_id: str, selection_ids: Iterable[int]):
+        """
+        Registra i runner del mercato: con l'elenco completo l'esposizione
+        non considera più lo scenario "vince una selezione senza ordini"
+        """
+        with self._lock:
+            self._markets[market_id].runners = frozenset(int(s) for s in selection_ids)
+
+    def remove_market(self, market_id: str):
+        """Dimentica un mercato chiuso/regolato"""
+        with self._lock:
+            market = self._markets.pop(market_id, None)
+            if market is None:
+                return
+            for bet_id in market.bet_ids:
+                order = self.orders.pop(bet_id, None)
+                self._contributions.pop(bet_id, None)
+                if order is not None:
+                    self._by_selection.pop((market_id, int(order['selectionId'])), None)
+
+    # === Sincronizzazione ===
+
+    def _fetch_pages(self, **filters) -> List[Dict[str, Any]]:
+        orders: List[Dict[str, Any]] = []
+        from_record = 0
+        while True:
+            page = self.client.list_current_orders(from_record=from_record, record_count=self.page_size, **filters)
+            batch = page.get('currentOrders') or []
+            orders.extend(batch)
+            if not page.get('moreAvailable') or not batch:
+                return orders
+            from_record += len(batch)
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Sincronizza con listCurrentOrders
+
+        Args:
+            full: rilegge tutti gli ordini correnti invece dei soli delta
+
+        Returns:
+            Numero di ordini nuovi o modificati
+        """
+        if self.client is None:
+            raise RuntimeError("OrderStore senza client: usare apply_orders")
+
+        if full or self.placed_cursor is None:
+            changed = self.apply_orders(self._fetch_pages(order_by='BY_PLACE_TIME'))
+        else:
+            # Cursori inclusivi: i duplicati sono innocui (apply_order è idempotente)
+            changed = self.apply_orders(self._fetch_pages(
+                order_by='BY_PLACE_TIME', date_range={'from': self.placed_cursor}))
+            if self.matched_cursor is not None:
+                changed += self.apply_orders(self._fetch_pages(
+                    order_by='BY_MATCH_TIME', date_range={'from': self.matched_cursor}))
+            else:
+                changed += self.apply_orders(self._fetch_pages(order_by='BY_MATCH_TIME'))
+            changed += self._reconcile_executable()
+
+        logger.debug(f"Sync ordini: {changed} modificati, {len(self.orders)} in archivio")
+        return changed
+
+    def _reconcile_executable(self) -> int:
+        """Rilegge per betId gli ordini EXECUTABLE locali non più eseguibili sul server"""
+        with self._lock:
+            local_executable = {b for b, o in self.orders.items() if o.get('status') == EXECUTABLE}
+        if not local_executable:
+            return 0
+
+        remote = self._fetch_pages(order_projection=EXECUTABLE)
+        changed = self.apply_orders(remote)
+        stale = sorted(local_executable - {str(o['betId']) for o in remote})
+
+        for start in range(0, len(stale), BET_IDS_PER_REQUEST):
+            chunk = stale[start:start + BET_IDS_PER_REQUEST]
+            refreshed = self._fetch_pages(bet_ids=chunk)
+            changed += self.apply_orders(refreshed)
+
+            # Ordini spariti anche per betId: chiusi senza abbinamento residuo
+            missing = set(chunk) - {str(o['betId']) for o in refreshed}
+            for bet_id in missing:
+                order = dict(self.orders[bet_id])
+                order['sizeCancelled'] = float(order.get('sizeCancelled') or 0.0) + float(order.get('sizeRemaining') or 0.0)
+                order['sizeRemaining'] = 0.0
+                order['status'] = EXECUTION_COMPLETE
+                changed += self.apply_order(order)
+        return changed
+
+    # === Letture ===
+
+    def get(self, bet_id: str) -> Optional[Dict[str, Any]]:
+        return self.orders.get(str(bet_id))
+
+    def orders_for_market(self, market_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            market = self._markets.get(market_id)
+            return [self.orders[b] for b in market.bet_ids] if market else []
+
+    def orders_for_selection(self, market_id: str, selection_id: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self.orders[b] for b in self._by_selection.get((market_id, int(selection_id)), ())]
+
+    def selection_pnl(self, market_id: str, selection_id: int, include_unmatched: bool = False) -> float:
+        """P&L del mercato se vince la selezione indicata (O(1))"""
+        market = self._markets.get(market_id)
+        if market is None:
+            return 0.0
+        pnl = market.lose + market.win.get(int(selection_id), 0.0)
+        if include_unmatched:
+            pnl += market.lose_unmatched + market.win_unmatched.get(int(selection_id), 0.0)
+        return pnl
+
+    def market_exposure(self, market_id: str, include_unmatched: bool = False) -> Dict[str, Any]:
+        """
+        Esposizione netta del mercato
+
+        Returns:
+            dict con pnl_if_wins {selectionId: P&L}, pnl_if_other (vince una
+            selezione senza ordini) e worst_case (perdita massima, <= 0;
+            ignora pnl_if_other se i runner registrati sono tutti coperti)
+        """
+        with self._lock:
+            market = self._markets.get(market_id)
+            if market is None:
+                return {'pnl_if_wins': {}, 'pnl_if_other': 0.0, 'worst_case': 0.0}
+            selections = set(market.win) | (set(market.win_unmatched) if include_unmatched else set())
+            if market.runners is not None:
+                selections |= market.runners
+            pnl_if_wins = {s: self.selection_pnl(market_id, s, include_unmatched) for s in selections}
+            pnl_if_other = market.lose + (market.lose_unmatched if include_unmatched else 0.0)
+            other_possible = market.runners is None or not market.runners <= set(pnl_if_wins)
+
+        worst = min([*pnl_if_wins.values(), *([pnl_if_other] if other_possible else [])], default=0.0)
+        return {
+            'pnl_if_wins': pnl_if_wins,
+            'pnl_if_other': pnl_if_other,
+            'worst_case': min(worst, 0.0)
+        }
+
+    def total_worst_case(self, include_unmatched: bool = True) -> float:
+        """Somma delle perdite massime su tutti i mercati aperti"""
+        with self._lock:
+            market_ids = list(self._markets)
+        return sum(self.market_exposure(m, include_unmatched)['worst_case'] for m in market_ids)
@@ -0,0 +1,313 @@
+"""
+Risoluzione dell'identità dei giocatori tra sorgenti diverse
+
+Betfair ("Jannik Sinner"), SofaScore ("Sinner J.") e i ranking usano
+formati di nome diversi. Il resolver precalcola per ogni giocatore della
+tabella players i token normalizzati (senza accenti e punteggiatura) e il
+loro codice Soundex, e mantiene due indici token -> giocatori. Un nome
+viene risolto in quest'ordine:
+
+    1. alias noti (tabella player_aliases)
+    2. chiave esatta (token ordinati)
+    3. candidati dagli indici per token / fonetici, valutati con un
+       punteggio Dice che accetta iniziali ("J." copre "Jannik")
+
+Solo i candidati che condividono almeno un token (o il suo Soundex) sono
+valutati, quindi nessuna scansione O(N²); i risultati sono in cache.
+"""
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Punteggio minimo per accettare un candidato e distacco minimo dal secondo
+MIN_SCORE = 0.8
+MIN_MARGIN = 0.05
+
+# Peso di un'iniziale rispetto a un token completo, e di un match solo fonetico
+INITIAL_WEIGHT = 0.5
+PHONETIC_WEIGHT = 0.85
+
+# Token troppo comuni (es. "de") non generano candidati se c'è altro
+MAX_POSTING = 200
+
+CACHE_SIZE = 100_000
+
+_NON_ALPHA = re.compile(r"[^a-z\s]")
+_SOUNDEX_CODES = {c: str(d) for d, letters in enumerate(
+    ('aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r')) for c in letters}
+
+
+def normalize_name(name: str) -> str:
+    """Minuscolo, senza accenti né punteggiatura, spazi singoli"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace('-', ' ').replace("'", '').replace('.', ' ')
+    return ' '.join(_NON_ALPHA.sub(' ', text).split())
+
+
+def soundex(token: str) -> str:
+    """Codice Soundex (lettera + 3 cifre)"""
+    if not token:
+        return ''
+    first = token[0]
+    digits = []
+    last = _SOUNDEX_CODES.get(first, '')
+    for c in token[1:]:
+        code = _SOUNDEX_CODES.get(c, '')
+        if code and code != '0' and code != last:
+            digits.append(code)
+        if c not in 'hw':
+            last = code
+    return (first + ''.join(digits) + '000')[:4]
+
+
+class NameKey:
+    """Forma precalcolata di un nome: token completi, iniziali e Soundex"""
+
+    __slots__ = ('normalized', 'tokens', 'initials', 'phonetic', 'exact_key')
+
+    def __init__(self, name: str):
+        self.normalized = normalize_name(name)
+        parts = self.normalized.split()
+        self.tokens: Tuple[str, ...] = tuple(p for p in parts if len(p) > 1)
+        self.initials: Tuple[str, ...] = tuple(p for p in parts if len(p) == 1)
+        self.phonetic: Tuple[str, ...] = tuple(soundex(t) for t in self.tokens)
+        self.exact_key = ' '.join(sorted(parts))
+
+
+def score_names(query: NameKey, candidate: NameKey) -> float:
+    """
+    Somiglianza Dice tra due nomi in [0, 1]
+
+    Token uguali valgono 1, token con lo stesso Soundex PHONETIC_WEIGHT;
+    un'iniziale che copre un token dell'altro nome vale INITIAL_WEIGHT su
+    entrambi i lati. Serve almeno un token completo in comune.
+    """
+    q_left = list(range(len(query.tokens)))
+    c_left = list(range(len(candidate.tokens)))
+    matched = 0.0
+    paired_weight = 0.0
+
+    for exact in (True, False):
+        for qi in list(q_left):
+            for ci in c_left:
+                same = (query.tokens[qi] == candidate.tokens[ci] if exact
+                        else query.phonetic[qi] == candidate.phonetic[ci])
+                if same:
+                    matched += 1.0 if exact else PHONETIC_WEIGHT
+                    paired_weight += 1.0
+                    q_left.remove(qi)
+                    c_left.remove(ci)
+                    break
+    if not paired_weight:
+        return 0.0
+
+    def cover(initials: Tuple[str, ...], tokens: Tuple[str, ...], left: List[int]) -> Tuple[int, int]:
+        """Iniziali che coprono token rimasti: (coperte, iniziali non usate)"""
+        covered = 0
+        for initial in initials:
+            hit = next((i for i in left if tokens[i][0] == initial), None)
+            if hit is not None:
+                left.remove(hit)
+                covered += 1
+        return covered, len(initials) - covered
+
+    q_cov, q_unused = cover(query.initials, candidate.tokens, c_left)
+    c_cov, c_unused = cover(candidate.initials, query.tokens, q_left)
+    # Iniziali presenti su entrambi i lati
+    shared = len(set(query.initials) & set(candidate.initials))
+    q_unused = max(q_unused - shared, 0)
+    c_unused = max(c_unused - shared, 0)
+
+    initials_matched = (q_cov + c_cov + shared) * INITIAL_WEIGHT
+    matched += initials_matched
+    weight = paired_weight + initials_matched
+    q_weight = weight + len(q_left) + q_unused * INITIAL_WEIGHT
+    c_weight = weight + len(c_left) + c_unused * INITIAL_WEIGHT
+    return 2 * matched / (q_weight + c_weight)
+
+
+class PlayerResolver:
+    """
+    Indice dei giocatori per nome, con alias e cache
+
+    Uso:
+        resolver = PlayerResolver("data/tennis.db")
+        player_id = resolver.resolve("Sinner J.")
+        ids = resolver.resolve_many(runner_names, gender="M")
+    """
+
+    def __init__(self, db_path: str = "data/tennis.db", min_score: float = MIN_SCORE,
+                 learn_aliases: bool = False):
+        self.db_path = db_path
+        self.min_score = min_score
+        self.learn_aliases = learn_aliases
+
+        self.keys: Dict[int, NameKey] = {}
+        self.genders: Dict[int, Optional[str]] = {}
+        self._exact: Dict[str, Set[int]] = defaultdict(set)
+        self._by_token: Dict[str, Set[int]] = defaultdict(set)
+        self._by_phonetic: Dict[str, Set[int]] = defaultdict(set)
+        self._aliases: Dict[str, int] = {}
+        self._cache: Dict[Tuple[str, Optional[str]], Tuple[Optional[int], float]] = {}
+        self._lock = threading.RLock()
+        self.stats: Dict[str, int] = {'cache_hits': 0, 'alias': 0, 'exact': 0, 'fuzzy': 0,
+                                      'ambiguous': 0, 'unresolved': 0}
+
+        self.init_database()
+        self.load()
+
+    def _conn(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        conn = self._conn()
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS player_aliases (
+            alias TEXT PRIMARY KEY,
+            player_id INTEGER NOT NULL,
+            source TEXT,
+            created_at TEXT,
+            FOREIGN KEY (player_id) REFERENCES players (id)
+        )
+        """)
+        conn.commit()
+        conn.close()
+
+    def load(self):
+        """(Ri)costruisce gli indici da players e player_aliases"""
+        conn = self._conn()
+        has_players = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'players'").fetchone()
+        players = conn.execute("SELECT id, name, gender FROM players").fetchall() if has_players else []
+        aliases = conn.execute("SELECT alias, player_id FROM player_aliases").fetchall()
+        conn.close()
+
+        with self._lock:
+            self.keys.clear()
+            self.genders.clear()
+            self._exact.clear()
+            self._by_token.clear()
+            self._by_phonetic.clear()
+            for player_id, name, gender in players:
+                self._index(player_id, name, gender)
+            self._aliases = dict(aliases)
+            self._cache.clear()
+        logger.debug(f"Indice giocatori: {len(self.keys)} nomi, {len(self._aliases)} alias")
+
+    def _index(self, player_id: int, name: str, gender: Optional[str]):
+        key = NameKey(name)
+        self.keys[player_id] = key
+        self.genders[player_id] = gender
+        self._exact[key.exact_key].add(player_id)
+        for token, code in zip(key.tokens, key.phonetic):
+            self._by_token[token].add(player_id)
+            self._by_phonetic[code].add(player_id)
+
+    def add_player(self, player_id: int, name: str, gender: Optional[str] = None):
+        """Aggiunge all'indice un giocatore appena inserito in players"""
+        with self._lock:
+            self._index(player_id, name, gender)
+            self._cache.clear()
+
+    def add_alias(self, alias: str, player_id: int, source: Optional[str] = None):
+        """Registra (e persiste) un alias esplicito per un giocatore"""
+        normalized = normalize_name(alias)
+        conn = self._conn()
+        conn.execute("""
+        INSERT INTO player_aliases (alias, player_id, source, created_at) VALUES (?, ?, ?, ?)
+        ON CONFLICT(alias) DO UPDATE SET player_id = excluded.player_id, source = excluded.source
+        """, (normalized, player_id, source, datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        with self._lock:
+            self._aliases[normalized] = player_id
+            self._cache.clear()
+
+    # === Risoluzione ===
+
+    def _candidates(self, key: NameKey) -> Set[int]:
+        postings = [self._by_token.get(t, ()) for t in key.tokens]
+        if not any(postings):
+            postings = [self._by_phonetic.get(c, ()) for c in key.phonetic]
+        selective = [p for p in postings if 0 < len(p) <= MAX_POSTING]
+        candidates: Set[int] = set()
+        for posting in (selective or postings):
+            candidates.update(posting)
+        return candidates
+
+    def _resolve_uncached(self, normalized: str, key: NameKey,
+                          gender: Optional[str]) -> Tuple[Optional[int], float, str]:
+        alias = self._aliases.get(normalized)
+        if alias is not None:
+            return alias, 1.0, 'alias'
+
+        exact = [p for p in self._exact.get(key.exact_key, ()) if gender is None or self.genders[p] in (gender, None)]
+        if len(exact) == 1:
+            return exact[0], 1.0, 'exact'
+
+        scored = sorted(
+            ((score_names(key, self.keys[p]), p) for p in self._candidates(key)
+             if gender is None or self.genders[p] in (gender, None)),
+            reverse=True
+        )
+        if not scored or scored[0][0] < self.min_score:
+            return None, scored[0][0] if scored else 0.0, 'unresolved'
+        if len(scored) > 1 and scored[0][0] - scored[1][0] < MIN_MARGIN:
+            return None, scored[0][0], 'ambiguous'
+        return scored[0][1], scored[0][0], 'fuzzy'
+
+    def resolve_with_score(self, name: str, gender: Optional[str] = None,
+                           source: Optional[str] = None) -> Tuple[Optional[int], float]:
+        """
+        Risolve un nome nel player_id della tabella players
+
+        Returns:
+            (player_id o None, punteggio del miglior candidato)
+        """
+        normalized = normalize_name(name)
+        cache_key = (normalized, gender)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+
+        # Nomi di doppio ("A / B") non corrispondono a un singolo giocatore
+        if not normalized or '/' in name:
+            result, how = (None, 0.0), 'unresolved'
+        else:
+            with self._lock:
+                player_id, score, how = self._resolve_uncached(normalized, NameKey(name), gender)
+            result = (player_id, score)
+            if how == 'fuzzy' and self.learn_aliases:
+                self.add_alias(name, player_id, source)
+
+        self.stats[how] += 1
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[cache_key] = result
+        return result
+
+    def resolve(self, name: str, gender: Optional[str] = None, source: Optional[str] = None) -> Optional[int]:
+        return self.resolve_with_score(name, gender, source)[0]
+
+    def resolve_many(self, names: Iterable[str], gender: Optional[str] = None,
+                     source: Optional[str] = None) -> List[Optional[int]]:
+        return [self.resolve(name, gender, source) for name in names]
+
+    def resolve_runners(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Aggiunge player_id ai runner dell'output di
+        BetfairItalyClient.get_tennis_odds_realtime (in place)
+        """
+        for match in matches:
+            for runner in match.get('runners', []):
+                runner['player_id'] = self.resolve(runner.get('runner_name', ''), source='betfair')
+        return matches
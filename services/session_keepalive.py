@@ -0,0 +1,237 @@
+"""
+Keep-alive e re-login automatici per BetfairItalySession
+
+Un thread in background rinnova il token prima dell'idle timeout e della
+scadenza. Un keep-alive fallito per un errore temporaneo viene ritentato
+con backoff finché il token non scade; il login viene rifatto solo quando
+Betfair dichiara la sessione non valida o il token è scaduto. Il token viene
+condiviso tra thread (stessa sessione) e tra processi tramite un piccolo
+file di cache protetto da lock: un solo processo alla volta effettua il
+login, gli altri adottano il token aggiornato. Nessun login avviene sul
+percorso delle richieste dell'utente.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock tra processi non disponibile
+    fcntl = None
+
+from config.betfair_it import SESSION_CONFIG
+from services.betfair_session import KEEP_ALIVE_INVALID, KEEP_ALIVE_SUCCESS, BetfairItalySession
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCache:
+    """Token di sessione condiviso tra processi tramite file JSON"""
+
+    def __init__(self, path: str = SESSION_CONFIG['token_cache_path']):
+        self.path = path
+        self.lock_path = path + '.lock'
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Lock esclusivo tra processi (no-op se fcntl non è disponibile)"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read(self, app_key: str) -> Optional[Dict[str, Any]]:
+        """Token valido in cache per l'app key indicata, o None"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('app_key') != app_key or not data.get('token'):
+            return None
+        expires = datetime.fromisoformat(data['expires'])
+        if expires <= datetime.now():
+            return None
+        return {'token': data['token'], 'expires': expires, 'refreshed': data.get('refreshed', 0.0)}
+
+    def write(self, app_key: str, token: str, expires: datetime):
+        tmp_path = self.path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({
+                'app_key': app_key,
+                'token': token,
+                'expires': expires.isoformat(),
+                'refreshed': time.time()
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SessionKeeper:
+    """
+    Mantiene attiva una BetfairItalySession in background
+
+    Uso:
+        keeper = SessionKeeper(session, cert_path, key_path).start()
+        ...
+        if session.is_logged_in():  # mai bloccante
+            client.get_tennis_odds_realtime()
+    """
+
+    def __init__(self, session: BetfairItalySession, cert_path: Optional[str] = None,
+                 key_path: Optional[str] = None, cache: Optional[TokenCache] = None,
+                 check_interval: float = SESSION_CONFIG['check_interval'],
+                 keep_alive_interval: float = SESSION_CONFIG['keep_alive_interval'],
+                 expiry_margin: float = SESSION_CONFIG['expiry_margin']):
+        self.session = session
+        self.cert_path = cert_path
+        self.key_path = key_path
+        self.cache = cache or TokenCache()
+        self.check_interval = check_interval
+        self.keep_alive_interval = keep_alive_interval
+        self.expiry_margin = expiry_margin
+
+        self.last_refresh = 0.0
+        self.failures = 0
+        self.next_login_attempt = 0.0
+        self.keep_alive_failures = 0
+        self.next_keep_alive_attempt = 0.0
+        self.ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'SessionKeeper':
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='betfair-session-keeper', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Attende il primo token valido (solo per script, non per le pagine)"""
+        return self.ready.wait(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Errore nel keep-alive della sessione: {e}")
+            self._stop.wait(self.check_interval)
+
+    # === Logica di rinnovo ===
+
+    def tick(self):
+        """Un controllo: adotta il token condiviso, keep-alive o re-login se serve"""
+        self._adopt_cached()
+
+        now = time.time()
+        if self.session.is_logged_in():
+            self.ready.set()
+            idle = now - self.last_refresh >= self.keep_alive_interval
+            if (idle or self._near_expiry()) and now >= self.next_keep_alive_attempt:
+                self._refresh()
+        elif now >= self.next_login_attempt:
+            self._login()
+
+    def _adopt_cached(self):
+        """Adotta un token più recente scritto da un altro processo"""
+        cached = self.cache.read(self.session.app_key)
+        if cached is None:
+            return
+        if cached['token'] != self.session.session_token or cached['refreshed'] > self.last_refresh:
+            self.session.adopt_token(cached['token'], cached['expires'])
+            self.last_refresh = max(self.last_refresh, cached['refreshed'])
+
+    def _publish(self):
+        self.last_refresh = time.time()
+        self.cache.write(self.session.app_key, self.session.session_token, self.session.session_expires)
+        self.ready.set()
+
+    def _refresh(self):
+        with self.cache.locked():
+            # Un altro processo può aver appena rinnovato il token
+            self._adopt_cached()
+            if time.time() - self.last_refresh < self.keep_alive_interval and not self._near_expiry():
+                return
+            status = self.session.keep_alive_status()
+            if status == KEEP_ALIVE_SUCCESS:
+                self.keep_alive_failures = 0
+                self.next_keep_alive_attempt = 0.0
+                self._publish()
+                logger.debug("Sessione Betfair rinnovata")
+                return
+            if status == KEEP_ALIVE_INVALID:
+                # Token rifiutato da Betfair: inutile anche per gli altri processi
+                rejected = self.session.session_token
+                self.session.clear_token()
+                cached = self.cache.read(self.session.app_key)
+                if cached is None or cached['token'] == rejected:
+                    self.cache.clear()
+
+        if status == KEEP_ALIVE_INVALID:
+            logger.warning("Sessione Betfair non valida, nuovo login in background")
+            self._login()
+            return
+
+        # Errore temporaneo: il token resta in uso (e in cache) finché non scade
+        backoff = SESSION_CONFIG['keep_alive_backoff']
+        wait = backoff[min(self.keep_alive_failures, len(backoff) - 1)]
+        self.keep_alive_failures += 1
+        self.next_keep_alive_attempt = time.time() + wait
+        logger.warning(f"Keep-alive fallito, nuovo tentativo tra {wait}s")
+
+    def _near_expiry(self) -> bool:
+        expires = self.session.session_expires
+        return expires is None or expires - datetime.now() < timedelta(seconds=self.expiry_margin)
+
+    def _login(self):
+        with self.cache.locked():
+            self._adopt_cached()
+            if self.session.is_logged_in():
+                return
+
+            try:
+                if self.cert_path and self.key_path:
+                    success = self.session.login_certificate(self.cert_path, self.key_path)
+                else:
+                    success = self.session.login_interactive()
+            except ValueError as e:
+                logger.error(f"Login Betfair non configurato: {e}")
+                success = False
+
+            if success:
+                self.failures = 0
+                self.next_login_attempt = 0.0
+                self._publish()
+                logger.info("Login Betfair completato in background")
+                return
+
+        backoff = SESSION_CONFIG['login_backoff']
+        wait = backoff[min(self.failures, len(backoff) - 1)]
+        self.failures += 1
+        self.next_login_attempt = time.time() + wait
+        logger.error(f"Login Betfair fallito, nuovo tentativo tra {wait}s")
@@ -0,0 +1,244 @@
+"""
+Parser vettorizzato delle quote SofaScore (mercato vincente partita)
+
+Normalizza i tre layout dei payload odds in una tabella piatta
+(event_id, bookmaker, side, price) con un solo passaggio sui dati; miglior
+quota e consensus tra bookmaker sono poi calcolati con groupby vettorizzati
+su tutti i payload della giornata.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Etichette SofaScore -> lato (1 = player1 / home, 2 = player2 / away)
+SIDE_LABELS = {
+    '1': 1, 'home': 1, 'player1': 1, 'p1': 1,
+    '2': 2, 'away': 2, 'player2': 2, 'p2': 2,
+}
+
+# Id del mercato vincente partita
+WINNER_MARKET_ID = '1'
+
+TABLE_COLUMNS = ['event_id', 'bookmaker', 'side', 'price']
+
+_LABEL_KEYS = ('name', 'choice', 'outcome', 'handicap')
+_PRICE_KEYS = ('value', 'decimalOdds', 'odd', 'price')
+
+
+def _first(obj: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """Primo valore valorizzato tra le chiavi indicate (stessa semantica di `a or b`)"""
+    for key in keys:
+        value = obj.get(key)
+        if value:
+            return value
+    return None
+
+
+def _market_id(market: Dict[str, Any]) -> Optional[str]:
+    """
+    Id del tipo di mercato
+
+    marketId ha la precedenza: nei payload reali id è l'istanza del mercato
+    (es. {"marketId": 1, "id": 260125580}); id/key solo se manca marketId.
+    """
+    market_id = market.get('marketId')
+    if market_id is None:
+        market_id = market.get('id') or market.get('key')
+    return str(market_id) if market_id is not None else None
+
+
+class _RawOdds:
+    """Accumulatore colonnare dei valori grezzi (un solo passaggio sui payload)"""
+
+    __slots__ = ('event_ids', 'books', 'labels', 'prices', 'fractions')
+
+    def __init__(self):
+        self.event_ids: List[Any] = []
+        self.books: List[str] = []
+        self.labels: List[Any] = []
+        self.prices: List[Any] = []
+        self.fractions: List[Any] = []
+
+    def add_choices(self, event_id: Any, book: str, choices: List[Dict[str, Any]]):
+        for choice in choices or []:
+            self.event_ids.append(event_id)
+            self.books.append(book)
+            self.labels.append(_first(choice, _LABEL_KEYS))
+            self.prices.append(_first(choice, _PRICE_KEYS))
+            self.fractions.append(choice.get('fractionalValue'))
+
+    def add_payload(self, event_id: Any, payload: Dict[str, Any]):
+        if not payload:
+            return
+
+        # Layout 1: featuredOdds -> bookmaker -> markets -> choices
+        featured_odds = payload.get('featuredOdds')
+        if isinstance(featured_odds, list):
+            for bk in featured_odds:
+                book = (bk.get('bookmaker') or {}).get('name') or bk.get('bookmakerName') or 'book'
+                for market in bk.get('markets') or bk.get('odds') or []:
+                    market_id = _market_id(market)
+                    if market_id is not None and market_id != WINNER_MARKET_ID:
+                        continue
+                    self.add_choices(event_id, book, market.get('choices') or market.get('outcomes'))
+
+        # Layout 2: markets (id=1) -> bookmakers -> choices
+        # Layout 3: markets / featured con choices diretti (quota SofaScore aggregata)
+        markets = list(payload.get('markets') or [])
+        featured = payload.get('featured')
+        if isinstance(featured, dict):
+            markets.extend(m for m in featured.values() if isinstance(m, dict))
+
+        for market in markets:
+            if _market_id(market) != WINNER_MARKET_ID:
+                continue
+            bookmakers = market.get('bookmakers')
+            if bookmakers:
+                for bk in bookmakers:
+                    book = (bk.get('bookmaker') or {}).get('name') or bk.get('name') or 'book'
+                    self.add_choices(event_id, book, bk.get('choices') or bk.get('outcomes'))
+            else:
+                self.add_choices(event_id, 'sofa', market.get('choices') or market.get('outcomes'))
+
+
+def _fractional_to_decimal(fractions: pd.Series) -> pd.Series:
+    """Converte quote frazionarie ('8/11') in decimali in modo vettorizzato"""
+    parts = fractions.astype('string').str.split('/', n=1, expand=True)
+    if parts.shape[1] < 2:
+        return pd.Series(np.nan, index=fractions.index)
+    numerator = pd.to_numeric(parts[0], errors='coerce')
+    denominator = pd.to_numeric(parts[1], errors='coerce')
+    return 1 + numerator / denominator.where(denominator != 0)
+
+
+def odds_table(payloads: Dict[Any, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Costruisce la tabella piatta delle quote vincente partita
+
+    Args:
+        payloads: {event_id: payload odds SofaScore} (qualsiasi layout)
+
+    Returns:
+        DataFrame con colonne event_id, bookmaker, side (1/2), price (decimale)
+    """
+    raw = _RawOdds()
+    for event_id, payload in payloads.items():
+        raw.add_payload(event_id, payload)
+
+    if not raw.event_ids:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+
+    df = pd.DataFrame({
+        'event_id': raw.event_ids,
+        'bookmaker': raw.books,
+        'label': pd.Series(raw.labels, dtype='object'),
+        'price': pd.Series(raw.prices, dtype='object'),
+        'fraction': pd.Series(raw.fractions, dtype='object'),
+    })
+
+    df['side'] = df['label'].astype('string').str.lower().map(SIDE_LABELS)
+    price = pd.to_numeric(df['price'], errors='coerce')
+    df['price'] = price.fillna(_fractional_to_decimal(df['fraction']))
+
+    df = df.loc[df['side'].notna() & df['price'].notna()].copy()
+    df['side'] = df['side'].astype(np.int8)
+
+    return df[TABLE_COLUMNS].reset_index(drop=True)
+
+
+def best_prices(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Miglior quota per lato e relativo bookmaker per ogni evento
+
+    Returns:
+        DataFrame indicizzato per event_id con best_p1, best_p2, book_p1, book_p2
+    """
+    columns = ['best_p1', 'best_p2', 'book_p1', 'book_p2']
+    if table.empty:
+        return pd.DataFrame(columns=columns)
+
+    best = table.loc[table.groupby(['event_id', 'side'])['price'].idxmax()]
+    wide = best.pivot(index='event_id', columns='side', values=['price', 'bookmaker'])
+
+    result = pd.DataFrame(index=wide.index)
+    for side in (1, 2):
+        result[f'best_p{side}'] = wide[('price', side)] if ('price', side) in wide.columns else np.nan
+    for side in (1, 2):
+        result[f'book_p{side}'] = wide[('bookmaker', side)] if ('bookmaker', side) in wide.columns else None
+
+    return result[columns]
+
+
+def consensus_prices(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Consensus tra bookmaker per ogni evento
+
+    Per ogni bookmaker con entrambe le quote le probabilità implicite vengono
+    normalizzate (rimozione del margine), poi mediate tra i bookmaker.
+
+    Returns:
+        DataFrame indicizzato per event_id con n_books, prob_p1, prob_p2,
+        fair_odds_p1, fair_odds_p2, avg_overround
+    """
+    columns = ['n_books', 'prob_p1', 'prob_p2', 'fair_odds_p1', 'fair_odds_p2', 'avg_overround']
+    if table.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Una quota per (evento, bookmaker, lato): la migliore se duplicata
+    per_book = table.groupby(['event_id', 'bookmaker', 'side'])['price'].max().unstack('side')
+    if 1 not in per_book.columns or 2 not in per_book.columns:
+        return pd.DataFrame(columns=columns)
+    per_book = per_book.dropna(subset=[1, 2])
+
+    implied_p1 = 1 / per_book[1]
+    implied_p2 = 1 / per_book[2]
+    overround = implied_p1 + implied_p2
+    per_book = pd.DataFrame({
+        'prob_p1': implied_p1 / overround,
+        'prob_p2': implied_p2 / overround,
+        'overround': overround
+    })
+
+    grouped = per_book.groupby(level='event_id')
+    result = grouped[['prob_p1', 'prob_p2']].mean()
+    result['n_books'] = grouped.size()
+    result['fair_odds_p1'] = 1 / result['prob_p1']
+    result['fair_odds_p2'] = 1 / result['prob_p2']
+    result['avg_overround'] = grouped['overround'].mean()
+
+    return result[columns]
+
+
+def best_winner_odds_by_event(payloads: Dict[Any, Dict[str, Any]]) -> Dict[Any, Tuple[Optional[float], Optional[float], Optional[str]]]:
+    """
+    Miglior quota player1/player2 e bookmaker per tutti gli eventi della giornata
+
+    Il bookmaker riportato è quello della miglior quota su entrambi i lati;
+    se i due lati provengono da bookmaker diversi vengono riportati entrambi
+    ('book_p1/book_p2').
+    """
+    best = best_prices(odds_table(payloads))
+    result = {}
+    for event_id, best_p1, best_p2, book_p1, book_p2 in best.itertuples(name=None):
+        result[event_id] = (
+            float(best_p1) if pd.notna(best_p1) else None,
+            float(best_p2) if pd.notna(best_p2) else None,
+            book_label(book_p1, book_p2)
+        )
+    return result
+
+
+def best_winner_odds(odds_payload: Dict[str, Any]) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+    """Miglior quota player1/player2 per un singolo payload"""
+    return best_winner_odds_by_event({0: odds_payload}).get(0, (None, None, None))
+
+
+def book_label(book_p1: Any, book_p2: Any) -> Optional[str]:
+    """Etichetta bookmaker per la coppia di migliori quote"""
+    books = [b for b in (book_p1, book_p2) if isinstance(b, str) and b]
+    if not books:
+        return None
+    if len(books) == 2 and books[0] != books[1]:
+        return f"{books[0]}/{books[1]}"
+    return books[0]
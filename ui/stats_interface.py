@@ -8,19 +8,29 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import plotly.graph_objects as go
 
+from models.dashboard_aggregates import DashboardAggregates
 from models.stats_models import TennisStatsDatabase
 from services.data_fetcher import TennisDataFetcher
+from services.live_snapshot import LiveSnapshot
 from analytics.advanced_metrics import TennisAdvancedMetrics
+from components.auto_refresh import live_fragment
+from visualization.figure_cache import FIGURE_CACHE
 from visualization.stats_charts import TennisStatsVisualizer
 
+# Intervallo di aggiornamento della pagina live (secondi)
+LIVE_REFRESH_SECONDS = 30
+
 class TennisStatsInterface:
     """Interfaccia principale per statistiche tennis"""
     
     def __init__(self):
         self.db = TennisStatsDatabase()
+        self.aggregates = DashboardAggregates()
         self.fetcher = TennisDataFetcher()
         self.metrics = TennisAdvancedMetrics()
         self.visualizer = TennisStatsVisualizer()
+        # Snapshot condiviso: un fetch per intervallo per tutte le sessioni
+        self.live_snapshot = LiveSnapshot(self.fetcher.get_live_matches, ttl=LIVE_REFRESH_SECONDS / 2)
     
     def render_main_interface(self):
         """Renderizza interfaccia principale"""
@@ -56,20 +66,31 @@ class TennisStatsInterface:
             self.render_data_management()
     
     def render_general_dashboard(self):
-        """Dashboard generale con overview statistiche"""
+        """Dashboard generale con overview statistiche (aggregati precalcolati)"""
         st.header("🏠 Dashboard Generale")
         
+        totals = self.aggregates.totals()
+        if not totals:
+            # Primo avvio: gli aggregati vengono poi aggiornati a fine ETL
+            self.aggregates.refresh()
+            totals = self.aggregates.totals()
+        
         # Metriche principali
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Giocatori nel DB", "1,247", "+23")
+            st.metric("Giocatori nel DB", f"{totals.get('players', 0):,}", f"{totals.get('players_delta', 0):+,}")
         with col2:
-            st.metric("Partite Analizzate", "15,892", "+156")
+            st.metric("Partite Analizzate", f"{totals.get('analysed_matches', 0):,}", f"{totals.get('analysed_matches_delta', 0):+,}")
         with col3:
-            st.metric("Tornei Coperti", "89", "+2")
+            st.metric("Tornei Coperti", f"{totals.get('tournaments', 0):,}", f"{totals.get('tournaments_delta', 0):+,}")
         with col4:
-            st.metric("Aggiornamento", "2 min fa", "🟢")
+            st.metric("Aggiornamento", self._format_elapsed(totals.get('refreshed_at')))
+        
+        if st.button("🔄 Aggiorna aggregati"):
+            result = self.aggregates.refresh()
+            st.success(f"Aggregati aggiornati in {result['elapsed_ms']:.0f} ms")
+            st.rerun()
         
         st.divider()
         
@@ -79,40 +100,34 @@ class TennisStatsInterface:
         with col1:
             st.subheader("📊 Top 10 Giocatori per Elo Rating")
             
-            # Simula dati top players
-            top_players_data = {
-                'Giocatore': ['Djokovic', 'Alcaraz', 'Medvedev', 'Sinner', 'Tsitsipas', 
-                             'Zverev', 'Nadal', 'Ruud', 'Rublev', 'Fritz'],
-                'Elo': [2150, 2089, 2045, 2012, 1987, 1965, 1943, 1921, 1898, 1876],
-                'Ranking': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-            }
-            
-            df_top = pd.DataFrame(top_players_data)
+            df_top = pd.DataFrame(self.aggregates.top_elo(10))
             
-            fig_top = go.Figure(data=[
-                go.Bar(x=df_top['Giocatore'], y=df_top['Elo'], 
-                      text=df_top['Elo'], textposition='auto',
-                      marker_color='lightblue')
-            ])
-            fig_top.update_layout(height=400, xaxis_tickangle=-45)
-            st.plotly_chart(fig_top, use_container_width=True)
+            if df_top.empty:
+                st.info("Nessun giocatore nel database: esegui l'ETL per popolarlo")
+            else:
+                df_top['elo_rating'] = df_top['elo_rating'].round(0)
+                fig_top = go.Figure(data=[
+                    go.Bar(x=df_top['name'], y=df_top['elo_rating'], 
+                          text=df_top['elo_rating'], textposition='auto',
+                          marker_color='lightblue')
+                ])
+                fig_top.update_layout(height=400, xaxis_tickangle=-45)
+                st.plotly_chart(fig_top, use_container_width=True)
         
         with col2:
             st.subheader("🌍 Distribuzione per Paese")
             
-            countries_data = {
-                'Paese': ['USA', 'ESP', 'ITA', 'FRA', 'GER', 'RUS', 'Altri'],
-                'Giocatori': [156, 89, 67, 54, 48, 43, 790]
-            }
-            
-            df_countries = pd.DataFrame(countries_data)
+            df_countries = pd.DataFrame(self.aggregates.country_distribution(6))
             
-            fig_countries = go.Figure(data=[
-                go.Pie(labels=df_countries['Paese'], values=df_countries['Giocatori'],
-                      hole=0.3)
-            ])
-            fig_countries.update_layout(height=400)
-            st.plotly_chart(fig_countries, use_container_width=True)
+            if df_countries.empty:
+                st.info("Nessun dato sui paesi disponibile")
+            else:
+                fig_countries = go.Figure(data=[
+                    go.Pie(labels=df_countries['country'], values=df_countries['players'],
+                          hole=0.3)
+                ])
+                fig_countries.update_layout(height=400)
+                st.plotly_chart(fig_countries, use_container_width=True)
         
         st.divider()
         
@@ -123,56 +138,65 @@ class TennisStatsInterface:
         
         with col1:
             st.markdown("**🔥 Giocatori in Forma**")
-            form_data = [
-                {"Giocatore": "Carlos Alcaraz", "Forma": 87, "Trend": "📈"},
-                {"Giocatore": "Jannik Sinner", "Forma": 84, "Trend": "📈"},
-                {"Giocatore": "Daniil Medvedev", "Forma": 79, "Trend": "📊"},
-                {"Giocatore": "Alexander Zverev", "Forma": 76, "Trend": "📉"},
-                {"Giocatore": "Stefanos Tsitsipas", "Forma": 73, "Trend": "📊"}
-            ]
+            form_data = self.aggregates.in_form(5)
+            trend_icons = {'up': "📈", 'down': "📉", 'flat': "📊"}
             
+            if not form_data:
+                st.write("Nessuna statistica di forma disponibile")
             for player in form_data:
-                st.write(f"{player['Trend']} **{player['Giocatore']}** - Forma: {player['Forma']}/100")
+                st.write(f"{trend_icons[player['trend']]} **{player['name']}** - Forma: {player['form_rating']:.0f}/100")
         
         with col2:
             st.markdown("**⚡ Partite Recenti Analizzate**")
-            recent_matches = [
-                "Sinner vs Medvedev (US Open)",
-                "Alcaraz vs Djokovic (Wimbledon)", 
-                "Swiatek vs Gauff (WTA Finals)",
-                "Zverev vs Tsitsipas (ATP Masters)",
-                "Rybakina vs Sabalenka (Miami Open)"
-            ]
+            recent_matches = self.aggregates.recent_matches(5)
             
+            if not recent_matches:
+                st.write("Nessuna partita analizzata")
             for match in recent_matches:
-                st.write(f"🎾 {match}")
+                if match['player1_name'] and match['player2_name']:
+                    label = f"{match['player1_name']} vs {match['player2_name']}"
+                else:
+                    label = f"Partita #{match['match_id']}"
+                if match['tournament_name']:
+                    label += f" ({match['tournament_name']})"
+                st.write(f"🎾 {label}")
+    
+    @staticmethod
+    def _format_elapsed(timestamp: Optional[str]) -> str:
+        """'N min fa' dal timestamp ISO dell'ultimo refresh"""
+        if not timestamp:
+            return "mai"
+        minutes = int((datetime.now() - datetime.fromisoformat(timestamp)).total_seconds() // 60)
+        if minutes < 60:
+            return f"{minutes} min fa"
+        if minutes < 24 * 60:
+            return f"{minutes // 60} h fa"
+        return f"{minutes // (24 * 60)} g fa"
     
     def render_player_comparison(self):
         """Interfaccia confronto giocatori"""
         st.header("👥 Confronto Giocatori")
         
+        choices = {p['name']: p['player_id'] for p in self.aggregates.player_choices()}
+        if len(choices) < 2:
+            st.info("Servono almeno due giocatori nel database: esegui l'ETL per popolarlo")
+            return
+        names = list(choices)
+        
         # Selezione giocatori
         col1, col2 = st.columns(2)
         
         with col1:
-            player1 = st.selectbox(
-                "🎾 Seleziona Giocatore 1",
-                ["Novak Djokovic", "Carlos Alcaraz", "Daniil Medvedev", "Jannik Sinner", 
-                 "Stefanos Tsitsipas", "Alexander Zverev", "Rafael Nadal"]
-            )
+            player1 = st.selectbox("🎾 Seleziona Giocatore 1", names)
         
         with col2:
-            player2 = st.selectbox(
-                "🎾 Seleziona Giocatore 2", 
-                ["Carlos Alcaraz", "Daniil Medvedev", "Jannik Sinner", "Stefanos Tsitsipas",
-                 "Alexander Zverev", "Rafael Nadal", "Novak Djokovic"]
-            )
+            player2 = st.selectbox("🎾 Seleziona Giocatore 2", names, index=1)
         
         if player1 and player2 and player1 != player2:
             
-            # Fetch statistiche (simulate)
-            p1_stats = self.fetcher.fetch_player_stats(player1)
-            p2_stats = self.fetcher.fetch_player_stats(player2)
+            p1_id, p2_id = choices[player1], choices[player2]
+            p1_stats = self.aggregates.player_profile(p1_id)
+            p2_stats = self.aggregates.player_profile(p2_id)
             
             # Radar chart confronto
             st.subheader("📊 Confronto Radar")
@@ -196,7 +220,10 @@ class TennisStatsInterface:
             st.divider()
             st.subheader("🥊 Head-to-Head")
             
-            h2h_data = self.fetcher.fetch_head_to_head(player1, player2)
+            h2h_data = self.db.get_head_to_head(p1_id, p2_id)
+            if h2h_data.get('player1_id') == p2_id:
+                # Record salvato nell'ordine inverso
+                h2h_data = {**h2h_data, 'player1_wins': h2h_data['player2_wins'], 'player2_wins': h2h_data['player1_wins']}
             h2h_fig = self.visualizer.create_head_to_head_history(h2h_data, player1, player2)
             st.plotly_chart(h2h_fig, use_container_width=True)
             
@@ -536,50 +563,67 @@ class TennisStatsInterface:
         """Interfaccia statistiche live"""
         st.header("⚡ Statistiche Live")
         
-        # Auto-refresh
-        auto_refresh = st.checkbox("🔄 Auto-refresh (30s)")
-        
-        if auto_refresh:
-            st.rerun()
+        # Auto-refresh: si riesegue solo il fragment delle partite, non la pagina
+        auto_refresh = st.checkbox(f"🔄 Auto-refresh ({LIVE_REFRESH_SECONDS}s)")
         
-        # Fetch partite live
-        live_matches = self.fetcher.get_live_matches()
-        
-        if live_matches:
-            st.subheader(f"🎾 Partite Live ({len(live_matches)})")
-            
-            for match in live_matches:
-                with st.expander(f"{match['player1']} vs {match['player2']} - {match['tournament']}"):
-                    
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.markdown("**Info Partita**")
-                        st.write(f"🏟️ Superficie: {match['surface']}")
-                        st.write(f"📊 Set: {match['current_set']}")
-                        st.write(f"🎯 Score: {match['score']}")
-                    
-                    with col2:
-                        st.markdown(f"**{match['player1']}**")
-                        st.write(f"🎾 Aces: {match['p1_aces']}")
-                        st.write(f"❌ Doppi Falli: {match['p1_double_faults']}")
-                        st.write(f"📈 Prime Servizio: {match['p1_first_serve_pct']}%")
-                        st.write(f"🏆 Vincenti: {match['p1_winners']}")
-                        st.write(f"💥 Errori NF: {match['p1_unforced_errors']}")
-                    
-                    with col3:
-                        st.markdown(f"**{match['player2']}**")
-                        st.write(f"🎾 Aces: {match['p2_aces']}")
-                        st.write(f"❌ Doppi Falli: {match['p2_double_faults']}")
-                        st.write(f"📈 Prime Servizio: {match['p2_first_serve_pct']}%")
-                        st.write(f"🏆 Vincenti: {match['p2_winners']}")
-                        st.write(f"💥 Errori NF: {match['p2_unforced_errors']}")
+        live_fragment(self._render_live_matches, LIVE_REFRESH_SECONDS if auto_refresh else None)()
+    
+    def _render_live_matches(self):
+        """Card delle partite live dallo snapshot condiviso"""
+        force = st.button("🔄 Aggiorna Dati")
+        view = self.live_snapshot.get(force=force)
+        
+        # Revisioni già mostrate in questa sessione: evidenzia solo le card cambiate
+        seen = st.session_state.get('live_revs', {})
+        changed = [match_id for match_id, rev in view.revs.items() if seen.get(match_id) != rev]
+        st.session_state['live_revs'] = dict(view.revs)
+        
+        if view.matches:
+            st.subheader(f"🎾 Partite Live ({len(view.matches)})")
+            st.caption(f"Snapshot v{view.version} delle {datetime.fromtimestamp(view.fetched_at).strftime('%H:%M:%S')}"
+                       f" · {len(changed)} partite aggiornate")
+            
+            for match_id, match in view.matches.items():
+                self._render_live_card(match, match_id in changed and bool(seen))
         else:
             st.info("Nessuna partita live al momento")
-        
-        # Refresh manuale
-        if st.button("🔄 Aggiorna Dati"):
-            st.rerun()
+    
+    def _render_live_card(self, match: Dict[str, Any], updated: bool):
+        """Card di una partita live"""
+        badge = " 🆕" if updated else ""
+        with st.expander(f"{match['player1']} vs {match['player2']} - {match['tournament']}{badge}"):
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.markdown("**Info Partita**")
+                st.write(f"🏟️ Superficie: {match['surface']}")
+                st.write(f"📊 Set: {match['current_set']}")
+                st.write(f"🎯 Score: {match['score']}")
+                if 'leverage' in match:
+                    st.write(f"⚖️ Leverage punto: {match['leverage']:.2f}")
+            
+            with col2:
+                st.markdown(f"**{match['player1']}**")
+                st.write(f"🎾 Aces: {match['p1_aces']}")
+                st.write(f"❌ Doppi Falli: {match['p1_double_faults']}")
+                st.write(f"📈 Prime Servizio: {match['p1_first_serve_pct']}%")
+                st.write(f"🏆 Vincenti: {match['p1_winners']}")
+                st.write(f"💥 Errori NF: {match['p1_unforced_errors']}")
+                if 'p1_momentum' in match:
+                    st.write(f"⚡ Momentum: {match['p1_momentum']:.2f}")
+                    st.write(f"📐 Dominance: {match['p1_dominance_ratio']:.2f}")
+            
+            with col3:
+                st.markdown(f"**{match['player2']}**")
+                st.write(f"🎾 Aces: {match['p2_aces']}")
+                st.write(f"❌ Doppi Falli: {match['p2_double_faults']}")
+                st.write(f"📈 Prime Servizio: {match['p2_first_serve_pct']}%")
+                st.write(f"🏆 Vincenti: {match['p2_winners']}")
+                st.write(f"💥 Errori NF: {match['p2_unforced_errors']}")
+                if 'p2_momentum' in match:
+                    st.write(f"⚡ Momentum: {match['p2_momentum']:.2f}")
+                    st.write(f"📐 Dominance: {match['p2_dominance_ratio']:.2f}")
     
     def render_data_management(self):
         """Interfaccia gestione dati"""
@@ -690,6 +734,20 @@ class TennisStatsInterface:
             
             if st.button("💾 Salva Tutte le Configurazioni"):
                 st.success("Configurazioni salvate con successo!")
+
+            st.divider()
+            st.markdown("**🖼️ Cache Grafici**")
+
+            cache_stats = FIGURE_CACHE.summary()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Hit Rate", f"{cache_stats['hit_rate']:.1%}")
+            col2.metric("Grafici in Cache", cache_stats['entries'])
+            col3.metric("Memoria", f"{cache_stats['bytes'] / 1024:.0f} KB")
+            col4.metric("Tempo Risparmiato", f"{cache_stats['saved_ms'] / 1000:.1f} s")
+
+            if st.button("🗑️ Svuota Cache Grafici"):
+                FIGURE_CACHE.clear()
+                st.success("Cache grafici svuotata!")
     
     def _display_player_stats_card(self, stats: Dict[str, Any]):
         """Mostra card con statistiche giocatore"""
@@ -0,0 +1,107 @@
+"""
+Downsampling e rendering WebGL per serie temporali lunghe
+
+Le tracce punto-per-punto di una partita o gli storici quote possono avere
+decine di migliaia di punti. Oltre WEBGL_THRESHOLD punti si usa Scattergl
+(rendering su GPU nel browser) e oltre MAX_POINTS la serie viene ridotta
+con LTTB (Largest-Triangle-Three-Buckets), che conserva picchi e forma.
+Passando x_range si ricampiona solo l'intervallo visibile: lo zoom mostra
+il dettaglio completo con lo stesso budget di punti.
+"""
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Punti oltre i quali si passa a Scattergl
+WEBGL_THRESHOLD = 5000
+
+# Punti massimi inviati al browser per traccia
+MAX_POINTS = 2000
+
+
+def _numeric(x: Sequence[Any]) -> np.ndarray:
+    """Ascisse come float (date convertite in nanosecondi)"""
+    arr = np.asarray(x)
+    if arr.dtype.kind in 'iufb':
+        return arr.astype(float)
+    return pd.to_datetime(arr).asi8.astype(float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indici dei punti scelti da LTTB (primo e ultimo sempre inclusi)
+
+    Args:
+        x, y: serie numeriche della stessa lunghezza, x crescente
+        threshold: numero di punti in uscita (>= 3)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Bucket interni: i punti 1..n-2 divisi in threshold-2 intervalli
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Media del bucket successivo (o ultimo punto)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs((x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample(x: Sequence[Any], y: Sequence[float], max_points: int = MAX_POINTS,
+               x_range: Optional[Tuple[Any, Any]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ritaglia la serie su x_range (se indicato) e la riduce a max_points con LTTB
+
+    Returns:
+        (x, y) come array, con i valori originali di x (anche date)
+    """
+    x_arr = np.asarray(x)
+    y_arr = np.asarray(y, dtype=float)
+    x_num = _numeric(x_arr)
+
+    if x_range is not None:
+        lo, hi = _numeric([x_range[0], x_range[1]])
+        # Un punto oltre ciascun estremo per non interrompere la linea al bordo
+        first = max(int(np.searchsorted(x_num, lo, side='left')) - 1, 0)
+        last = min(int(np.searchsorted(x_num, hi, side='right')) + 1, len(x_num))
+        x_arr, y_arr, x_num = x_arr[first:last], y_arr[first:last], x_num[first:last]
+
+    if len(x_arr) > max_points:
+        # NaN trattati come 0 nella scelta dei punti, restituiti invariati
+        idx = lttb_indices(x_num, np.nan_to_num(y_arr), max_points)
+        x_arr, y_arr = x_arr[idx], y_arr[idx]
+    return x_arr, y_arr
+
+
+def scatter_trace(x: Sequence[Any], y: Sequence[float], max_points: int = MAX_POINTS,
+                  webgl_threshold: int = WEBGL_THRESHOLD,
+                  x_range: Optional[Tuple[Any, Any]] = None, **kwargs) -> go.Scatter:
+    """
+    Traccia Scatter/Scattergl ridotta per la serie (x, y)
+
+    kwargs sono passati al costruttore della traccia (name, mode, line, ...).
+    """
+    n_points = len(x)
+    x_out, y_out = downsample(x, y, max_points, x_range) if n_points > max_points or x_range else (x, y)
+    trace_cls = go.Scattergl if n_points > webgl_threshold else go.Scatter
+    return trace_cls(x=x_out, y=y_out, **kwargs)
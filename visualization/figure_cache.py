@@ -0,0 +1,211 @@
+"""
+Cache LRU dei grafici Plotly
+
+Ogni figura è indicizzata da un hash dei dati in ingresso e dei parametri
+del grafico e memorizzata come JSON serializzato. A parità di input il
+grafico non viene ricostruito: si restituisce una CachedFigure in sola
+lettura che espone direttamente lo spec salvato a st.plotly_chart (che
+chiama to_dict()), senza rieseguire la costruzione né la validazione di
+Plotly. Anche al primo accesso si restituisce una CachedFigure, così hit e
+miss si comportano allo stesso modo.
+
+La cache è di processo (condivisa tra le sessioni Streamlit) ed è limitata
+sia per numero di voci sia per byte totali.
+"""
+import functools
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from services import json_codec
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 256
+MAX_BYTES = 32 * 1024 * 1024
+
+
+def _feed(hasher, obj: Any):
+    """Serializzazione canonica (ordine chiavi stabile) dentro l'hash"""
+    if isinstance(obj, (dict, list, tuple)):
+        # Percorso veloce: strutture di soli tipi JSON serializzate in blocco
+        try:
+            hasher.update(b'J' + json_codec.dumps(obj, sort_keys=True))
+            return
+        except TypeError:
+            pass
+    if isinstance(obj, dict):
+        hasher.update(b'{')
+        for key in sorted(obj, key=repr):
+            _feed(hasher, key)
+            _feed(hasher, obj[key])
+        hasher.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b'[')
+        for item in obj:
+            _feed(hasher, item)
+        hasher.update(b']')
+    elif isinstance(obj, pd.DataFrame):
+        hasher.update(repr(list(obj.columns)).encode())
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, pd.Series):
+        hasher.update(repr(obj.name).encode())
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(f'{obj.dtype}{obj.shape}'.encode())
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (datetime, date)):
+        hasher.update(obj.isoformat().encode())
+    else:
+        hasher.update(f'{type(obj).__name__}:{obj!r};'.encode())
+
+
+def input_key(name: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """Hash degli input di un grafico (nome funzione + argomenti)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(name.encode())
+    _feed(hasher, args)
+    _feed(hasher, kwargs)
+    return hasher.hexdigest()
+
+
+# Attributi di go.Figure che leggono o modificano tracce e layout
+_FIGURE_ATTRS = frozenset({'data', 'layout', 'frames', 'update', 'show', 'full_figure_for_development'})
+_FIGURE_PREFIXES = ('add_', 'update_', 'for_each_', 'select_', 'write_', 'set_subplots', 'append_trace')
+
+
+class CachedFigure(go.Figure):
+    """
+    Figura in sola lettura costruita dal JSON in cache, per la visualizzazione
+
+    Restituita sia in caso di hit sia di miss. to_dict()/to_json() espongono
+    lo spec salvato (quello che usa st.plotly_chart); data, layout e i metodi
+    che modificano la figura (update_layout, add_trace, ...) sollevano
+    TypeError: per modificarla usare materialize(), che restituisce una
+    go.Figure indipendente.
+    """
+
+    def __init__(self, spec_json: bytes):
+        super().__init__()
+        self._spec_json = spec_json
+        # Da qui in poi tracce e layout non sono più accessibili
+        self._sealed = True
+
+    def __getattribute__(self, name: str):
+        if ((name in _FIGURE_ATTRS or name.startswith(_FIGURE_PREFIXES))
+                and '_sealed' in object.__getattribute__(self, '__dict__')):
+            raise TypeError(f"CachedFigure è in sola lettura ({name}): usare materialize()")
+        return super().__getattribute__(name)
+
+    def __setattr__(self, name: str, value):
+        if name in _FIGURE_ATTRS and '_sealed' in self.__dict__:
+            raise TypeError(f"CachedFigure è in sola lettura ({name}): usare materialize()")
+        super().__setattr__(name, value)
+
+    def to_dict(self):
+        return json_codec.loads(self._spec_json)
+
+    def to_plotly_json(self):
+        return self.to_dict()
+
+    def to_json(self, *args, **kwargs):
+        return self._spec_json.decode()
+
+    def materialize(self) -> go.Figure:
+        return go.Figure(self.to_dict())
+
+
+class FigureCache:
+    """Cache LRU thread-safe di figure serializzate"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._build_ms: Dict[str, float] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {'hits': 0, 'misses': 0, 'evictions': 0, 'saved_ms': 0.0}
+
+    def get(self, key: str) -> Optional[CachedFigure]:
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            self.stats['saved_ms'] += self._build_ms.get(key, 0.0)
+        return CachedFigure(spec)
+
+    def put(self, key: str, figure: go.Figure, build_ms: float = 0.0) -> bytes:
+        """Memorizza la figura e restituisce il suo spec JSON"""
+        spec = figure.to_json().encode()
+        if len(spec) > self.max_bytes:
+            return spec
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = spec
+            self._build_ms[key] = build_ms
+            self._bytes += len(spec)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._build_ms.pop(evicted_key, None)
+                self._bytes -= len(evicted)
+                self.stats['evictions'] += 1
+        return spec
+
+    def get_or_build(self, key: str, builder: Callable[[], go.Figure]) -> go.Figure:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        figure = builder()
+        # Stesso oggetto in sola lettura anche al primo accesso
+        return CachedFigure(self.put(key, figure, (time.perf_counter() - start) * 1000))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._build_ms.clear()
+            self._bytes = 0
+
+    def summary(self) -> Dict[str, Any]:
+        """Hit rate, voci, byte occupati e tempo di costruzione risparmiato"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': int(self.stats['hits']),
+                'misses': int(self.stats['misses']),
+                'evictions': int(self.stats['evictions']),
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+                'saved_ms': round(self.stats['saved_ms'], 1),
+            }
+
+
+# Cache di processo usata da TennisStatsVisualizer
+FIGURE_CACHE = FigureCache()
+
+
+def cached_figure(func: Callable[..., go.Figure]) -> Callable[..., go.Figure]:
+    """Decoratore: memorizza la figura prodotta da func in FIGURE_CACHE"""
+    name = f'{func.__module__}.{func.__qualname__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = input_key(name, args, kwargs)
+        return FIGURE_CACHE.get_or_build(key, lambda: func(*args, **kwargs))
+
+    return wrapper
@@ -7,13 +7,17 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import streamlit as st
 
+from visualization.downsampling import scatter_trace
+from visualization.figure_cache import cached_figure
+
 class TennisStatsVisualizer:
     """Classe per creare visualizzazioni delle statistiche tennis"""
     
     @staticmethod
+    @cached_figure
     def create_player_comparison_radar(player1_stats: Dict[str, Any], player2_stats: Dict[str, Any],
                                      player1_name: str, player2_name: str) -> go.Figure:
         """Crea radar chart per confronto tra due giocatori"""
@@ -80,6 +84,7 @@ class TennisStatsVisualizer:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_surface_performance_chart(player_stats: Dict[str, Any], player_name: str) -> go.Figure:
         """Crea grafico performance per superficie"""
         
@@ -125,6 +130,7 @@ class TennisStatsVisualizer:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_head_to_head_history(h2h_data: Dict[str, Any], player1_name: str, player2_name: str) -> go.Figure:
         """Crea visualizzazione head-to-head"""
         
@@ -200,8 +206,15 @@ class TennisStatsVisualizer:
         return fig
     
     @staticmethod
-    def create_form_trend_chart(form_data: List[Dict[str, Any]], player_name: str) -> go.Figure:
-        """Crea grafico trend forma recente"""
+    @cached_figure
+    def create_form_trend_chart(form_data: List[Dict[str, Any]], player_name: str,
+                                x_range: Optional[Tuple[Any, Any]] = None) -> go.Figure:
+        """
+        Crea grafico trend forma recente
+
+        Le serie lunghe sono ridotte con LTTB (WebGL oltre soglia); x_range
+        limita il grafico all'intervallo di date indicato con il dettaglio pieno.
+        """
         
         if not form_data:
             fig = go.Figure()
@@ -225,9 +238,8 @@ class TennisStatsVisualizer:
         )
         
         # Elo rating trend
-        fig.add_trace(go.Scatter(
-            x=dates,
-            y=elo_ratings,
+        fig.add_trace(scatter_trace(
+            dates, elo_ratings, x_range=x_range,
             mode='lines+markers',
             name='Elo Rating',
             line=dict(color='blue', width=2),
@@ -235,9 +247,8 @@ class TennisStatsVisualizer:
         ), row=1, col=1)
         
         # Form rating trend
-        fig.add_trace(go.Scatter(
-            x=dates,
-            y=form_ratings,
+        fig.add_trace(scatter_trace(
+            dates, form_ratings, x_range=x_range,
             mode='lines+markers',
             name='Form Rating',
             line=dict(color='green', width=2),
@@ -255,10 +266,13 @@ class TennisStatsVisualizer:
         fig.update_xaxes(title_text="Data", row=2, col=1)
         fig.update_yaxes(title_text="Elo", row=1, col=1)
         fig.update_yaxes(title_text="Forma", row=2, col=1, range=[0, 100])
+        if x_range is not None:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
     
     @staticmethod
+    @cached_figure
     def create_match_stats_comparison(match_stats: Dict[str, Any], player1_name: str, player2_name: str) -> go.Figure:
         """Crea confronto statistiche dettagliate partita"""
         
@@ -324,8 +338,15 @@ class TennisStatsVisualizer:
         return fig
     
     @staticmethod
-    def create_dominance_momentum_chart(match_data: List[Dict[str, Any]]) -> go.Figure:
-        """Crea grafico dominance ratio e momentum nel tempo"""
+    @cached_figure
+    def create_dominance_momentum_chart(match_data: List[Dict[str, Any]],
+                                        x_range: Optional[Tuple[int, int]] = None) -> go.Figure:
+        """
+        Crea grafico dominance ratio e momentum nel tempo
+
+        Le serie lunghe sono ridotte con LTTB (WebGL oltre soglia); x_range
+        (indici di punto) limita il grafico all'intervallo con il dettaglio pieno.
+        """
         
         if not match_data:
             fig = go.Figure()
@@ -351,35 +372,31 @@ class TennisStatsVisualizer:
         )
         
         # Dominance Ratio
-        fig.add_trace(go.Scatter(
-            x=points,
-            y=p1_dominance,
+        fig.add_trace(scatter_trace(
+            points, p1_dominance, x_range=x_range,
             mode='lines',
             name='Player 1 Dominance',
             line=dict(color='blue', width=2)
         ), row=1, col=1)
         
-        fig.add_trace(go.Scatter(
-            x=points,
-            y=p2_dominance,
+        fig.add_trace(scatter_trace(
+            points, p2_dominance, x_range=x_range,
             mode='lines',
             name='Player 2 Dominance',
             line=dict(color='red', width=2)
         ), row=1, col=1)
         
         # Momentum Score
-        fig.add_trace(go.Scatter(
-            x=points,
-            y=p1_momentum,
+        fig.add_trace(scatter_trace(
+            points, p1_momentum, x_range=x_range,
             mode='lines',
             name='Player 1 Momentum',
             line=dict(color='lightblue', width=2),
             fill='tonexty'
         ), row=2, col=1)
         
-        fig.add_trace(go.Scatter(
-            x=points,
-            y=p2_momentum,
+        fig.add_trace(scatter_trace(
+            points, p2_momentum, x_range=x_range,
             mode='lines',
             name='Player 2 Momentum',
             line=dict(color='lightcoral', width=2)
@@ -398,10 +415,13 @@ class TennisStatsVisualizer:
         fig.update_xaxes(title_text="Punti", row=2, col=1)
         fig.update_yaxes(title_text="Dominance Ratio", row=1, col=1)
         fig.update_yaxes(title_text="Momentum Score", row=2, col=1, range=[0, 1])
+        if x_range is not None:
+            fig.update_xaxes(range=list(x_range))
         
         return fig
     
     @staticmethod
+    @cached_figure
     def create_tournament_performance_heatmap(tournament_data: List[Dict[str, Any]], player_name: str) -> go.Figure:
         """Crea heatmap performance nei tornei"""
         